@@ -0,0 +1,263 @@
+"""
+کوچک کردن اطلس فونت بر اساس پیکره ترجمه‌ها (بدون PyQt).
+
+فقط گلیف‌هایی که در پیکره به کار رفته‌اند (به علاوه فاصله که advance کاراکترهای
+ناموجود است و defaultCharacter فونت) نگه داشته می‌شوند، با الگوریتم skyline در کوچک‌ترین اطلس توان دو
+چیده می‌شوند و یک PNG و یک JSON با همان ساختار خروجی xnbcli (قابل خواندن با
+parse_monogame_fnt) نوشته می‌شود. در پایان همه رشته‌های پیکره با هر دو فونت رندر
+و پیکسل به پیکسل مقایسه می‌شوند.
+
+    python atlas_subset.py fonts/Main.xnb strings/ -o out/
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from PIL import Image
+from font import MonoGameFont
+from glyph_coverage import iter_corpus
+from monogame_font_parser import load_json_content
+from texture_registry import TextureRegistry
+from xnb_reader import read_xnb_spritefont
+
+# بزرگ‌ترین ضلع اطلس خروجی (پیکسل)
+MAX_ATLAS_SIZE = 8192
+# فاصله خالی بین گلیف‌ها تا فیلتر خطی بافت گلیف‌های کناری را نمونه‌برداری نکند
+PADDING = 1
+
+
+def pack_skyline(sizes, width, height):
+    """
+    چیدن مستطیل‌ها در یک اطلس width x height با روش skyline (پایین‌ترین جای ممکن، سپس چپ‌ترین).
+
+    Args:
+        sizes (list): (عرض, ارتفاع) هر مستطیل
+
+    Returns:
+        list | None: (x, y) هر مستطیل به ترتیب sizes، یا None اگر جا نشوند
+    """
+    # خط افق به صورت بخش‌های (x, y, عرض) از چپ به راست
+    skyline = [[0, 0, width]]
+    positions = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    for i in order:
+        w, h = sizes[i]
+        if w == 0 or h == 0:
+            positions[i] = (0, 0)
+            continue
+        best = None
+        for start in range(len(skyline)):
+            x = skyline[start][0]
+            if x + w > width:
+                break
+            # بلندترین بخش زیر بازه [x, x + w)
+            y = 0
+            covered = 0
+            index = start
+            while covered < w:
+                y = max(y, skyline[index][1])
+                covered += skyline[index][2]
+                index += 1
+            if y + h <= height and (best is None or y < best[1]):
+                best = (x, y, start)
+        if best is None:
+            return None
+        x, y, start = best
+        positions[i] = (x, y)
+
+        # جایگزینی بخش‌های زیر مستطیل با یک بخش تازه
+        end = x + w
+        index = start
+        while index < len(skyline) and skyline[index][0] < end:
+            seg_x, seg_y, seg_w = skyline[index]
+            if seg_x + seg_w > end:
+                skyline[index] = [end, seg_y, seg_x + seg_w - end]
+                break
+            del skyline[index]
+        skyline.insert(start, [x, y + h, w])
+        # ادغام بخش‌های هم‌ارتفاع کنار هم
+        merged = [skyline[0]]
+        for segment in skyline[1:]:
+            if segment[1] == merged[-1][1]:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        skyline = merged
+    return positions
+
+
+def atlas_candidates(sizes, max_size=MAX_ATLAS_SIZE):
+    """ابعاد توان دو به ترتیب مساحت؛ ابعادی که حتماً کوچک‌اند کنار گذاشته می‌شوند"""
+    area = sum(w * h for w, h in sizes)
+    min_width = max((w for w, _ in sizes), default=1)
+    min_height = max((h for _, h in sizes), default=1)
+    powers = [1 << k for k in range(max_size.bit_length()) if 1 << k <= max_size]
+    candidates = [(w, h) for w in powers for h in powers
+                  if w * h >= area and w >= min_width and h >= min_height]
+    return sorted(candidates, key=lambda size: (size[0] * size[1], abs(size[0] - size[1]), -size[0]))
+
+
+def pack_atlas(sizes, padding=PADDING, max_size=MAX_ATLAS_SIZE):
+    """
+    کوچک‌ترین اطلس توان دو که همه مستطیل‌ها (با padding در راست و پایین) در آن جا شوند.
+
+    Returns:
+        tuple: ((عرض, ارتفاع), فهرست (x, y))
+    """
+    padded = [(w + padding, h + padding) if w and h else (0, 0) for w, h in sizes]
+    for width, height in atlas_candidates(padded, max_size):
+        positions = pack_skyline(padded, width, height)
+        if positions is not None:
+            return (width, height), positions
+    raise ValueError(f"گلیف‌ها در اطلس {max_size}x{max_size} جا نمی‌شوند")
+
+
+def read_content(fnt_file):
+    """بخش content فایل فونت (JSON یا .xnb) برای کپی cropping، kerning و سایر فیلدها"""
+    if fnt_file.endswith('.xnb'):
+        return read_xnb_spritefont(fnt_file)[0]
+    return load_json_content(fnt_file)
+
+
+def used_codepoints(font, content, corpus_paths, id_column="id", text_column="text"):
+    """
+    (کدپوینت‌های مشترک پیکره و فونت، رشته‌های یکتای پیکره).
+
+    فاصله و defaultCharacter فونت همیشه نگه داشته می‌شوند؛ بازی کاراکترهای ناموجود را
+    با defaultCharacter رسم می‌کند.
+    """
+    texts = {text for _, _, text in iter_corpus(corpus_paths, id_column, text_column)}
+    corpus = set(map(ord, "".join(texts)))
+    keep = {cid for cid in font.chars.id if cid in corpus}
+    for char in (" ", content.get("defaultCharacter")):
+        if char and ord(char) in font.chars:
+            keep.add(ord(char))
+    return keep, texts
+
+
+def subset_font(font, content, keep, out_dir, name, padding=PADDING):
+    """
+    نوشتن فونت کوچک‌شده با گلیف‌های keep.
+
+    Args:
+        content (dict): بخش content فونت از read_content
+
+    Returns:
+        tuple: (مسیر JSON، مسیر PNG، ابعاد اطلس)
+    """
+    if not keep:
+        # parse_monogame_fnt توصیف‌گر بدون گلیف را رد می‌کند
+        raise ValueError("هیچ کاراکتری از پیکره در فونت نیست و فونت فاصله یا defaultCharacter ندارد؛ فونت خالی ساخته نمی‌شود")
+    character_map = content.get("characterMap", [])
+    cropping = content.get("cropping", [])
+    kerning = content.get("kerning", [])
+    # برای کدپوینت‌های تکراری آخرین مورد معتبر است (مانند parse_monogame_fnt)
+    source_index = {ord(ch): i for i, ch in enumerate(character_map)}
+
+    chars = font.chars
+    codepoints = sorted(keep)
+    rows = [chars.row(cid) for cid in codepoints]
+    sizes = [(chars.width[row], chars.height[row]) for row in rows]
+    (atlas_width, atlas_height), positions = pack_atlas(sizes, padding)
+
+    atlas = Image.new("RGBA", (atlas_width, atlas_height), (0, 0, 0, 0))
+    glyphs = []
+    for cid, row, (w, h), (x, y) in zip(codepoints, rows, sizes, positions):
+        if w and h:
+            page = font.get_page(chars.page[row])
+            if page is None:
+                raise ValueError(f"تصویر صفحه گلیف U+{cid:04X} بارگذاری نشده است")
+            sx, sy = chars.x[row], chars.y[row]
+            atlas.paste(page.crop((sx, sy, sx + w, sy + h)), (x, y))
+        glyphs.append({"x": x, "y": y, "width": w, "height": h})
+
+    def source_entry(entries, cid, default):
+        i = source_index.get(cid)
+        return entries[i] if i is not None and i < len(entries) else default
+
+    new_content = {key: value for key, value in content.items()
+                   if key not in ("texture", "glyphs", "cropping", "characterMap", "kerning")}
+    new_content["texture"] = {"format": 0, "export": f"{name}.png"}
+    new_content["glyphs"] = glyphs
+    new_content["cropping"] = [
+        source_entry(cropping, cid, {"x": chars.xoffset[row], "y": chars.yoffset[row], "width": w, "height": h})
+        for cid, row, (w, h) in zip(codepoints, rows, sizes)]
+    new_content["characterMap"] = [chr(cid) for cid in codepoints]
+    if kerning:
+        new_content["kerning"] = [source_entry(kerning, cid, {"x": 0, "y": w, "z": 0})
+                                  for cid, (w, _) in zip(codepoints, sizes)]
+    if new_content.get("defaultCharacter") is not None and ord(new_content["defaultCharacter"]) not in keep:
+        new_content["defaultCharacter"] = None
+
+    os.makedirs(out_dir, exist_ok=True)
+    png_path = os.path.join(out_dir, f"{name}.png")
+    json_path = os.path.join(out_dir, f"{name}.json")
+    atlas.save(png_path, optimize=True)
+    descriptor = {
+        "header": {"target": "w", "formatVersion": 5, "hidef": False, "compressed": False},
+        "readers": [],
+        "content": new_content,
+    }
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(descriptor, f, ensure_ascii=False)
+    return json_path, png_path, (atlas_width, atlas_height)
+
+
+def verify(original, subset, texts):
+    """رندر همه رشته‌ها با هر دو فونت؛ فهرست رشته‌هایی که خروجی متفاوت دارند"""
+    mismatches = []
+    for text in texts:
+        expected = original.render_text(text)
+        actual = subset.render_text(text)
+        if expected.size != actual.size or expected.tobytes() != actual.tobytes():
+            mismatches.append(text)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="کوچک کردن اطلس فونت MonoGame به گلیف‌های به‌کاررفته در پیکره")
+    parser.add_argument("font", help="فایل فونت (.json/.xnb)")
+    parser.add_argument("corpus", nargs="+", help="فایل‌ها یا پوشه‌های رشته‌ها (CSV، JSON یا TXT)")
+    parser.add_argument("-o", "--out", required=True, help="پوشه خروجی")
+    parser.add_argument("--name", help="نام پایه فایل‌های خروجی (پیش‌فرض: <نام فونت>_subset)")
+    parser.add_argument("--padding", type=int, default=PADDING)
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--no-verify", action="store_true", help="بدون مقایسه رندر پیکره با دو فونت")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    font = MonoGameFont(args.font, os.path.dirname(args.font), textures=TextureRegistry())
+    content = read_content(args.font)
+    keep, texts = used_codepoints(font, content, args.corpus, args.id_column, args.text_column)
+    name = args.name or f"{os.path.splitext(os.path.basename(args.font))[0]}_subset"
+    try:
+        json_path, png_path, (width, height) = subset_font(font, content, keep, args.out, name, args.padding)
+    except ValueError as e:
+        print(f"خطا: {e}")
+        return 1
+
+    before = sum(texture.width * texture.height * 4
+                 for texture in (font.get_page(pid) for pid in font.pages) if texture is not None)
+    after = width * height * 4
+    print(f"گلیف‌ها: {len(font.chars)} -> {len(keep)} ({len(texts)} رشته یکتا)")
+    print(f"اطلس: {before / 1024:.0f} KiB -> {width}x{height}، {after / 1024:.0f} KiB RGBA "
+          f"({100 * (1 - after / before) if before else 0:.1f}% کمتر)؛ PNG {os.path.getsize(png_path) / 1024:.0f} KiB")
+    print(f"خروجی: {json_path}")
+
+    status = 0
+    if not args.no_verify:
+        subset = MonoGameFont(json_path, args.out, use_cache=False, textures=TextureRegistry())
+        mismatches = verify(font, subset, texts)
+        if mismatches:
+            print(f"خطا: رندر {len(mismatches)} رشته با فونت کوچک‌شده متفاوت است، مثلاً {mismatches[0][:60]!r}")
+            status = 1
+        else:
+            print(f"رندر همه {len(texts)} رشته با هر دو فونت یکسان است")
+    print(f"زمان: {time.perf_counter() - start:.1f} ثانیه")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
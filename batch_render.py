@@ -0,0 +1,209 @@
+"""
+رندر دسته‌ای بدون رابط گرافیکی برای بررسی کیفیت ترجمه‌ها (بدون PyQt).
+
+هر رشته جدول با همه فونت‌های یک پوشه رندر می‌شود و فایل‌های PNG به همراه
+یک manifest.jsonl نوشته می‌شوند. کار بین پردازه‌ها تقسیم می‌شود و هر پردازه
+فونت‌ها را فقط یک بار بارگذاری می‌کند. فایل‌هایی از پوشه که فونت نیستند (مثلاً
+بافت‌های .xnb یا خود جدول رشته‌ها) با یک پیام کنار گذاشته می‌شوند. نام‌های تکراری
+(شناسه‌هایی که پس از safe_name یکی می‌شوند یا شناسه تکراری در جدول) پسوند _2، _3،
+... می‌گیرند تا هیچ خروجی بازنویسی نشود. خطای رندر یا ذخیره یک رشته با یک فونت (گلیف
+خراب، پر بودن دیسک، نام فایل نامعتبر) اجرا را متوقف نمی‌کند: در manifest یک ردیف
+{"id", "font", "error"} نوشته می‌شود و کد خروج در پایان ۱ است.
+
+    python batch_render.py strings.csv fonts/ out/ --workers 8
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from font import MonoGameFont, RENDER_ENGINES
+from font_loader import find_fonts
+
+_worker_fonts = None
+_worker_options = None
+
+
+def font_label(font_path, fonts_folder):
+    """نام یکتای فونت برای پوشه خروجی، بر اساس مسیر نسبی آن"""
+    relative = os.path.splitext(os.path.relpath(font_path, fonts_folder))[0]
+    return safe_name(relative.replace(os.sep, "_"))
+
+
+def safe_name(value):
+    return re.sub(r'[^\w.-]+', '_', str(value)).strip('_') or "_"
+
+
+def unique_name(name, used):
+    """name یا name_2، name_3، ... که در used نیست (بدون حساسیت به حروف، مثل سیستم فایل ویندوز)"""
+    candidate = name
+    n = 1
+    while candidate.casefold() in used:
+        n += 1
+        candidate = f"{name}_{n}"
+    used.add(candidate.casefold())
+    return candidate
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("باید عدد صحیح بزرگ‌تر از صفر باشد")
+    return number
+
+
+def read_string_table(path, id_column="id", text_column="text"):
+    """
+    خواندن جدول رشته‌ها به صورت جریانی.
+
+    CSV: ستون‌های id و text (در نبود ستون id شماره ردیف استفاده می‌شود).
+    JSON: فهرست رشته‌ها، فهرست اشیاء {"id", "text"} یا دیکشنری id به متن.
+
+    Yields:
+        tuple: (id, text)
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            if text_column not in (reader.fieldnames or []):
+                raise ValueError(f"ستون '{text_column}' در فایل CSV پیدا نشد")
+            for i, row in enumerate(reader):
+                yield row.get(id_column) or str(i), row[text_column] or ""
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        for key, text in data.items():
+            yield str(key), str(text)
+    else:
+        for i, entry in enumerate(data):
+            if isinstance(entry, dict):
+                yield str(entry.get(id_column, i)), str(entry.get(text_column, ""))
+            else:
+                yield str(i), str(entry)
+
+
+def unique_rows(rows):
+    """(id، متن، نام فایل یکتا) برای هر ردیف جدول"""
+    used = set()
+    for string_id, text in rows:
+        yield string_id, text, unique_name(safe_name(string_id), used)
+
+
+def load_fonts(labeled_paths, engine):
+    """
+    [(برچسب، فونت)] فونت‌هایی که بارگذاری شدند؛ فایل‌هایی که فونت نیستند با پیام کنار گذاشته می‌شوند.
+
+    Args:
+        labeled_paths (list): [(مسیر، برچسب)]
+    """
+    fonts = []
+    for path, label in labeled_paths:
+        try:
+            fonts.append((label, MonoGameFont(path, os.path.dirname(path), render_engine=engine)))
+        except Exception as e:
+            print(f"فونت نادیده گرفته شد: {path}: {e}")
+    return fonts
+
+
+def _init_worker(labeled_paths, options):
+    global _worker_fonts, _worker_options
+    _worker_options = options
+    _worker_fonts = load_fonts(labeled_paths, options["engine"])
+
+
+def _render_row(row):
+    string_id, text, name = row
+    entries = []
+    out_dir = _worker_options["out_dir"]
+    background = _worker_options["background"]
+    for label, font in _worker_fonts:
+        relative = os.path.join(label, f"{name}.png")
+        try:
+            img = font.render_text(text, background_color=background)
+            img.save(os.path.join(out_dir, relative), compress_level=_worker_options["compress_level"])
+        except Exception as e:
+            entries.append({"id": string_id, "font": label, "error": f"{type(e).__name__}: {e}"})
+            continue
+        entries.append({"id": string_id, "font": label, "file": relative.replace(os.sep, "/"),
+                        "width": img.width, "height": img.height})
+    return entries
+
+
+def parse_color(value):
+    parts = [int(p) for p in value.split(",")]
+    if len(parts) not in (3, 4):
+        raise argparse.ArgumentTypeError("رنگ باید به شکل R,G,B یا R,G,B,A باشد")
+    return tuple(parts + [255] * (4 - len(parts)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="رندر دسته‌ای جدول رشته‌ها با فونت‌های MonoGame")
+    parser.add_argument("strings", help="جدول رشته‌ها (CSV یا JSON)")
+    parser.add_argument("fonts", help="پوشه فونت‌ها (.json/.xnb)")
+    parser.add_argument("out", help="پوشه خروجی")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=positive_int, default=64)
+    parser.add_argument("--engine", choices=RENDER_ENGINES, default="pil")
+    parser.add_argument("--background", type=parse_color, default=(50, 50, 50, 255))
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--compress-level", type=int, default=1, help="سطح فشرده‌سازی PNG (۰ تا ۹)")
+    args = parser.parse_args(argv)
+
+    # پوشه خروجی (اگر داخل پوشه فونت‌ها باشد) و خود جدول رشته‌ها فونت نیستند
+    out_root = os.path.realpath(args.out)
+    excluded = {os.path.realpath(args.strings)}
+    font_paths = [path for path in find_fonts(args.fonts) if os.path.realpath(path) not in excluded
+                  and os.path.commonpath([out_root, os.path.realpath(path)]) != out_root]
+    used_labels = set()
+    labeled_paths = [(path, unique_name(font_label(path, args.fonts), used_labels)) for path in font_paths]
+
+    # یک بار در پردازه اصلی تا کش دیسکی فونت‌ها پیش از شروع کارگرها گرم شود و فایل‌های
+    # غیر فونت پیش از ساخت کارگرها کنار گذاشته شوند
+    fonts = load_fonts(labeled_paths, args.engine)
+    if not fonts:
+        print(f"هیچ فونتی در {args.fonts} پیدا نشد")
+        return 1
+    labels = {label for label, _ in fonts}
+    labeled_paths = [(path, label) for path, label in labeled_paths if label in labels]
+    for label in labels:
+        os.makedirs(os.path.join(args.out, label), exist_ok=True)
+
+    options = {"out_dir": args.out, "background": args.background, "engine": args.engine,
+               "compress_level": args.compress_level}
+    rows = unique_rows(read_string_table(args.strings, args.id_column, args.text_column))
+    manifest_path = os.path.join(args.out, "manifest.jsonl")
+    start = time.perf_counter()
+    count = 0
+    errors = 0
+    with open(manifest_path, 'w', encoding='utf-8') as manifest, \
+            multiprocessing.Pool(args.workers, _init_worker, (labeled_paths, options)) as pool:
+        for entries in pool.imap_unordered(_render_row, rows, chunksize=args.chunksize):
+            for entry in entries:
+                if "error" in entry:
+                    errors += 1
+                    print(f"خطا در رندر {entry['id']} با {entry['font']}: {entry['error']}")
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+            if count % 1000 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{count} رشته، {count / elapsed:.0f} رشته در ثانیه", flush=True)
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"پایان: {count} رشته × {len(fonts)} فونت در {elapsed:.1f} ثانیه "
+          f"({rate:.0f} رشته در ثانیه، {rate * len(fonts):.0f} تصویر در ثانیه)")
+    print(f"فهرست خروجی: {manifest_path}")
+    if errors:
+        print(f"{errors} تصویر به دلیل خطا ساخته نشد (ردیف‌های error در فهرست خروجی)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
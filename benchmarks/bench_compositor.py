@@ -0,0 +1,56 @@
+"""
+مقایسه موتورهای رندر "pil" و "numpy": بررسی یکسان بودن پیکسل‌ها و زمان هر رندر.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_compositor
+"""
+import sys
+import tempfile
+import timeit
+from font import MonoGameFont
+from benchmarks.synthetic_font import generate_font, sample_text
+
+GLYPH_COUNT = 5000
+TEXT_LENGTHS = (10, 100, 1000, 10000)
+BACKGROUNDS = ((50, 50, 50, 255), (255, 255, 255, 255), (0, 0, 0, 0))
+
+
+def check_identical(pil_font, numpy_font):
+    """رندر چند متن با هر دو موتور؛ فهرست موارد ناهمسان را برمی‌گرداند"""
+    mismatches = []
+    for length in (0, 1) + TEXT_LENGTHS[:-1]:
+        for seed in range(3):
+            # یک کاراکتر ناموجود در میانه متن: گلیف‌های بعدی باید به اندازه فاصله جابه‌جا شوند
+            text = sample_text(length, GLYPH_COUNT, seed)
+            text = text[:length // 2] + "☃" + text[length // 2:]
+            for background in BACKGROUNDS:
+                expected = pil_font.render_text(text, background)
+                actual = numpy_font.render_text(text, background)
+                if expected.size != actual.size or expected.tobytes() != actual.tobytes():
+                    mismatches.append((length, seed, background))
+    return mismatches
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        fnt_file = generate_font(folder, GLYPH_COUNT)
+        pil_font = MonoGameFont(fnt_file, folder, use_cache=False, render_engine="pil")
+        numpy_font = MonoGameFont(fnt_file, folder, use_cache=False, render_engine="numpy")
+
+        mismatches = check_identical(pil_font, numpy_font)
+        if mismatches:
+            print(f"خروجی دو موتور یکسان نیست: {mismatches}")
+            sys.exit(1)
+        print("خروجی موتورهای pil و numpy پیکسل به پیکسل یکسان است")
+
+        for length in TEXT_LENGTHS:
+            text = sample_text(length, GLYPH_COUNT)
+            times = []
+            for font in (pil_font, numpy_font):
+                font.render_text(text)
+                times.append(min(timeit.repeat(lambda: font.render_text(text), number=1, repeat=10)))
+            print(f"{length:>6} کاراکتر: pil {times[0] * 1000:8.2f} ms   numpy {times[1] * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
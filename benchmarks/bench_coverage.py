@@ -0,0 +1,65 @@
+"""
+پوشش گلیف روی یک پیکره بزرگ: یک میلیون رشته در برابر ۲۴ فونت با پوشش‌های متفاوت.
+گزارش بیت‌مپی با بررسی مستقیم مجموعه‌ها مقایسه و زمان هر مرحله چاپ می‌شود.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_coverage
+"""
+import random
+import sys
+import time
+from glyph_coverage import CorpusScan, codepoint_bitmap, missing_report
+from benchmarks.synthetic_font import codepoints_for
+
+STRING_COUNT = 1000000
+FONT_COUNT = 24
+FULL_GLYPHS = 3000
+
+
+def make_corpus(count, seed=0):
+    """رشته‌های ۲۰ تا ۸۰ کاراکتری؛ بیشتر ASCII و گاهی کاراکتر CJK"""
+    rng = random.Random(seed)
+    ascii_text = [chr(c) for c in range(0x20, 0x7F)]
+    cjk = [chr(c) for c in codepoints_for(FULL_GLYPHS)[95:]]
+    words = ["".join(rng.choice(ascii_text) for _ in range(60)) for _ in range(1000)]
+    corpus = []
+    for i in range(count):
+        text = rng.choice(words)[:rng.randint(20, 80)]
+        if i % 50 == 0:
+            text += rng.choice(cjk)
+        corpus.append(("corpus.csv", str(i), text))
+    return corpus
+
+
+def main():
+    corpus = make_corpus(STRING_COUNT)
+    fonts = {f"font_{i:02d}": codepoints_for(FULL_GLYPHS - i * 40) for i in range(FONT_COUNT)}
+
+    start = time.perf_counter()
+    bitmaps = {label: codepoint_bitmap(points) for label, points in fonts.items()}
+    bitmap_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan = CorpusScan({label: map(chr, points) for label, points in fonts.items()}).scan(corpus)
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = missing_report(scan, bitmaps)
+    report_time = time.perf_counter() - start
+
+    used = set("".join(text for _, _, text in corpus))
+    for entry in report:
+        expected = sorted(ord(ch) for ch in used.difference(map(chr, fonts[entry["font"]])))
+        if [int(m["codepoint"][2:], 16) for m in sorted(entry["missing"], key=lambda m: m["codepoint"])] != expected:
+            print(f"گزارش {entry['font']} با بررسی مستقیم یکسان نیست")
+            sys.exit(1)
+
+    missing = sum(entry["missing_chars"] for entry in report)
+    print(f"{STRING_COUNT} رشته × {FONT_COUNT} فونت؛ گزارش با بررسی مستقیم یکسان است ({missing} مورد ناموجود)")
+    print(f"  بیت‌مپ فونت‌ها: {bitmap_time * 1000:8.1f} ms")
+    print(f"  پیمایش پیکره:   {scan_time * 1000:8.1f} ms  ({STRING_COUNT / scan_time:.0f} رشته در ثانیه)")
+    print(f"  گزارش:          {report_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
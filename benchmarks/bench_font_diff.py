@@ -0,0 +1,85 @@
+"""
+مقایسه دو نسخه فونت روی ۵۰ هزار رشته: نسخه جدید ۲۰ گلیف با پیکسل‌های تغییرکرده دارد.
+زمان گذر جدول گلیف‌ها و فیلتر برداری، تعداد رشته‌های ردشده و زمان رندر و مقایسه
+بقیه چاپ و نتیجه با مقایسه کامل نمونه‌ای از رشته‌های ردشده بررسی می‌شود.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_font_diff
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from PIL import Image
+from font import MonoGameFont
+from font_diff import compare_fonts
+from benchmarks.synthetic_font import generate_font
+
+GLYPH_COUNT = 3000
+STRING_COUNT = 50000
+CHANGED_GLYPHS = 20
+SAMPLE_CHECK = 2000
+
+
+def make_new_version(old_path, folder):
+    """کپی فونت با پیکسل‌های معکوس در CHANGED_GLYPHS گلیف تصادفی؛ (مسیر، کاراکترهای تغییرکرده)"""
+    shutil.copy(old_path, folder)
+    png_name = os.path.splitext(os.path.basename(old_path))[0] + ".png"
+    with open(old_path, encoding='utf-8') as f:
+        content = json.load(f)["content"]
+    image = Image.open(os.path.join(os.path.dirname(old_path), png_name)).convert("RGBA")
+    rng = random.Random(7)
+    indices = rng.sample(range(len(content["glyphs"])), CHANGED_GLYPHS)
+    for i in indices:
+        glyph = content["glyphs"][i]
+        box = (glyph["x"], glyph["y"], glyph["x"] + glyph["width"], glyph["y"] + glyph["height"])
+        r, g, b, a = image.crop(box).split()
+        image.paste(Image.merge("RGBA", (b, r, g, a)), box[:2])
+    image.save(os.path.join(folder, png_name))
+    return os.path.join(folder, os.path.basename(old_path)), {content["characterMap"][i] for i in indices}
+
+
+def make_corpus(characters, count, seed=0):
+    """رشته‌های ۲۰ تا ۶۰ کاراکتری از کاراکترهای پرکاربرد فونت، مانند متن واقعی"""
+    rng = random.Random(seed)
+    common = characters[:200]
+    return [("corpus.txt", str(i), "".join(rng.choice(common) for _ in range(rng.randint(20, 60))))
+            for i in range(count)]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        # پردازه‌های کارگر compare_fonts فونت‌ها را با کش باز می‌کنند؛ کش در پوشه موقت می‌ماند
+        os.environ["MGFONT_CACHE_DIR"] = os.path.join(old_dir, "cache")
+        old_path = generate_font(old_dir, GLYPH_COUNT)
+        new_path, changed = make_new_version(old_path, new_dir)
+        with open(old_path, encoding='utf-8') as f:
+            characters = json.load(f)["content"]["characterMap"]
+        rows = make_corpus(characters, STRING_COUNT)
+        print(f"{STRING_COUNT} رشته، {GLYPH_COUNT} گلیف، {CHANGED_GLYPHS} گلیف تغییرکرده "
+              f"({len(changed & set(characters[:200]))} در کاراکترهای پرکاربرد)")
+
+        differences, stats = compare_fonts(old_path, new_path, rows, workers=os.cpu_count() or 1)
+        compare_seconds = stats["seconds"] - stats["prepare_seconds"]
+        print(f"جدول گلیف‌ها و فیلتر: {stats['prepare_seconds'] * 1000:.0f} ms، "
+              f"رد شده {stats['skipped']}، مقایسه‌شده {stats['compared']}، متفاوت {stats['different']}")
+        print(f"رندر و مقایسه: {compare_seconds:.2f} ثانیه "
+              f"({stats['compared'] / compare_seconds if compare_seconds else 0:.0f} رشته در ثانیه)؛ کل {stats['seconds']:.2f} ثانیه")
+
+        # رشته‌های ردشده باید واقعاً یکسان رندر شوند
+        different = {entry["text"] for entry in differences}
+        old_font = MonoGameFont(old_path, old_dir, use_cache=False)
+        new_font = MonoGameFont(new_path, new_dir, use_cache=False)
+        skipped = [text for _, _, text in rows if not changed.intersection(text)]
+        for text in random.Random(1).sample(skipped, min(SAMPLE_CHECK, len(skipped))):
+            if text in different or old_font.render_text(text).tobytes() != new_font.render_text(text).tobytes():
+                print(f"خطا: رشته ردشده متفاوت است: {text!r}")
+                return 1
+        print(f"{min(SAMPLE_CHECK, len(skipped))} رشته ردشده نمونه با مقایسه کامل یکسان‌اند")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
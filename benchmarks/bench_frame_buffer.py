@@ -0,0 +1,141 @@
+"""
+حافظه تخصیص‌یافته در هر فریم هنگام تایپ: مسیر قدیمی ترکیب کل فریم در برابر نمای کاشی‌ای،
+با و بدون بافرهای مشترک رندر کاشی (TileBuffers).
+
+سناریو: چند فونت باز است و کاربر در یکی از فیلدها تایپ می‌کند (ابعاد ردیف‌ها ثابت).
+بایت‌ها دو بخش‌اند: تخصیص‌های پایتون (مثل tobytes) که tracemalloc می‌بیند و تصویرهای
+Image.new که حافظه‌شان داخل Pillow است و جدا شمرده می‌شود. کپی QPixmap.fromImage مسیر
+قدیمی در حافظه Qt است و در هیچ‌کدام نیامده، پس عدد واقعی «ترکیب کامل» بیشتر است.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_frame_buffer
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PIL import Image
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+from font import MonoGameFont
+from tiled_view import TiledCanvas
+from benchmarks.synthetic_font import generate_font, sample_text
+
+FONT_COUNT = 20
+TEXT_LENGTH = 80
+FRAMES = 50
+VIEWPORT = (800, 400)
+BACKGROUND = (50, 50, 50, 255)
+
+
+class ImageNewCounter:
+    """جمع بایت تصویرهای ساخته‌شده با Image.new در حین اندازه‌گیری"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.original = Image.new
+
+    def __enter__(self):
+        def counting_new(mode, size, *args, **kwargs):
+            self.bytes += size[0] * size[1] * 4
+            return self.original(mode, size, *args, **kwargs)
+
+        Image.new = counting_new
+        return self
+
+    def __exit__(self, *exc):
+        Image.new = self.original
+
+
+class LegacyFrame:
+    """مسیر پیش از نمای کاشی‌ای: کش ردیف‌ها، Image ترکیبی، tobytes و QPixmap.fromImage در هر فریم"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def __call__(self, fonts, texts):
+        images = []
+        for font, text in zip(fonts, texts):
+            img = self.rows.get((font, text))
+            if img is None:
+                img = self.rows[(font, text)] = font.render_text(text, BACKGROUND)
+            images.append(img)
+        combined = Image.new("RGBA", (max(img.width for img in images), sum(img.height for img in images)))
+        y = 0
+        for img in images:
+            combined.paste(img, (0, y))
+            y += img.height
+        data = combined.tobytes("raw", "RGBA")
+        qimg = QImage(data, combined.width, combined.height, combined.width * 4, QImage.Format_RGBA8888)
+        return QPixmap.fromImage(qimg)
+
+
+def typing_frames(length):
+    """متن فیلد اول در هر فریم یک کاراکتر جابه‌جا می‌شود؛ طول ثابت است"""
+    base = sample_text(length + FRAMES, 500, seed=7)
+    return [base[i:i + length] for i in range(FRAMES)]
+
+
+def measure(render):
+    """(میانگین بایت پایتون، میانگین بایت Image.new، میانگین زمان ms) هر فریم"""
+    python_bytes = 0
+    tracemalloc.start()
+    with ImageNewCounter() as counter:
+        start = time.perf_counter()
+        for frame_index in range(FRAMES):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = render(frame_index)
+            _, peak = tracemalloc.get_traced_memory()
+            python_bytes += peak - before
+            del result
+        elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return python_bytes / FRAMES, counter.bytes / FRAMES, elapsed * 1000 / FRAMES
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as folder:
+        fnt_file = generate_font(folder, 500)
+        fonts = [MonoGameFont(fnt_file, folder, use_cache=False) for _ in range(FONT_COUNT)]
+        texts = [sample_text(TEXT_LENGTH, 500, seed=i) for i in range(FONT_COUNT)]
+        edits = typing_frames(TEXT_LENGTH)
+
+        legacy = LegacyFrame()
+        legacy(fonts, texts)
+        results = {"ترکیب کامل": measure(lambda i: legacy(fonts, [edits[i]] + texts[1:]))}
+
+        for name, reuse in (("کاشی بدون بافر مشترک", False), ("کاشی با بافر مشترک", True)):
+            canvas = TiledCanvas()
+            canvas.resize(*VIEWPORT)
+            canvas.show()
+            QApplication.processEvents()
+            if not reuse:
+                canvas.tile_buffers = None
+            canvas.set_rows(fonts, texts, BACKGROUND)
+            canvas.wait_for_tiles()
+            rendered = canvas.tiles_rendered
+
+            def frame(i):
+                canvas.set_rows(fonts, [edits[i]] + texts[1:], BACKGROUND)
+                canvas.wait_for_tiles()
+
+            results[name] = measure(frame)
+            tiles_per_frame = (canvas.tiles_rendered - rendered) / FRAMES
+            canvas.tile_pool.waitForDone()
+            canvas.close()
+
+    print(f"{FONT_COUNT} فونت، پنجره {VIEWPORT[0]}x{VIEWPORT[1]}، تایپ در یک فیلد "
+          f"({tiles_per_frame:.1f} کاشی تازه در هر فریم نمای کاشی‌ای)")
+    for name, (python_bytes, image_bytes, elapsed) in results.items():
+        print(f"  {name:22s} پایتون {python_bytes / 1024:8.1f} KiB  Image.new {image_bytes / 1024:8.1f} KiB"
+              f"  {elapsed:6.2f} ms در هر فریم")
+    del app
+
+
+if __name__ == "__main__":
+    main()
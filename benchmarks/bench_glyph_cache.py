@@ -0,0 +1,38 @@
+"""
+بنچمارک کش گلیف MonoGameFont: زمان هر رندر یک متن ۱۰۰۰ کاراکتری با و بدون کش.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_glyph_cache
+"""
+import tempfile
+import timeit
+from font import MonoGameFont, GLYPH_CACHE_LIMIT
+from benchmarks.synthetic_font import generate_font, sample_text
+
+GLYPH_COUNT = 5000
+TEXT_LENGTH = 1000
+REPEAT = 20
+
+
+def time_render(font, text):
+    font.render_text(text)  # گرم کردن کش
+    return min(timeit.repeat(lambda: font.render_text(text), number=1, repeat=REPEAT))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        fnt_file = generate_font(folder, GLYPH_COUNT)
+        text = sample_text(TEXT_LENGTH, GLYPH_COUNT)
+        uncached = MonoGameFont(fnt_file, folder, use_cache=False, glyph_cache_limit=0)
+        cached = MonoGameFont(fnt_file, folder, use_cache=False, glyph_cache_limit=GLYPH_CACHE_LIMIT)
+        before = time_render(uncached, text)
+        after = time_render(cached, text)
+
+    print(f"render_text ({TEXT_LENGTH} کاراکتر، {GLYPH_COUNT} گلیف)")
+    print(f"  بدون کش: {before * 1000:.2f} ms")
+    print(f"  با کش:   {after * 1000:.2f} ms  ({before / after:.1f}x)")
+    print(f"  حافظه کش: {cached.glyph_cache_bytes / 1024:.0f} KiB در {len(cached.glyph_cache)} گلیف")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+مقایسه GlyphTable با نمایش قبلی (dict از اشیاء FontCharacter بدون __slots__):
+حافظه، زمان ساخت و زمان جستجوی کدپوینت‌ها.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_glyph_table
+"""
+import random
+import timeit
+import tracemalloc
+from glyph_table import GlyphTable
+from benchmarks.synthetic_font import codepoints_for
+
+GLYPH_COUNTS = (1000, 20000, 60000)
+LOOKUPS = 100000
+
+
+class LegacyFontCharacter:
+    """FontCharacter پیش از __slots__، برای مقایسه"""
+
+    def __init__(self, id, x, y, width, height, xoffset, yoffset, xadvance, page):
+        self.id = id
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.xoffset = xoffset
+        self.yoffset = yoffset
+        self.xadvance = xadvance
+        self.page = page
+
+
+def glyph_rows(count):
+    rng = random.Random(0)
+    for i, cp in enumerate(codepoints_for(count)):
+        yield cp, (i % 128) * 16, (i // 128) * 20, rng.randint(1, 16), rng.randint(1, 20), rng.randint(-1, 1), rng.randint(0, 4), 17, 0
+
+
+def build_dict(rows):
+    chars = {}
+    for values in rows:
+        c = LegacyFontCharacter(*values)
+        chars[c.id] = c
+    return chars
+
+
+def build_table(rows):
+    table = GlyphTable()
+    for values in rows:
+        table.add(*values)
+    return table
+
+
+def measure(build, rows):
+    """(شیء ساخته‌شده، حافظه اشغال‌شده به بایت)"""
+    tracemalloc.start()
+    result = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    for count in GLYPH_COUNTS:
+        rows = list(glyph_rows(count))
+        chars, dict_bytes = measure(build_dict, rows)
+        table, table_bytes = measure(build_table, rows)
+        build_dict_time = min(timeit.repeat(lambda: build_dict(rows), number=1, repeat=3))
+        build_table_time = min(timeit.repeat(lambda: build_table(rows), number=1, repeat=3))
+
+        rng = random.Random(1)
+        ids = [values[0] for values in rows]
+        # نیمی از جستجوها کدپوینت ناموجود است (مانند متن با کاراکترهای بدون گلیف)
+        queries = [rng.choice(ids) if i % 2 else rng.randint(0, 0x2FFFF) for i in range(LOOKUPS)]
+
+        def lookup_dict():
+            for cid in queries:
+                c = chars.get(cid)
+                if c is not None:
+                    c.xadvance
+
+        def lookup_table():
+            xadvance = table.xadvance
+            for cid in queries:
+                row = table.row(cid)
+                if row >= 0:
+                    xadvance[row]
+
+        dict_time = min(timeit.repeat(lookup_dict, number=1, repeat=5))
+        table_time = min(timeit.repeat(lookup_table, number=1, repeat=5))
+
+        print(f"{count} گلیف")
+        print(f"  حافظه:  dict {dict_bytes / 1024:9.0f} KiB   GlyphTable {table_bytes / 1024:9.0f} KiB"
+              f"  ({dict_bytes / table_bytes:.1f}x کمتر)")
+        print(f"  ساخت:   dict {build_dict_time * 1000:9.2f} ms    GlyphTable {build_table_time * 1000:9.2f} ms")
+        print(f"  {LOOKUPS} جستجو: dict {dict_time * 1000:7.2f} ms    GlyphTable {table_time * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+خواندن جریانی فایل JSON فونت در برابر json.load روی یک فونت مصنوعی ۶۰ هزار گلیفی:
+یکسان بودن جدول گلیف‌ها، اوج حافظه پردازش و زمان تا اولین رندر.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_json_stream
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import monogame_font_parser
+from font import MonoGameFont
+from glyph_table import GlyphTable, COLUMNS
+from texture_registry import TextureRegistry
+from benchmarks.synthetic_font import generate_font
+
+GLYPH_COUNT = 60000
+
+
+def parse(fnt_file, stream):
+    chars = GlyphTable()
+    monogame_font_parser.parse_monogame_fnt(fnt_file, chars, {}, stream=stream)
+    return chars
+
+
+def measure_parse(fnt_file, stream):
+    """(جدول گلیف، زمان، اوج حافظه tracemalloc به بایت)؛ زمان بدون tracemalloc اندازه‌گیری می‌شود"""
+    elapsed = min(timeit.repeat(lambda: parse(fnt_file, stream), number=1, repeat=3))
+    tracemalloc.start()
+    chars = parse(fnt_file, stream)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return chars, elapsed, peak
+
+
+def time_to_first_render(fnt_file, stream):
+    monogame_font_parser.STREAM_JSON = stream
+    start = time.perf_counter()
+    font = MonoGameFont(fnt_file, os.path.dirname(fnt_file), use_cache=False, textures=TextureRegistry())
+    font.render_text("Hello, world")
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        fnt_file = generate_font(folder, GLYPH_COUNT)
+        size = os.path.getsize(fnt_file)
+
+        loaded, load_time, load_peak = measure_parse(fnt_file, stream=False)
+        streamed, stream_time, stream_peak = measure_parse(fnt_file, stream=True)
+        identical = all(getattr(loaded, name) == getattr(streamed, name) for name in COLUMNS)
+        if not identical:
+            print("جدول گلیف‌های دو روش یکسان نیست")
+            sys.exit(1)
+
+        load_ttfr = min(time_to_first_render(fnt_file, False) for _ in range(3))
+        stream_ttfr = min(time_to_first_render(fnt_file, True) for _ in range(3))
+        monogame_font_parser.STREAM_JSON = True
+
+    print(f"{GLYPH_COUNT} گلیف، فایل JSON {size / (1024 * 1024):.1f} MiB؛ جدول گلیف‌ها یکسان است")
+    print(f"  json.load: پردازش {load_time * 1000:7.0f} ms  اوج حافظه {load_peak / (1024 * 1024):6.1f} MiB"
+          f"  اولین رندر {load_ttfr * 1000:7.0f} ms")
+    print(f"  جریانی:    پردازش {stream_time * 1000:7.0f} ms  اوج حافظه {stream_peak / (1024 * 1024):6.1f} MiB"
+          f"  اولین رندر {stream_ttfr * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+سرویس رندر در برابر پردازه تازه برای هر درخواست: زمان یک اندازه‌گیری و یک رندر از
+طریق HTTP (و سوکت یونیکس در صورت وجود)، در کنار هزینه اجرای یک پردازه پایتون که فونت
+را بارگذاری و متن را اندازه می‌گیرد. در پایان چند کلاینت هم‌زمان اجرا می‌شوند.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_render_server
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from render_server import FontPool, RenderClient, RenderHTTPServer, RenderService, RenderUnixServer
+from benchmarks.synthetic_font import generate_font, sample_text
+
+GLYPH_COUNT = 3000
+REPEAT = 500
+CLIENTS = 8
+
+
+def latency(function, repeat=REPEAT):
+    """(میانه، p95) زمان هر فراخوانی به میلی‌ثانیه"""
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function(i)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95)]
+
+
+def cold_process(fnt_file, folder, text):
+    """زمان ms اجرای یک پردازه که فونت را بارگذاری و متن را اندازه می‌گیرد"""
+    code = ("import sys; from font import MonoGameFont; "
+            "print(MonoGameFont(sys.argv[1], sys.argv[2]).measure_text(sys.argv[3]))")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code, fnt_file, folder, text], check=True,
+                   stdout=subprocess.DEVNULL, env=dict(os.environ, PYTHONPATH=os.getcwd()))
+    return (time.perf_counter() - start) * 1000
+
+
+def report(label, client, fnt_file, texts):
+    client.measure(fnt_file, texts[0])
+    median, p95 = latency(lambda i: client.measure(fnt_file, texts[i % len(texts)]))
+    print(f"{label}: measure میانه {median:.3f} ms، p95 {p95:.3f} ms")
+    median, p95 = latency(lambda i: client.render_png(fnt_file, texts[i % len(texts)]))
+    print(f"{label}: render میانه {median:.3f} ms، p95 {p95:.3f} ms")
+    texts_batch = texts * 10
+    median, _ = latency(lambda i: client.measure_many(fnt_file, texts_batch), repeat=20)
+    print(f"{label}: measure_many {len(texts_batch)} متن {median:.2f} ms")
+
+
+def concurrent(port, fnt_file, texts):
+    """کل زمان ms برای CLIENTS کلاینت هم‌زمان که هر کدام REPEAT رندر می‌فرستند"""
+    def worker():
+        client = RenderClient(port=port)
+        for i in range(REPEAT):
+            client.render_png(fnt_file, texts[i % len(texts)])
+        client.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        # پردازه تازه و FontPool فونت را با کش باز می‌کنند؛ کش در پوشه موقت می‌ماند
+        os.environ["MGFONT_CACHE_DIR"] = os.path.join(folder, "cache")
+        fnt_file = generate_font(folder, GLYPH_COUNT)
+        texts = [sample_text(40, GLYPH_COUNT, seed=i) for i in range(100)]
+
+        cold = min(cold_process(fnt_file, folder, texts[0]) for _ in range(3))
+        print(f"پردازه تازه (بارگذاری + measure): {cold:.0f} ms")
+
+        service = RenderService(FontPool())
+        server = RenderHTTPServer(("127.0.0.1", 0), service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        client = RenderClient(port=port)
+        report("HTTP", client, fnt_file, texts)
+        client.close()
+
+        total = concurrent(port, fnt_file, texts)
+        print(f"{CLIENTS} کلاینت هم‌زمان، {CLIENTS * REPEAT} رندر: {total:.0f} ms "
+              f"({CLIENTS * REPEAT / total * 1000:.0f} درخواست در ثانیه)")
+        server.shutdown()
+        server.server_close()
+
+        if RenderUnixServer is not None:
+            socket_path = os.path.join(folder, "render.sock")
+            server = RenderUnixServer(socket_path, service)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            client = RenderClient(socket_path=socket_path)
+            report("یونیکس", client, fnt_file, texts)
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
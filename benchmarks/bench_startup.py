@@ -0,0 +1,85 @@
+"""
+زمان شروع نمایشگر با بودجه: main.py چند بار در پردازه تازه با MGFONT_STARTUP_PROBE=1
+اجرا می‌شود و زمان نمایش پنجره و زمان آماده شدن فونت‌های جلسه (بازیابی از کش دیسکی)
+اندازه‌گیری می‌شود. اگر میانه هر کدام از بودجه بیشتر باشد کد خروج ۱ است؛ آزمون
+tests/test_startup.py همین بررسی را با بودجه‌های پیش‌فرض در python -m pytest اجرا می‌کند.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --window-budget 400 --ready-budget 800
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import session
+from benchmarks.synthetic_font import generate_font, sample_text
+
+# بودجه پیش‌فرض (میلی‌ثانیه از شروع main.py)
+WINDOW_BUDGET_MS = 500
+READY_BUDGET_MS = 1000
+RUNS = 5
+FONT_COUNT = 4
+GLYPH_COUNT = 3000
+
+
+def run_viewer(env, args=()):
+    """(زمان‌های STARTUP چاپ‌شده، زمان کل پردازه ms)"""
+    main_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, main_path, *args], env=env, capture_output=True, text=True, timeout=120)
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"main.py با کد {result.returncode} تمام شد:\n{result.stderr[-2000:]}")
+    times = {}
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            _, name, value = line.split()
+            times[name] = float(value)
+    return times, wall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="اندازه‌گیری زمان شروع نمایشگر و مقایسه با بودجه")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--window-budget", type=float, default=WINDOW_BUDGET_MS, help="بودجه نمایش پنجره (ms)")
+    parser.add_argument("--ready-budget", type=float, default=READY_BUDGET_MS, help="بودجه آماده شدن فونت‌ها (ms)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        fonts = [generate_font(folder, GLYPH_COUNT, name=f"font_{i}", seed=i) for i in range(FONT_COUNT)]
+        env = dict(os.environ, MGFONT_STARTUP_PROBE="1", QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"),
+                   MGFONT_CONFIG_DIR=os.path.join(folder, "config"), MGFONT_CACHE_DIR=os.path.join(folder, "cache"))
+        env.pop("MGFONT_NO_SESSION", None)
+        session.write_json(os.path.join(env["MGFONT_CONFIG_DIR"], session.SESSION_FILE), {
+            "version": session.SESSION_VERSION,
+            "fonts": [{"path": path, "text": sample_text(40, GLYPH_COUNT, seed=i)} for i, path in enumerate(fonts)],
+            "zoom": 1.5, "background": [30, 30, 30, 255], "smooth": True, "highlight_missing": False,
+        })
+
+        # اجرای اول کش دیسکی فونت‌ها را می‌سازد (شروع سرد واقعی)
+        times, wall = run_viewer(env)
+        print(f"اجرای اول (ساخت کش): پنجره {times['window_shown']:.0f} ms، فونت‌ها {times['fonts_ready']:.0f} ms، کل {wall:.0f} ms")
+
+        runs = [run_viewer(env) for _ in range(args.runs)]
+        window = statistics.median(times["window_shown"] for times, _ in runs)
+        ready = statistics.median(times["fonts_ready"] for times, _ in runs)
+        wall = statistics.median(wall for _, wall in runs)
+        print(f"میانه {args.runs} اجرا با جلسه {FONT_COUNT} فونتی: پنجره {window:.0f} ms (بودجه {args.window_budget:.0f})، "
+              f"فونت‌ها {ready:.0f} ms (بودجه {args.ready_budget:.0f})، کل پردازه {wall:.0f} ms")
+
+    failed = False
+    if window > args.window_budget:
+        print(f"خطا: نمایش پنجره {window - args.window_budget:.0f} ms بیشتر از بودجه است")
+        failed = True
+    if ready > args.ready_budget:
+        print(f"خطا: آماده شدن فونت‌ها {ready - args.ready_budget:.0f} ms بیشتر از بودجه است")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+نمای کاشی‌ای در برابر رندر کامل ردیف‌ها: زمان یک فریم و حافظه تصویرها با رشد طول متن
+و تعداد فونت‌ها. اندازه پنجره ثابت (800x400) است. زمان نمای کاشی‌ای تا رسیدن همه
+کاشی‌های دیدنی از نخ پس‌زمینه است.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_tiled_view
+"""
+import os
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from font import MonoGameFont
+from tiled_view import TiledCanvas
+from benchmarks.synthetic_font import generate_font, sample_text
+
+GLYPH_COUNT = 500
+CASES = ((1, 100), (1, 10000), (1, 100000), (10, 10000), (50, 10000))
+VIEWPORT = (800, 400)
+BACKGROUND = (50, 50, 50, 255)
+
+
+def full_frame(fonts, texts):
+    """(زمان ms، بایت تصویر) روش پیش از نمای کاشی‌ای: رندر کامل همه ردیف‌ها"""
+    start = time.perf_counter()
+    images = [font.render_text(text, BACKGROUND) for font, text in zip(fonts, texts)]
+    return (time.perf_counter() - start) * 1000, sum(img.width * img.height * 4 for img in images)
+
+
+def tiled_frame(fonts, texts):
+    """(زمان ms، بایت کاشی‌ها) اولین فریم نمای کاشی‌ای با کش خالی"""
+    canvas = TiledCanvas()
+    canvas.resize(*VIEWPORT)
+    canvas.show()
+    QApplication.processEvents()
+    start = time.perf_counter()
+    canvas.set_rows(fonts, texts, BACKGROUND)
+    canvas.wait_for_tiles()
+    elapsed = (time.perf_counter() - start) * 1000
+    canvas.close()
+    return elapsed, canvas.tiles_bytes
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as folder:
+        fnt_file = generate_font(folder, GLYPH_COUNT)
+        print(f"{'فونت':>5s} {'کاراکتر':>8s} {'کامل (ms)':>11s} {'کامل (KiB)':>11s} {'کاشی (ms)':>11s} {'کاشی (KiB)':>11s}")
+        for font_count, length in CASES:
+            # هر ردیف فونت جدا دارد تا کش گلیف‌ها بین ردیف‌ها مشترک نباشد
+            fonts = [MonoGameFont(fnt_file, folder, use_cache=False) for _ in range(font_count)]
+            texts = [sample_text(length, GLYPH_COUNT, seed=i) for i in range(font_count)]
+            tiled_time, tiled_bytes = tiled_frame(fonts, texts)
+            for font in fonts:
+                font.clear_glyph_cache()
+            full_time, full_bytes = full_frame(fonts, texts)
+            print(f"{font_count:5d} {length:8d} {full_time:11.1f} {full_bytes / 1024:11.0f} "
+                  f"{tiled_time:11.1f} {tiled_bytes / 1024:11.0f}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+بارگذاری سرد .xnb با خواننده داخلی: زمان باز کردن بدنه LZX و LZ4 و خواندن کامل SpriteFont
+برای اطلس‌های بزرگ، و در صورت وجود App/xnbcli.exe مقایسه با مسیر قدیمی xnbcli.
+
+فایل‌ها با فشرده‌ساز tests/fixtures/make_xnb_fixtures ساخته می‌شوند؛ ساخت نسخه LZX
+اطلس ۲۰۴۸ پیکسلی چند ده ثانیه طول می‌کشد ولی در زمان‌ها حساب نمی‌شود.
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.bench_xnb
+    python -m benchmarks.bench_xnb --sizes 512 1024 2048
+"""
+import argparse
+import os
+import tempfile
+import timeit
+from PIL import Image, ImageDraw
+import monogame_font_parser
+import xnb_reader
+from tests.fixtures.make_xnb_fixtures import lz4_compress, lzx_compress, spritefont_payload, wrap_xnb
+
+CELL = (20, 24)
+REPEAT = 3
+
+
+def atlas_payload(size):
+    """بدنه SpriteFont با اطلس size×size پر از گلیف (تقریباً مانند اطلس فونت‌های CJK)"""
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    chars = []
+    glyphs = []
+    for y in range(0, size - CELL[1] + 1, CELL[1]):
+        for x in range(0, size - CELL[0] + 1, CELL[0]):
+            index = len(chars)
+            draw.text((x + 2, y + 4), chr(33 + index % 94) + chr(0x628 + index % 20), fill=(255, 255, 255, 255))
+            chars.append(chr(0x4E00 + index))
+            glyphs.append((x, y, CELL[0] - 1, CELL[1] - 1))
+    return spritefont_payload(image, chars, glyphs, glyphs)
+
+
+def best_of(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="زمان بارگذاری سرد .xnb فشرده با خواننده داخلی")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024, 2048], help="ضلع اطلس (پیکسل)")
+    args = parser.parse_args(argv)
+
+    try:
+        monogame_font_parser.get_xnbcli_path()
+        has_xnbcli = os.name == "nt"
+    except FileNotFoundError:
+        has_xnbcli = False
+
+    with tempfile.TemporaryDirectory() as folder:
+        for size in args.sizes:
+            payload = atlas_payload(size)
+            mib = len(payload) / (1024 * 1024)
+            files = {}
+            for name, flag, body in (("lzx", 0x80, lzx_compress(payload)), ("lz4", 0x40, lz4_compress(payload))):
+                files[name] = os.path.join(folder, f"atlas_{size}_{name}.xnb")
+                with open(files[name], "wb") as f:
+                    f.write(wrap_xnb(payload, flag, body))
+
+            print(f"اطلس {size}×{size}، بدنه {mib:.1f} MiB:")
+            for name, path in files.items():
+                with open(path, "rb") as f:
+                    data = f.read()
+                unpack = best_of(lambda: xnb_reader.read_xnb_payload(data))
+                full = best_of(lambda: xnb_reader.read_xnb_spritefont(path))
+                print(f"  {name}: فایل {len(data) / 1024:7.0f} KiB  باز کردن {unpack * 1000:6.0f} ms"
+                      f" ({mib / unpack:5.1f} MiB/s)  خواندن کامل {full * 1000:6.0f} ms")
+            if has_xnbcli:
+                elapsed = best_of(lambda: monogame_font_parser.extract_xnb_file(files["lzx"], os.path.join(folder, "xnbcli")))
+                print(f"  xnbcli (LZX): {elapsed * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
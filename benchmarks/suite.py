@@ -0,0 +1,204 @@
+"""
+مجموعه بنچمارک مسیرهای پرکار با فونت‌های مصنوعی ۱۰۰، ۵ هزار و ۶۰ هزار گلیفی.
+
+مرحله‌ها جداگانه اندازه‌گیری می‌شوند: parse_monogame_fnt، load_pages (ثبت و رمزگشایی
+صفحه‌ها)، render_text روی متن کوتاه، پاراگراف و ۱۰ هزار کاراکتری، فریم نمای کاشی‌ای
+(TiledCanvas) با ۱، ۱۰ و ۵۰ فونت و رسم آن با زوم. برای هر مرحله کمترین زمان چند تکرار و اوج حافظه
+tracemalloc (بدون حافظه داخلی Pillow و Qt) گزارش می‌شود.
+
+مرحله «رندر همه فونت‌ها» پیش‌تر render_fonts/N بود؛ از وقتی نمایشگر ردیف‌ها را با
+TiledCanvas رسم می‌کند و renderer.render_fonts حذف شده، همین مرحله با نام tiles/N/cold|warm
+اندازه‌گیری می‌شود؛ در مقایسه با فایل JSON اجرایی قدیمی‌تر، مرحله‌های tiles/N «جدید» نشان
+داده می‌شوند.
+
+نتیجه در یک فایل JSON ذخیره می‌شود و با --compare با اجرای قبلی مقایسه می‌شود؛ اگر
+مرحله‌ای بیش از --threshold کندتر شده باشد کد خروج ۱ است. بدون نمایشگر اجرا می‌شود
+(QT_QPA_PLATFORM=offscreen).
+
+اجرا از ریشه مخزن:
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --output new.json --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from font import MonoGameFont, RENDER_ENGINES
+from glyph_table import GlyphTable
+from monogame_font_parser import parse_monogame_fnt
+from texture_registry import TextureRegistry
+from tiled_view import TiledCanvas
+from benchmarks.synthetic_font import generate_font, sample_text
+
+GLYPH_COUNTS = (100, 5000, 60000)
+TEXT_LENGTHS = {"short": 12, "paragraph": 600, "10k": 10000}
+FONT_COUNTS = (1, 10, 50)
+# اندازه فونت و پنجره مرحله‌های نمای کاشی‌ای و زوم
+DISPLAY_GLYPHS = 5000
+DISPLAY_TEXT_LENGTH = 60
+VIEWPORT = (800, 400)
+ZOOM_FACTORS = (0.5, 2.0)
+BACKGROUND = (50, 50, 50, 255)
+REPEAT = 5
+# کندتر شدن بیش از این نسبت در مقایسه پسرفت شمرده می‌شود
+REGRESSION_THRESHOLD = 1.25
+# تفاوت‌های کمتر از این مقدار (میلی‌ثانیه) نویز اندازه‌گیری‌اند، نه پسرفت
+REGRESSION_MIN_DELTA_MS = 0.1
+
+
+def measure(func, repeat=REPEAT):
+    """{"time_ms", "peak_kib"}: کمترین زمان repeat اجرا و اوج حافظه یک اجرای جدا"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()  # گرم کردن
+        elapsed = min(timeit.repeat(func, number=1, repeat=repeat))
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"time_ms": round(elapsed * 1000, 3), "peak_kib": round(peak / 1024, 1)}
+
+
+def bench_font(fnt_file, folder, glyph_count, engine, results):
+    def parse():
+        parse_monogame_fnt(fnt_file, GlyphTable(), {})
+
+    results[f"parse/{glyph_count}"] = measure(parse)
+
+    page_names = {}
+    parse_monogame_fnt(fnt_file, GlyphTable(), page_names)
+    with contextlib.redirect_stdout(io.StringIO()):
+        font = MonoGameFont(fnt_file, folder, use_cache=False, render_engine=engine, textures=TextureRegistry())
+
+    def load_pages():
+        font.textures = TextureRegistry()
+        font.pages = dict(page_names)
+        font.load_pages()
+        for pid in font.pages:
+            font.get_page(pid)
+
+    results[f"load_pages/{glyph_count}"] = measure(load_pages)
+
+    for name, length in TEXT_LENGTHS.items():
+        text = sample_text(length, glyph_count, seed=length)
+        results[f"render_text/{glyph_count}/{name}"] = measure(lambda: font.render_text(text, BACKGROUND))
+
+
+def bench_display(fnt_file, folder, engine, results):
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = MonoGameFont(fnt_file, folder, use_cache=False, render_engine=engine)
+    canvas = TiledCanvas()
+    canvas.resize(*VIEWPORT)
+    canvas.show()
+    QApplication.processEvents()
+    for count in FONT_COUNTS:
+        # هر ردیف یک نمونه فونت جداست تا کش گلیف‌ها مشترک نباشد
+        with contextlib.redirect_stdout(io.StringIO()):
+            fonts = [base] + [MonoGameFont(fnt_file, folder, use_cache=False, render_engine=engine)
+                              for _ in range(count - 1)]
+        texts = [sample_text(DISPLAY_TEXT_LENGTH, DISPLAY_GLYPHS, seed=i) for i in range(count)]
+
+        def frame(clear):
+            # cold: کش کاشی‌ها خالی است و کاشی‌های دیدنی در نخ پس‌زمینه رندر می‌شوند؛ warm: فقط رسم
+            if clear:
+                canvas.clear()
+            canvas.set_rows(fonts, texts, BACKGROUND)
+            canvas.wait_for_tiles()
+
+        results[f"tiles/{count}/cold"] = measure(lambda: frame(True))
+        results[f"tiles/{count}/warm"] = measure(lambda: frame(False))
+
+    # رسم کاشی‌های کش‌شده آخرین حالت با زوم (مقیاس‌دهی QPainter)
+    for factor in ZOOM_FACTORS:
+        for smooth in (True, False):
+            mode = "smooth" if smooth else "fast"
+
+            def zoomed():
+                canvas.set_zoom(factor, smooth)
+                canvas.wait_for_tiles()
+
+            results[f"zoom/{factor}/{mode}"] = measure(zoomed)
+    canvas.close()
+
+
+def compare(results, baseline, threshold):
+    """چاپ نسبت زمان هر مرحله به اجرای قبلی؛ فهرست مرحله‌های کندشده را برمی‌گرداند"""
+    regressions = []
+    print(f"\nمقایسه با اجرای قبلی (آستانه پسرفت {threshold:.2f}x):")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"  {name:32s} جدید")
+            continue
+        ratio = current["time_ms"] / previous["time_ms"] if previous["time_ms"] else 1.0
+        mark = ""
+        if ratio > threshold and current["time_ms"] - previous["time_ms"] > REGRESSION_MIN_DELTA_MS:
+            mark = "  << پسرفت"
+            regressions.append(name)
+        print(f"  {name:32s} {previous['time_ms']:10.2f} -> {current['time_ms']:10.2f} ms  {ratio:5.2f}x{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="مجموعه بنچمارک MonoGame Font Renderer")
+    parser.add_argument("--output", help="ذخیره نتیجه در این فایل JSON")
+    parser.add_argument("--compare", help="فایل JSON اجرای قبلی برای مقایسه")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--engine", choices=RENDER_ENGINES, default="pil")
+    parser.add_argument("--glyphs", type=int, nargs="+", default=list(GLYPH_COUNTS),
+                        help="اندازه فونت‌های مصنوعی مرحله‌های parse/load_pages/render_text")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    results = {}
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as folder:
+        for glyph_count in sorted(set(args.glyphs) | {DISPLAY_GLYPHS}):
+            fnt_file = generate_font(folder, glyph_count)
+            if glyph_count in args.glyphs:
+                bench_font(fnt_file, folder, glyph_count, args.engine, results)
+            if glyph_count == DISPLAY_GLYPHS:
+                bench_display(fnt_file, folder, args.engine, results)
+
+    print(f"{'مرحله':32s} {'زمان (ms)':>12s} {'اوج حافظه (KiB)':>16s}")
+    for name, result in results.items():
+        print(f"{name:32s} {result['time_ms']:12.2f} {result['peak_kib']:16.1f}")
+    print(f"کل زمان اجرا: {time.perf_counter() - start:.1f} ثانیه")
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "engine": args.engine,
+            "repeat": REPEAT,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"نتیجه: {args.output}")
+
+    status = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            status = 1
+    del app
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import json
+import os
+import random
+from PIL import Image, ImageDraw
+
+CELL_WIDTH = 16
+CELL_HEIGHT = 20
+
+
+def codepoints_for(glyph_count):
+    """کدپوینت‌های فونت مصنوعی: ابتدا ASCII قابل چاپ و سپس محدوده CJK"""
+    points = list(range(0x20, 0x7F))
+    cjk = 0x4E00
+    while len(points) < glyph_count:
+        if 0xD800 <= cjk <= 0xDFFF:
+            cjk = 0xE000  # نیم‌جانشین‌ها نویسه معتبر نیستند
+        points.append(cjk)
+        cjk += 1
+    return points[:glyph_count]
+
+
+def generate_font(folder, glyph_count, name=None, seed=0):
+    """
+    ساخت یک فونت MonoGame مصنوعی (JSON با ساختار خروجی xnbcli + اطلس PNG).
+
+    Args:
+        folder (str): پوشه خروجی
+        glyph_count (int): تعداد گلیف‌ها
+        name (str): نام پایه فایل‌ها (پیش‌فرض: synthetic_<glyph_count>)
+        seed (int): بذر تولید اعداد تصادفی برای خروجی تکرارپذیر
+
+    Returns:
+        str: مسیر فایل JSON ساخته‌شده
+    """
+    rng = random.Random(seed)
+    name = name or f"synthetic_{glyph_count}"
+    os.makedirs(folder, exist_ok=True)
+
+    columns = max(1, min(256, int(glyph_count ** 0.5) + 1))
+    rows = (glyph_count + columns - 1) // columns
+    atlas = Image.new("RGBA", (columns * CELL_WIDTH, rows * CELL_HEIGHT), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(atlas)
+
+    glyphs = []
+    cropping = []
+    character_map = []
+    for i, cp in enumerate(codepoints_for(glyph_count)):
+        x = (i % columns) * CELL_WIDTH
+        y = (i // columns) * CELL_HEIGHT
+        width = 0 if cp == 0x20 else rng.randint(4, CELL_WIDTH - 2)
+        height = 0 if cp == 0x20 else rng.randint(8, CELL_HEIGHT - 2)
+        if width and height:
+            color = (rng.randint(128, 255), rng.randint(128, 255), rng.randint(128, 255), rng.randint(96, 255))
+            draw.rectangle((x, y, x + width - 1, y + height - 1), fill=color)
+            draw.line((x, y, x + width - 1, y + height - 1), fill=(255, 255, 255, 255))
+        glyphs.append({"x": x, "y": y, "width": width if cp != 0x20 else 5, "height": height})
+        cropping.append({"x": rng.randint(-1, 1), "y": CELL_HEIGHT - height - rng.randint(0, 4), "width": width, "height": CELL_HEIGHT})
+        character_map.append(chr(cp))
+
+    png_name = f"{name}.png"
+    atlas.save(os.path.join(folder, png_name))
+
+    descriptor = {
+        "header": {"target": "w", "formatVersion": 5, "hidef": False, "compressed": False},
+        "readers": [],
+        "content": {
+            "texture": {"format": 0, "export": png_name},
+            "glyphs": glyphs,
+            "cropping": cropping,
+            "characterMap": character_map,
+            "verticalLineSpacing": CELL_HEIGHT,
+            "horizontalSpacing": 1,
+            "kerning": [{"x": 0, "y": g["width"], "z": 1} for g in glyphs],
+            "defaultCharacter": None,
+        },
+    }
+    json_path = os.path.join(folder, f"{name}.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(descriptor, f, ensure_ascii=False)
+    return json_path
+
+
+def sample_text(length, glyph_count, seed=0):
+    """متن تصادفی به طول length از کاراکترهای موجود در فونت مصنوعی"""
+    rng = random.Random(seed)
+    points = codepoints_for(glyph_count)
+    return "".join(chr(rng.choice(points)) for _ in range(length))
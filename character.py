@@ -1,4 +1,6 @@
 class FontCharacter:
+    __slots__ = ("id", "x", "y", "width", "height", "xoffset", "yoffset", "xadvance", "page")
+
     def __init__(self, id, x, y, width, height, xoffset, yoffset, xadvance, page):
         self.id = id
         self.x = x
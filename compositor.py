@@ -0,0 +1,232 @@
+"""
+موتور رندر NumPy برای MonoGameFont؛ خروجی پیکسل به پیکسل با مسیر PIL یکسان است.
+
+این موتور انتخابی است و "pil" پیش‌فرض می‌ماند: مسیر PIL با کش گلیف‌ها (paste در C)
+در متن‌های کوتاه تا دو برابر سریع‌تر است و در متن‌های بلند حداکثر حدود ۲۰ درصد کندتر
+(benchmarks.bench_compositor، فونت ۵ هزار گلیفی: ۱۰ کاراکتر 0.10 در برابر 0.21 ms،
+۱۰ هزار کاراکتر حدود 100 در برابر 85 ms). یکسان بودن خروجی دو موتور در
+tests/test_compositor.py بررسی می‌شود.
+
+پیکسل‌های اطلس و اطلس ترکیب‌شده با پس‌زمینه برای هر صفحه در TextureRegistry فونت
+(get_array) نگه داشته می‌شوند: حجمشان در سقف حافظه صفحه‌ها حساب می‌شود و با آزاد شدن
+صفحه آزاد می‌شوند.
+"""
+import numpy as np
+from PIL import Image
+
+
+def _blend_channels(dst, src):
+    """فرمول paste ماسک‌دار PIL روی کانال‌های uint8 به شکل (n, 4)؛ مقادیر میانی در uint16 جا می‌شوند"""
+    a = src[:, 3:4].astype(np.uint16)
+    value = dst.astype(np.uint16) * (255 - a)
+    value += src.astype(np.uint16) * a + 128
+    value += value >> 8
+    value >>= 8
+    return np.ascontiguousarray(value, dtype=np.uint8)
+
+
+def _atlas_pixels(image):
+    return np.ascontiguousarray(np.asarray(image, dtype=np.uint8)).view(np.uint32).ravel()
+
+
+class GlyphArrays:
+    """
+    ستون‌های NumPy مشخصات گلیف‌ها؛ پیکسل‌های صفحه‌ها در هر رندر از textures فونت گرفته
+    می‌شوند (atlas و atlas_on_background) و اینجا نگه داشته نمی‌شوند.
+    """
+
+    def __init__(self, font):
+        table = font.chars
+        self.x = np.array(table.x, dtype=np.int64)
+        self.y = np.array(table.y, dtype=np.int64)
+        self.width = np.array(table.width, dtype=np.int64)
+        self.height = np.array(table.height, dtype=np.int64)
+        self.xoffset = np.array(table.xoffset, dtype=np.int64)
+        self.yoffset = np.array(table.yoffset, dtype=np.int64)
+        self.xadvance = np.array(table.xadvance, dtype=np.int64)
+        page_ids = sorted(pid for pid, key in font.pages.items() if key is not None)
+        page_slot = {pid: i for i, pid in enumerate(page_ids)}
+        self.page = np.array([page_slot.get(pid, -1) for pid in table.page], dtype=np.int64)
+
+        # جدول ردیف کدپوینت‌های BMP و فهرست مرتب کدپوینت‌های بالاتر، همان جستجوی GlyphTable.row
+        self.bmp_rows = np.array(table.bmp_rows, dtype=np.int64)
+        self.astral_ids = np.array(table.astral_ids, dtype=np.int64)
+        self.astral_rows = np.array(table.astral_rows, dtype=np.int64)
+
+        space_row = table.row(ord(" "))
+        self.space_advance = table.xadvance[space_row] if space_row >= 0 else 0
+
+        # اندازه صفحه‌ها از سرآیند ثبت‌شده خوانده می‌شود و صفحه‌ای رمزگشایی نمی‌شود
+        self.textures = font.textures
+        self.page_keys = [font.pages[pid] for pid in page_ids]
+        sizes = [self.textures.pages[key] for key in self.page_keys]
+        self.page_width = np.array([page.width for page in sizes] or [0], dtype=np.int64)
+        self.page_height = np.array([page.height for page in sizes] or [0], dtype=np.int64)
+
+    def atlas(self, slot):
+        """پیکسل‌های صفحه slot به صورت آرایه تخت uint32"""
+        return self.textures.get_array(self.page_keys[slot], "atlas", _atlas_pixels)
+
+    def atlas_on_background(self, slot, background):
+        """
+        اطلس صفحه slot از پیش ترکیب‌شده روی یک رنگ پس‌زمینه یکنواخت.
+
+        هر پیکسل خروجی که فقط یک گلیف رویش می‌افتد مقدار قبلی‌اش همان پس‌زمینه است،
+        پس نتیجه‌اش فقط به پیکسل اطلس بستگی دارد و با یک برداشت از این جدول به دست می‌آید.
+        """
+        def build(image):
+            atlas = self.atlas(slot).view(np.uint8).reshape(-1, 4)
+            dst = np.broadcast_to(np.array(background, dtype=np.uint8), atlas.shape)
+            return _blend_channels(dst, atlas).view(np.uint32).ravel()
+
+        return self.textures.get_array(self.page_keys[slot], "on_background", build, tag=background)
+
+    def gather(self, table, page, src_index):
+        """
+        برداشت پیکسل‌ها از جدول هر صفحه؛ table(slot) جدول صفحه را می‌دهد و page و src_index
+        صفحه و اندیس پیکسل مبدأ هر خروجی‌اند.
+        """
+        if len(self.page_keys) == 1:
+            return table(0)[src_index]
+        slots = np.unique(page)
+        values = np.empty(src_index.size, dtype=np.uint32)
+        for slot in slots:
+            selected = page == slot
+            values[selected] = table(int(slot))[src_index[selected]]
+        return values
+
+    def rows_for(self, text):
+        """ردیف جدول گلیف برای هر کاراکتر متن (-1 برای کاراکتر ناموجود)"""
+        # surrogatepass: نیم‌جانشین تنها مانند مسیر PIL یک کاراکتر ناموجود است، نه خطا
+        codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.int64)
+        rows = np.full(codes.size, -1, dtype=np.int64)
+        in_bmp = codes < self.bmp_rows.size
+        rows[in_bmp] = self.bmp_rows[codes[in_bmp]]
+        astral = np.flatnonzero(codes >= 0x10000)
+        if astral.size and self.astral_ids.size:
+            pos = np.minimum(np.searchsorted(self.astral_ids, codes[astral]), self.astral_ids.size - 1)
+            found = self.astral_ids[pos] == codes[astral]
+            rows[astral[found]] = self.astral_rows[pos[found]]
+        return rows
+
+
+def get_glyph_arrays(font):
+    arrays = getattr(font, "_glyph_arrays", None)
+    if arrays is None:
+        arrays = GlyphArrays(font)
+        font._glyph_arrays = arrays
+    return arrays
+
+
+def _layout(arrays, text):
+    """محاسبه ابعاد تصویر، اندیس گلیف‌های قابل رندر و مکان‌نمای هر کدام، با همان قواعد render_text"""
+    idx = arrays.rows_for(text)
+    known = idx >= 0
+    rows = np.where(known, idx, 0)
+    advances = np.where(known, arrays.xadvance[rows], arrays.space_advance)
+    width = int(advances.sum())
+    # مکان‌نما با همه کاراکترها جلو می‌رود، از جمله کاراکترهای بدون گلیف یا بدون صفحه
+    cursor = np.cumsum(advances) - advances
+
+    rendered = known & (arrays.page[rows] >= 0)
+    glyphs = idx[rendered]
+    starts = cursor[rendered]
+    if glyphs.size == 0:
+        return width, 0, 0, glyphs, starts
+    max_top = max(0, int((-arrays.yoffset[glyphs]).max()))
+    max_bottom = max(0, int((arrays.height[glyphs] + arrays.yoffset[glyphs]).max()))
+    return width, max_top, max_bottom, glyphs, starts
+
+
+def render_text_numpy(font, text, background_color=(50, 50, 50, 255)):
+    """
+    رندر متن با NumPy: مکان همه گلیف‌ها و پیکسل‌هایشان در یک گذر برداری محاسبه می‌شود
+    و سپس همه در یک بافر از پیش ساخته‌شده ترکیب می‌شوند.
+
+    Args:
+        font (MonoGameFont): فونت
+        text (str): متن
+        background_color (tuple): رنگ پس‌زمینه RGBA
+
+    Returns:
+        Image: تصویر RGBA (یکسان با MonoGameFont.render_text در موتور PIL)
+    """
+    arrays = get_glyph_arrays(font)
+    width, max_top, max_bottom, glyphs, starts = _layout(arrays, text)
+    height = max_top + max_bottom
+    if height == 0 or glyphs.size == 0:
+        return Image.new("RGBA", (100, 20), background_color)
+
+    background = tuple(background_color) + (255,) * (4 - len(background_color))
+    out = np.empty((height, width, 4), dtype=np.uint8)
+    out_pixels = out.view(np.uint32).reshape(-1)
+    out_pixels.fill(np.array(background, dtype=np.uint8).view(np.uint32)[0])
+
+    # مستطیل مقصد هر گلیف
+    dest_x = starts + arrays.xoffset[glyphs]
+    dest_y = max_top + arrays.yoffset[glyphs]
+    glyph_w = arrays.width[glyphs]
+    glyph_h = arrays.height[glyphs]
+    src_x = arrays.x[glyphs]
+    src_y = arrays.y[glyphs]
+    page = arrays.page[glyphs]
+    page_w = arrays.page_width[page]
+
+    areas = glyph_w * glyph_h
+    total = int(areas.sum())
+    if total == 0:
+        return Image.fromarray(out, "RGBA")
+
+    # باز کردن همه گلیف‌ها به فهرست تخت پیکسل‌ها: اندیس مبدأ و مقصد هر پیکسل
+    owner = np.repeat(np.arange(glyphs.size), areas)
+    local = np.arange(total) - np.repeat(np.cumsum(areas) - areas, areas)
+    local_y, local_x = np.divmod(local, glyph_w[owner])
+    src_index = (src_y * page_w + src_x)[owner] + local_y * page_w[owner] + local_x
+    dest = (dest_y * width + dest_x)[owner] + local_y * width + local_x
+    src_page = page[owner]
+
+    # فقط گلیف‌هایی که از تصویر خروجی یا صفحه بیرون می‌زنند برش پیکسلی لازم دارند (مانند crop و paste در PIL)
+    clipped = (dest_x < 0) | (dest_x + glyph_w > width) | (src_x < 0) | (src_y < 0)
+    clipped |= (src_x + glyph_w > page_w) | (src_y + glyph_h > arrays.page_height[page])
+    if clipped.any():
+        gx = local_x + dest_x[owner]
+        sx = local_x + src_x[owner]
+        sy = local_y + src_y[owner]
+        inside = (gx >= 0) & (gx < width) & (sx >= 0) & (sx < page_w[owner])
+        inside &= (sy >= 0) & (sy < arrays.page_height[page][owner])
+        src_index = src_index[inside]
+        src_page = src_page[inside]
+        dest = dest[inside]
+
+    # پیکسل‌هایی که فقط یک گلیف رویشان می‌افتد مستقیم از اطلس ترکیب‌شده با پس‌زمینه برداشته می‌شوند
+    def on_background(slot):
+        return arrays.atlas_on_background(slot, background)
+
+    ends = dest_x + glyph_w
+    overlaps = (dest_x[1:] < np.maximum.accumulate(ends)[:-1]) | (ends[1:] > np.minimum.accumulate(dest_x)[:-1])
+    if not overlaps.any():
+        out_pixels[dest] = arrays.gather(on_background, src_page, src_index)
+        return Image.fromarray(out, "RGBA")
+    shared = np.bincount(dest, minlength=out_pixels.size)[dest] > 1
+    if not shared.any():
+        out_pixels[dest] = arrays.gather(on_background, src_page, src_index)
+        return Image.fromarray(out, "RGBA")
+    single = ~shared
+    out_pixels[dest[single]] = arrays.gather(on_background, src_page[single], src_index[single])
+
+    # پیکسل‌های هم‌پوشان به ترتیب متن ترکیب می‌شوند: لایه n شامل n-امین برخورد هر پیکسل است
+    dest, src_index, src_page = dest[shared], src_index[shared], src_page[shared]
+    sort = np.argsort(dest, kind="stable")
+    sorted_dest = dest[sort]
+    starts = np.r_[0, np.flatnonzero(sorted_dest[1:] != sorted_dest[:-1]) + 1]
+    rank = np.arange(sorted_dest.size) - np.repeat(starts, np.diff(np.r_[starts, sorted_dest.size]))
+    first = sort[rank == 0]
+    out_pixels[dest[first]] = arrays.gather(on_background, src_page[first], src_index[first])
+    for layer in range(1, int(rank.max()) + 1):
+        selected = sort[rank == layer]
+        layer_dest = dest[selected]
+        src = arrays.gather(arrays.atlas, src_page[selected], src_index[selected]).view(np.uint8).reshape(-1, 4)
+        dst = out_pixels[layer_dest].view(np.uint8).reshape(-1, 4)
+        out_pixels[layer_dest] = _blend_channels(dst, src).view(np.uint32).ravel()
+
+    return Image.fromarray(out, "RGBA")
@@ -1,14 +1,170 @@
 import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from PIL import Image
 from monogame_font_parser import parse_monogame_fnt
+import font_cache
+from texture_registry import default_registry
+from xnb_reader import read_xnb_spritefont
+from glyph_table import GlyphTable
+from text_metrics import TextMetrics
+from profiling import stage
+
+# سقف حافظه کش تصویر گلیف‌ها برای هر فونت (بایت)؛ صفر یعنی بدون کش
+GLYPH_CACHE_LIMIT = 32 * 1024 * 1024
+# موتورهای رندر: "pil" (پیش‌فرض و در متن‌های کوتاه سریع‌تر) و "numpy" (ترکیب برداری در compositor)
+RENDER_ENGINES = ("pil", "numpy")
+
+
+def _cached_page_loader(cache_path, pid, fnt_file, page_file):
+    """
+    بازسازی صفحه‌ای از کش دیسکی پس از آزاد شدن: فایل کش دوباره باز و mmap می‌شود تا صفحه
+    آزادشده حافظه‌ای نگه ندارد؛ اگر آن نسخه کش دیگر نباشد تصویر منبع رمزگشایی می‌شود.
+    """
+    def load():
+        image = font_cache.load_cached_page(cache_path, pid)
+        if image is not None:
+            return image
+        if page_file:
+            with Image.open(page_file) as im:
+                return im.convert("RGBA")
+        return read_xnb_spritefont(fnt_file)[1].convert("RGBA")
+    return load
 
 class MonoGameFont:
-    def __init__(self, fnt_file, images_folder):
-        self.chars = {}
+    def __init__(self, fnt_file, images_folder, glyph_cache_limit=GLYPH_CACHE_LIMIT, use_cache=True, render_engine="pil",
+                 textures=None):
+        if render_engine not in RENDER_ENGINES:
+            raise ValueError(f"موتور رندر نامعتبر: {render_engine}")
+        self.render_engine = render_engine
+        self.textures = textures or default_registry
+        self.chars = GlyphTable()
         self.pages = {}
+        self.page_files = {}
+        self.fnt_file = fnt_file
         self.images_folder = images_folder
-        self.parse_fnt(fnt_file)
-        self.load_pages()
+        self.glyph_cache = OrderedDict()
+        self.glyph_cache_bytes = 0
+        self.glyph_cache_limit = glyph_cache_limit
+        self._glyph_arrays = None
+        self._metrics = None
+        # با هر بارگذاری دوباره (reload) یک واحد زیاد می‌شود تا کش‌های بیرونی کهنه نشوند
+        self.revision = 0
+        self.use_cache = use_cache
+        self.source_stamps = {}
+        self.closed = False
+        with stage("font_load", "load"):
+            self._load(use_cache)
+
+    def _load(self, use_cache):
+        fnt_file = self.fnt_file
+        images_folder = self.images_folder
+        # مهر فایل‌ها پیش از خواندن گرفته می‌شود تا نوشتنِ هم‌زمان در بررسی بعدی دیده شود
+        stamps = self._stamp_sources(self.page_files)
+        with stage("cache_load", "load"):
+            cached = font_cache.load_cached_font(fnt_file, images_folder) if use_cache else None
+        if cached:
+            self.chars, pages, self.page_files, cache_path = cached
+            for pid, img in pages.items():
+                # تصویر کش روی فایل mmap شده است؛ بازسازی آن پس از آزاد شدن ارزان است
+                loader = _cached_page_loader(cache_path, pid, fnt_file, self.page_files.get(pid))
+                self.pages[pid] = None if img is None else self.textures.register_image(
+                    img, self.page_source(pid), loader, self.page_stamp(pid))
+            self.source_stamps = self._stamp_sources(self.page_files)
+            return
+        with stage("parse", "load"):
+            self.parse_fnt(fnt_file)
+        with stage("load_pages", "load"):
+            stamps.update(self.load_pages())
+        self._set_stamps(stamps)
+        if use_cache:
+            self._store_cache()
+
+    def _store_cache(self):
+        with stage("cache_store", "load"):
+            pages = {pid: self.get_page(pid) for pid in self.pages}
+            # مهرهای پیش از خواندن ذخیره می‌شوند تا تغییر هم‌زمان فایل‌ها کش را باطل کند
+            font_cache.store_cached_font(self.fnt_file, self.images_folder, self.chars, pages, self.page_files,
+                                         self.source_stamps)
+
+    def _stamp_sources(self, page_files):
+        return {path: font_cache.file_stamp(path)
+                for path in font_cache.source_dependencies(self.fnt_file, page_files)}
+
+    def _set_stamps(self, stamps):
+        """مهرهای گرفته‌شده پیش از خواندن؛ صفحه‌هایی که تازه از توصیف‌گر معلوم شده‌اند مهر فعلی را می‌گیرند"""
+        self.source_stamps = {path: stamps.get(path, stamp)
+                              for path, stamp in self._stamp_sources(self.page_files).items()}
+
+    def source_files(self):
+        """فایل‌هایی که فونت از آن‌ها ساخته شده است (توصیف‌گر، PNG هم‌نام .xnb و صفحه‌ها)"""
+        return list(self.source_stamps)
+
+    def changed_sources(self):
+        """فایل‌هایی از source_files که از آخرین بارگذاری تغییر کرده، ساخته یا حذف شده‌اند"""
+        return [path for path, stamp in self.source_stamps.items() if font_cache.file_stamp(path) != stamp]
+
+    def reload(self, changed=None):
+        """
+        بارگذاری دوباره فقط بخش‌های تغییرکرده؛ خود شیء فونت (و جای آن در برنامه) عوض نمی‌شود.
+
+        اگر فقط تصویر صفحه‌ها تغییر کرده باشد همان صفحه‌ها دوباره ثبت می‌شوند؛ در غیر این صورت
+        توصیف‌گر دوباره پردازش می‌شود. اگر فایل نیمه‌نوشته باشد خطا برگردانده می‌شود و فونت
+        بدون تغییر می‌ماند.
+
+        Args:
+            changed (list): مسیرهای تغییرکرده (پیش‌فرض: changed_sources())
+
+        Returns:
+            bool: آیا چیزی بارگذاری شد
+        """
+        if self.closed:
+            return False
+        changed = {os.path.abspath(path) for path in (self.changed_sources() if changed is None else changed)}
+        if not changed:
+            return False
+        with stage("font_reload", "load"):
+            stamps = self._stamp_sources(self.page_files)
+            page_paths = {pid: os.path.abspath(path) for pid, path in self.page_files.items() if path}
+            if changed <= set(page_paths.values()):
+                for pid, path in page_paths.items():
+                    if path not in changed:
+                        continue
+                    # ثبت دوباره مهر فایل را می‌بیند و محتوای تازه را می‌خواند؛ صفحه قبلی پس از آن رها می‌شود
+                    old_key = self.pages[pid]
+                    self.pages[pid] = self.textures.register_file(path) if os.path.isfile(path) else None
+                    if old_key is not None:
+                        self.textures.release(old_key)
+                    print(f"بارگذاری دوباره تصویر: {path}")
+            else:
+                chars = GlyphTable()
+                pages = {}
+                with stage("parse", "load"):
+                    parse_monogame_fnt(self.fnt_file, chars, pages)
+                old_keys = [key for key in self.pages.values() if key is not None]
+                self.chars, self.pages, self.page_files = chars, pages, {}
+                with stage("load_pages", "load"):
+                    stamps.update(self.load_pages())
+                for key in old_keys:
+                    self.textures.release(key)
+                print(f"بارگذاری دوباره فونت: {self.fnt_file}")
+            self.clear_glyph_cache()
+            self._set_stamps(stamps)
+            self.revision += 1
+            if self.use_cache:
+                self._store_cache()
+        return True
+
+    def close(self):
+        """رها کردن صفحه‌های فونت در textures؛ فونت بسته دیگر رندر یا بارگذاری دوباره نمی‌شود"""
+        if self.closed:
+            return
+        self.closed = True
+        for pid, key in self.pages.items():
+            if key is not None:
+                self.textures.release(key)
+            self.pages[pid] = None
+        self.clear_glyph_cache()
 
     def parse_fnt(self, filename):
         if not (filename.endswith('.json') or filename.endswith('.xnb')):
@@ -16,60 +172,224 @@ class MonoGameFont:
         parse_monogame_fnt(filename, self.chars, self.pages)
 
     def load_pages(self):
+        """
+        ثبت صفحه‌ها در textures؛ رمزگشایی تصویرها تا اولین استفاده از get_page عقب می‌افتد.
+
+        Returns:
+            dict: مهر فایل PNG صفحه‌ها که پیش از خواندن آن‌ها گرفته شده است
+        """
+        stamps = {}
         if not self.pages:
             raise ValueError("هیچ فایل تصویری برای فونت پیدا نشد. لطفاً مطمئن شوید فایل PNG کنار فایل .xnb یا .json وجود دارد.")
         for pid, fname in list(self.pages.items()):
+            if isinstance(fname, Image.Image):
+                # تصویر از قبل توسط خواننده داخلی .xnb رمزگشایی شده است
+                self.page_files[pid] = None
+                fnt_file = self.fnt_file
+                self.pages[pid] = self.textures.register_image(
+                    fname, self.page_source(pid), lambda: read_xnb_spritefont(fnt_file)[1], self.page_stamp(pid))
+                continue
             path = os.path.join(self.images_folder, fname)
+            self.page_files[pid] = path
+            stamps[os.path.abspath(path)] = font_cache.file_stamp(path)
             if os.path.isfile(path):
                 try:
-                    im = Image.open(path).convert("RGBA")
-                    self.pages[pid] = im
-                    print(f"بارگذاری فایل PNG: {path}")
+                    self.pages[pid] = self.textures.register_file(path)
+                    print(f"ثبت فایل PNG: {path}")
                 except Exception as e:
                     print(f"خطا در بارگذاری {path}: {e}")
                     self.pages[pid] = None
             else:
                 print(f"فایل تصویر وجود ندارد: {path}")
                 self.pages[pid] = None
+        self.clear_glyph_cache()
+        return stamps
+
+    def page_source(self, pid):
+        """شناسه منبع یک صفحه برای textures: مسیر PNG یا خود فایل .xnb برای تصویر داخلی آن"""
+        return self.page_files.get(pid) or f"{self.fnt_file}#{pid}"
+
+    def page_stamp(self, pid):
+        """مهر فایلی که تصویر صفحه از آن آمده است (PNG صفحه یا خود فایل .xnb)"""
+        return font_cache.file_stamp(self.page_files.get(pid) or self.fnt_file)
+
+    def get_page(self, pid):
+        """تصویر RGBA یک صفحه (رمزگشایی در اولین دسترسی) یا None اگر صفحه موجود نیست"""
+        key = self.pages.get(pid)
+        if key is None:
+            return None
+        return self.textures.get(key)
+
+    def clear_glyph_cache(self):
+        self.glyph_cache.clear()
+        self.glyph_cache_bytes = 0
+        self._glyph_arrays = None
+        self._metrics = None
+
+    def get_glyph_image(self, c):
+        """
+        تصویر برش‌خورده یک گلیف از اطلس، با کش LRU محدود به glyph_cache_limit.
+
+        تصویر RGBA برگشتی مستقیماً به عنوان ماسک آلفا در paste استفاده می‌شود.
+        """
+        return self._glyph_image(c.id, c.x, c.y, c.width, c.height, c.page)
+
+    def _glyph_image(self, cid, x, y, width, height, page):
+        char_img = self.glyph_cache.get(cid)
+        if char_img is not None:
+            self.glyph_cache.move_to_end(cid)
+            return char_img
+
+        img_page = self.get_page(page)
+        char_img = img_page.crop((x, y, x + width, y + height))
+        size = width * height * 4
+        if self.glyph_cache_limit <= 0 or size > self.glyph_cache_limit:
+            return char_img
+
+        self.glyph_cache[cid] = char_img
+        self.glyph_cache_bytes += size
+        while self.glyph_cache_bytes > self.glyph_cache_limit:
+            _, old_img = self.glyph_cache.popitem(last=False)
+            self.glyph_cache_bytes -= old_img.width * old_img.height * 4
+        return char_img
+
+    def get_metrics(self):
+        """جدول‌های اندازه‌گیری متن (ساخته شده در اولین استفاده)"""
+        if self._metrics is None:
+            self._metrics = TextMetrics(self)
+        return self._metrics
+
+    def measure_text(self, text):
+        """ابعاد (عرض, ارتفاع) خروجی render_text بدون رندر کردن متن"""
+        return self.get_metrics().measure_text(text)
+
+    def measure_many(self, texts):
+        """اندازه‌گیری یک دسته متن با NumPy؛ (آرایه عرض‌ها, آرایه ارتفاع‌ها)"""
+        return self.get_metrics().measure_many(texts)
+
+    def missing_spans(self, text):
+        """فهرست (x, عرض) جای کاراکترهای بدون گلیف در خروجی render_text"""
+        return self.get_metrics().missing_spans(text)
+
+    def highlight_missing(self, img, text, color):
+        """پوشاندن جای کاراکترهای بدون گلیف با رنگ نیمه‌شفاف color (درجا)"""
+        for x, width in self.missing_spans(text):
+            if x >= img.width:
+                break
+            # کاراکتر بدون عرض (فونت بدون فاصله) هم با یک خط باریک نشان داده می‌شود
+            width = max(1, min(width, img.width - x))
+            img.alpha_composite(Image.new("RGBA", (width, img.height), color), (x, 0))
+        return img
+
+    def render_text(self, text, background_color=(50, 50, 50, 255), highlight_color=None):
+        """
+        رندر متن؛ کاراکترهای بدون گلیف به اندازه فاصله جا می‌گیرند و اگر highlight_color
+        داده شود با آن رنگ مشخص می‌شوند.
+        """
+        with stage("render_text"):
+            img = self._render_text(text, background_color)
+        if highlight_color:
+            self.highlight_missing(img, text, highlight_color)
+        return img
+
+    def render_region(self, text, cursors, x0, size, max_top, background_color=(50, 50, 50, 255),
+                      highlight_color=None, out=None):
+        """
+        رندر ستون‌های x0 تا x0 + عرض از خروجی render_text، بدون رندر بقیه متن.
+
+        چیدمان همان کل ردیف است؛ فقط کاراکترهایی که تصویرشان با این بازه هم‌پوشانی
+        دارد (با جستجوی دودویی در cursors) رسم می‌شوند.
+
+        Args:
+            cursors (array): خروجی TextMetrics.cursor_positions(text)
+            x0 (int): ستون شروع در تصویر کامل ردیف
+            size (tuple): (عرض, ارتفاع) تصویر خروجی؛ ارتفاع همان ارتفاع کل ردیف است
+            max_top (int): فاصله خط پایه از بالای ردیف (TextMetrics.layout)
+            out (Image): تصویر RGBA هم‌اندازه size برای استفاده دوباره؛ با رنگ پس‌زمینه پاک
+                و به جای تصویر تازه برگردانده می‌شود
+        """
+        width, height = size
+        if out is None:
+            out_img = Image.new("RGBA", (width, height), background_color)
+        else:
+            out_img = out
+            out_img.paste(background_color, (0, 0, width, height))
+        metrics = self.get_metrics()
+        margin = metrics.overhang
+        start = max(0, bisect_right(cursors, x0 - margin) - 1)
+        stop = min(len(text), bisect_left(cursors, x0 + width + margin))
+
+        chars = self.chars
+        ids, xs, ys, widths, heights = chars.id, chars.x, chars.y, chars.width, chars.height
+        xoffset, yoffset, glyph_pages = chars.xoffset, chars.yoffset, chars.page
+        with stage("render_region"):
+            for i in range(start, stop):
+                row = chars.row(ord(text[i]))
+                if row < 0 or self.pages.get(glyph_pages[row]) is None:
+                    continue
+                char_img = self._glyph_image(ids[row], xs[row], ys[row], widths[row], heights[row], glyph_pages[row])
+                out_img.paste(char_img, (cursors[i] - x0 + xoffset[row], max_top + yoffset[row]), char_img)
+
+        if highlight_color:
+            defined = metrics.defined
+            for i in range(start, stop):
+                if defined[metrics.slot(ord(text[i]))]:
+                    continue
+                x = cursors[i] - x0
+                box_width = max(1, cursors[i + 1] - cursors[i])
+                left, right = max(0, x), min(width, x + box_width)
+                if left < right:
+                    out_img.alpha_composite(Image.new("RGBA", (right - left, height), highlight_color), (left, 0))
+        return out_img
+
+    def _render_text(self, text, background_color):
+        if self.render_engine == "numpy":
+            from compositor import render_text_numpy
+            return render_text_numpy(self, text, background_color)
+
+        chars = self.chars
+        xadvance = chars.xadvance
+        yoffset = chars.yoffset
+        heights = chars.height
+        glyph_pages = chars.page
+        space_row = chars.row(ord(" "))
+        space_advance = xadvance[space_row] if space_row >= 0 else 0
 
-    def render_text(self, text, background_color=(50, 50, 50, 255)):
         width = 0
         max_top = 0
         max_bottom = 0
-        chars_for_render = []
+        rows_for_render = []
 
+        bmp_rows = chars.bmp_rows
+        bmp_size = len(bmp_rows)
         for ch in text:
             cid = ord(ch)
-            c = self.chars.get(cid)
-            if not c:
-                space = self.chars.get(ord(" "))
-                if space:
-                    width += space.xadvance
+            row = bmp_rows[cid] if cid < bmp_size else chars.row(cid)
+            if row < 0:
+                width += space_advance
                 continue
-            if self.pages.get(c.page) is None:
-                width += c.xadvance
+            if self.pages.get(glyph_pages[row]) is None:
+                width += xadvance[row]
                 continue
-            chars_for_render.append(c)
-            width += c.xadvance
-            top = -c.yoffset
-            bottom = c.height + c.yoffset
+            rows_for_render.append((row, width))
+            width += xadvance[row]
+            top = -yoffset[row]
+            bottom = heights[row] + yoffset[row]
             if top > max_top:
                 max_top = top
             if bottom > max_bottom:
                 max_bottom = bottom
 
         height = max_top + max_bottom
-        if height == 0 or not chars_for_render:
+        if height == 0 or not rows_for_render:
             return Image.new("RGBA", (100, 20), background_color)
 
         out_img = Image.new("RGBA", (width, height), background_color)
 
-        x_cursor = 0
-        for c in chars_for_render:
-            img_page = self.pages.get(c.page)
-            char_img = img_page.crop((c.x, c.y, c.x + c.width, c.y + c.height))
-            y_pos = max_top + c.yoffset
-            out_img.paste(char_img, (x_cursor + c.xoffset, y_pos), char_img)
-            x_cursor += c.xadvance
+        ids, xs, ys, widths, xoffset = chars.id, chars.x, chars.y, chars.width, chars.xoffset
+        for row, x_cursor in rows_for_render:
+            char_img = self._glyph_image(ids[row], xs[row], ys[row], widths[row], heights[row], glyph_pages[row])
+            y_pos = max_top + yoffset[row]
+            out_img.paste(char_img, (x_cursor + xoffset[row], y_pos), char_img)
 
-        return out_img
\ No newline at end of file
+        return out_img
\ No newline at end of file
@@ -0,0 +1,382 @@
+"""
+کش دیسکی فونت‌های پردازش‌شده: جدول گلیف‌ها و تصویر RGBA خام صفحه‌ها در یک فایل.
+
+هر فونت پوشه‌ای به نام کلیدش دارد و هر بار ذخیره یک فایل تازه با شماره نسخه بزرگ‌تر
+در آن می‌نویسد و نسخه‌های قبلی را پاک می‌کند. فایل کش باز هیچ‌وقت جایگزین نمی‌شود:
+صفحه‌های فونت‌های باز روی فایل mmap شده‌اند و روی ویندوز نه os.replace روی آن ممکن
+است و نه حذفش؛ نسخه‌ای که حذفش شکست بخورد در ذخیره بعدی دوباره امتحان می‌شود و تا
+آن زمان نسخه جدیدتر خوانده می‌شود.
+
+پس از هر ذخیره prune_cache کش فونت‌هایی را که دیگر وجود ندارند پاک می‌کند و اگر حجم
+کل از MAX_CACHE_BYTES بیشتر باشد، کم‌استفاده‌ترین فونت‌ها را (بر اساس زمان آخرین
+بارگذاری یا ذخیره) تا رسیدن به سقف حذف می‌کند.
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import time
+from array import array
+from PIL import Image
+from glyph_table import GlyphTable, COLUMNS
+
+CACHE_MAGIC = b"MGFC"
+CACHE_VERSION = 2
+PREFIX_STRUCT = struct.Struct("<4sII")
+PAGE_ALIGNMENT = 16
+CACHE_SUFFIX = ".fontcache"
+# فایل موقت نوشتن کش که از این قدیمی‌تر باشد (پردازه‌اش مرده است) در prune_cache پاک می‌شود
+STALE_TEMP_SECONDS = 3600
+
+# با MGFONT_NO_CACHE=1 کش دیسکی کاملاً غیرفعال می‌شود
+CACHE_ENABLED = os.environ.get("MGFONT_NO_CACHE", "") not in ("1", "true", "yes")
+# سقف حجم کل کش دیسکی (قابل تغییر با MGFONT_CACHE_MAX_MB)
+MAX_CACHE_BYTES = int(os.environ.get("MGFONT_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+
+def get_cache_dir():
+    """پوشه کش فونت‌های پردازش‌شده (قابل تغییر با MGFONT_CACHE_DIR)"""
+    override = os.environ.get("MGFONT_CACHE_DIR")
+    if override:
+        return override
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "View-MonoGame-font")
+
+
+def _cache_key(fnt_file, images_folder):
+    key = f"{os.path.abspath(fnt_file)}|{os.path.abspath(images_folder)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _is_key(name):
+    return len(name) == 40 and all(c in "0123456789abcdef" for c in name)
+
+
+def _key_dir(key):
+    return os.path.join(get_cache_dir(), key)
+
+
+def _cache_versions(key):
+    """[(نسخه، مسیر)] فایل‌های کش یک فونت در پوشه کلیدش، قدیمی‌ترین اول"""
+    folder = _key_dir(key)
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    versions = []
+    for name in names:
+        version = name[:-len(CACHE_SUFFIX)]
+        if name.endswith(CACHE_SUFFIX) and version.isdigit():
+            versions.append((int(version), os.path.join(folder, name)))
+    return sorted(versions)
+
+
+def _cache_path(fnt_file, images_folder):
+    """مسیر آخرین نسخه کش فونت یا None"""
+    versions = _cache_versions(_cache_key(fnt_file, images_folder))
+    return versions[-1][1] if versions else None
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _remove_stale(key, keep):
+    """حذف نسخه‌های قبلی؛ فایل باز روی ویندوز در ذخیره بعدی حذف می‌شود"""
+    for _, path in _cache_versions(key):
+        if path != keep:
+            _remove_file(path)
+
+
+def _cache_source(path):
+    """مسیر فایل فونتی که کش برایش ساخته شده است (از هدر) یا None"""
+    try:
+        with open(path, 'rb') as f:
+            magic, version, header_size = PREFIX_STRUCT.unpack(f.read(PREFIX_STRUCT.size))
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                return None
+            return json.loads(f.read(header_size).decode("utf-8")).get("source")
+    except Exception:
+        return None
+
+
+def _remove_key(folder):
+    """حذف پوشه کش یک فونت؛ فایل mmap شده روی ویندوز می‌ماند و در prune بعدی دوباره امتحان می‌شود"""
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+def prune_cache(keep_key=None, max_bytes=None):
+    """
+    پاک کردن کش فونت‌های حذف‌شده یا جابه‌جاشده، فایل‌های قالب قدیمی و فایل‌های موقت رهاشده،
+    سپس حذف کم‌استفاده‌ترین فونت‌ها تا حجم کل کش از max_bytes بیشتر نباشد.
+
+    Args:
+        keep_key (str): کلید فونتی که همین حالا ذخیره شده و حذف نمی‌شود
+        max_bytes (int): سقف حجم (پیش‌فرض MAX_CACHE_BYTES)
+    """
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    try:
+        entries = list(os.scandir(get_cache_dir()))
+    except OSError:
+        return
+    now = time.time()
+    keys = []
+    for entry in entries:
+        if entry.is_file():
+            # قالب قدیمی (<key>.fontcache در ریشه) دیگر خوانده نمی‌شود
+            if entry.name.endswith(CACHE_SUFFIX):
+                _remove_file(entry.path)
+            continue
+        if not _is_key(entry.name):
+            continue
+        size = 0
+        last_used = 0
+        newest = None
+        try:
+            last_used = entry.stat().st_mtime
+            for item in os.scandir(entry.path):
+                stat = item.stat()
+                if item.name.endswith(".tmp") and now - stat.st_mtime > STALE_TEMP_SECONDS:
+                    _remove_file(item.path)
+                    continue
+                size += stat.st_size
+                last_used = max(last_used, stat.st_mtime)
+                if item.name.endswith(CACHE_SUFFIX) and (newest is None or item.name > os.path.basename(newest)):
+                    newest = item.path
+        except OSError:
+            continue
+        if entry.name != keep_key and newest is not None:
+            source = _cache_source(newest)
+            if source and not os.path.exists(source):
+                _remove_key(entry.path)
+                continue
+        keys.append((last_used, entry.name, entry.path, size))
+
+    total = sum(size for *_, size in keys)
+    for _, name, path, size in sorted(keys):
+        if total <= max_bytes:
+            break
+        if name != keep_key:
+            _remove_key(path)
+            total -= size
+
+
+
+def file_stamp(path):
+    """اندازه و زمان تغییر فایل؛ برای فایل ناموجود (-1, -1) تا ظاهر شدنش هم کش را باطل کند"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [-1, -1]
+    return [st.st_size, st.st_mtime_ns]
+
+
+def source_dependencies(fnt_file, page_files):
+    """فهرست فایل‌هایی که تغییرشان کش یک فونت را باطل می‌کند"""
+    paths = [fnt_file]
+    if fnt_file.endswith('.xnb'):
+        # PNG هم‌نام کنار .xnb بر تصویر داخلی فایل اولویت دارد
+        paths.append(os.path.splitext(fnt_file)[0] + ".png")
+    paths += [path for path in page_files.values() if path]
+    unique = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+
+def _dependencies_valid(header):
+    return all(file_stamp(dep_path) == [size, mtime] for dep_path, size, mtime in header["dependencies"])
+
+
+def is_cached(fnt_file, images_folder):
+    """
+    آیا کش معتبری برای این فونت وجود دارد؛ فقط هدر خوانده می‌شود و صفحه‌ها نه.
+
+    برای تصمیم‌گیری پیش از بارگذاری (مثلاً بارگذاری مستقیم به جای پردازه کارگر).
+    """
+    path = _cache_path(fnt_file, images_folder) if CACHE_ENABLED else None
+    if path is None:
+        return False
+    try:
+        with open(path, 'rb') as f:
+            magic, version, header_size = PREFIX_STRUCT.unpack(f.read(PREFIX_STRUCT.size))
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                return False
+            return _dependencies_valid(json.loads(f.read(header_size).decode("utf-8")))
+    except Exception:
+        return False
+
+
+def _open_cache(path):
+    """(فایل mmap شده، هدر، آفست پس از هدر) یا None اگر فایل نیست یا نسخه دیگری دارد"""
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    magic, version, header_size = PREFIX_STRUCT.unpack_from(mapped, 0)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        return None
+    offset = PREFIX_STRUCT.size
+    header = json.loads(bytes(mapped[offset:offset + header_size]).decode("utf-8"))
+    return mapped, header, offset + header_size
+
+
+def _page_image(view, page):
+    start = page["offset"]
+    end = start + page["width"] * page["height"] * 4
+    return Image.frombuffer("RGBA", (page["width"], page["height"]), view[start:end], "raw", "RGBA", 0, 1)
+
+
+def load_cached_font(fnt_file, images_folder):
+    """
+    بارگذاری فونت از کش دیسکی در صورت معتبر بودن.
+
+    تصویر صفحه‌ها مستقیماً روی فایل کش mmap می‌شوند و رمزگشایی PNG لازم نیست؛ این فایل
+    تا آزاد شدن صفحه‌ها باز می‌ماند و ذخیره بعدی در فایل دیگری نوشته می‌شود.
+
+    Returns:
+        tuple | None: (chars, pages, page_files, cache_path) یا None اگر کش وجود ندارد یا
+            کهنه است؛ cache_path برای بازخوانی صفحه‌ها با load_cached_page است
+    """
+    path = _cache_path(fnt_file, images_folder) if CACHE_ENABLED else None
+    if path is None:
+        return None
+    try:
+        opened = _open_cache(path)
+        if opened is None:
+            return None
+        mapped, header, offset = opened
+
+        if not _dependencies_valid(header):
+            return None
+
+        # جدول گلیف‌ها ستون به ستون ذخیره شده است و هر ستون با یک frombytes خوانده می‌شود
+        column_size = header["glyph_count"] * 4
+        columns = {}
+        for name in COLUMNS:
+            column = array('i')
+            column.frombytes(mapped[offset:offset + column_size])
+            columns[name] = column
+            offset += column_size
+        chars = GlyphTable.from_columns(columns)
+
+        view = memoryview(mapped)
+        pages = {}
+        page_files = {}
+        for page in header["pages"]:
+            pid = page["id"]
+            page_files[pid] = page["file"]
+            if page["width"] <= 0:
+                pages[pid] = None
+                continue
+            pages[pid] = _page_image(view, page)
+        try:
+            # زمان تغییر پوشه کلید زمان آخرین استفاده برای prune_cache است
+            os.utime(os.path.dirname(path))
+        except OSError:
+            pass
+        print(f"بارگذاری فونت از کش: {fnt_file}")
+        return chars, pages, page_files, path
+    except Exception as e:
+        print(f"کش فونت {fnt_file} خراب است و نادیده گرفته شد: {e}")
+        return None
+
+
+def load_cached_page(path, pid):
+    """
+    بازخوانی تصویر یک صفحه از همان نسخه کش که فونت از آن بارگذاری شده است.
+
+    Returns:
+        Image | None: تصویر mmap شده یا None اگر این نسخه کش دیگر وجود ندارد یا خراب است
+    """
+    try:
+        opened = _open_cache(path)
+        if opened is None:
+            return None
+        mapped, header, _ = opened
+        for page in header["pages"]:
+            if page["id"] == pid and page["width"] > 0:
+                return _page_image(memoryview(mapped), page)
+    except Exception as e:
+        print(f"خواندن صفحه {pid} از کش {path} ممکن نشد: {e}")
+    return None
+
+
+def store_cached_font(fnt_file, images_folder, chars, pages, page_files, stamps=None):
+    """
+    ذخیره جدول گلیف و تصویر RGBA خام صفحه‌ها در کش دیسکی.
+
+    Args:
+        stamps (dict): مهر فایل‌ها هنگام خواندن آن‌ها (پیش‌فرض: مهر فعلی)؛ اگر فایلی پس از
+            خواندن تغییر کرده باشد کش ذخیره‌شده در بارگذاری بعدی کهنه شمرده می‌شود
+    """
+    stamps = stamps or {}
+    if not CACHE_ENABLED:
+        return
+    key = _cache_key(fnt_file, images_folder)
+    temp_path = None
+    try:
+        os.makedirs(_key_dir(key), exist_ok=True)
+        # نسخه تازه همیشه بزرگ‌تر از نسخه‌های موجود است تا بارگذاری بعدی همین را بخواند
+        versions = _cache_versions(key)
+        version = max(time.time_ns(), versions[-1][0] + 1 if versions else 0)
+        path = os.path.join(_key_dir(key), f"{version:020d}{CACHE_SUFFIX}")
+        glyph_table = b"".join(getattr(chars, name).tobytes() for name in COLUMNS)
+
+        page_entries = []
+        page_data = []
+        for pid, img in pages.items():
+            entry = {"id": pid, "file": page_files.get(pid), "width": 0, "height": 0, "offset": 0}
+            if img is not None:
+                entry["width"], entry["height"] = img.size
+                page_data.append(img.tobytes("raw", "RGBA"))
+            else:
+                page_data.append(b"")
+            page_entries.append(entry)
+
+        header = {
+            "source": os.path.abspath(fnt_file),
+            "dependencies": [[dep] + list(stamps.get(dep) or file_stamp(dep))
+                             for dep in source_dependencies(fnt_file, page_files)],
+            "glyph_count": len(chars),
+            "pages": page_entries,
+        }
+        # آفست صفحه‌ها به طول هدر بستگی دارد؛ با عرض ثابت نوشته می‌شوند تا طول هدر تغییر نکند
+        for entry in page_entries:
+            entry["offset"] = 10 ** 15
+        header_size = len(json.dumps(header).encode("utf-8"))
+        offset = PREFIX_STRUCT.size + header_size + len(glyph_table)
+        chunks = []
+        for entry, data in zip(page_entries, page_data):
+            padding = -offset % PAGE_ALIGNMENT
+            chunks.append(b"\0" * padding)
+            offset += padding
+            entry["offset"] = offset
+            chunks.append(data)
+            offset += len(data)
+        header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(PREFIX_STRUCT.pack(CACHE_MAGIC, CACHE_VERSION, header_size))
+            f.write(header_bytes)
+            f.write(glyph_table)
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+        temp_path = None
+        _remove_stale(key, path)
+        prune_cache(keep_key=key)
+    except Exception as e:
+        print(f"خطا در ذخیره کش فونت {fnt_file}: {e}")
+    finally:
+        if temp_path:
+            _remove_file(temp_path)
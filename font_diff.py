@@ -0,0 +1,275 @@
+"""
+مقایسه دیداری دو نسخه یک فونت روی پیکره ترجمه‌ها (بدون PyQt).
+
+ابتدا جدول گلیف‌های دو فونت مقایسه می‌شود (اندازه‌ها، آفست‌ها، advance و پیکسل‌های
+هر گلیف). رشته‌هایی که هیچ کاراکتر تغییرکرده‌ای ندارند با یک گذر NumPy کنار گذاشته
+می‌شوند و بقیه در پردازه‌های کارگر با هر دو فونت رندر و پیکسل به پیکسل مقایسه
+می‌شوند. گزارش JSON رشته‌های متفاوت را به ترتیب تعداد پیکسل‌های تغییرکرده دارد و
+برای بدترین‌ها تصویر heatmap (قدیم، جدید، تفاوت) نوشته می‌شود.
+
+    python font_diff.py old/Main.xnb new/Main.xnb strings/ -o diff/ --top 50
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import numpy as np
+from PIL import Image
+from batch_render import parse_color, positive_int, safe_name
+from font import MonoGameFont, RENDER_ENGINES
+from glyph_coverage import iter_corpus
+from text_metrics import codepoint_index, dense_size
+
+DEFAULT_BACKGROUND = (50, 50, 50, 255)
+# تعداد رشته‌های متفاوتی که برایشان heatmap نوشته می‌شود
+TOP_HEATMAPS = 50
+# تعداد رشته‌هایی که هر بار به یک کارگر داده می‌شود
+CHUNKSIZE = 256
+
+_worker_fonts = None
+_worker_background = None
+
+
+def glyph_signatures(font):
+    """
+    امضای هر گلیف: (xoffset، yoffset، عرض، ارتفاع، xadvance، بایت‌های پیکسل یا None).
+
+    مختصات گلیف در اطلس در امضا نیست تا چیدن دوباره اطلس تغییر حساب نشود.
+    """
+    chars = font.chars
+    page_arrays = {}
+    signatures = {}
+    for row, cid in enumerate(chars.id):
+        width, height, pid = chars.width[row], chars.height[row], chars.page[row]
+        pixels = None
+        if font.pages.get(pid) is not None:
+            if pid not in page_arrays:
+                page_arrays[pid] = np.asarray(font.get_page(pid))
+            x, y = chars.x[row], chars.y[row]
+            pixels = page_arrays[pid][y:y + height, x:x + width].tobytes()
+        signatures[cid] = (chars.xoffset[row], chars.yoffset[row], width, height, chars.xadvance[row], pixels)
+    return signatures
+
+
+def changed_codepoints(old_font, new_font):
+    """
+    (کدپوینت‌های تغییرکرده، افزوده یا حذف‌شده، آیا advance کاراکترهای ناموجود ثابت مانده است)
+    """
+    old_signatures = glyph_signatures(old_font)
+    new_signatures = glyph_signatures(new_font)
+    changed = {cid for cid in old_signatures.keys() | new_signatures.keys()
+               if old_signatures.get(cid) != new_signatures.get(cid)}
+    # کاراکتری که در هیچ‌کدام نیست به اندازه فاصله جلو می‌رود
+    missing_stable = old_font.get_metrics().missing_advance == new_font.get_metrics().missing_advance
+    return changed, missing_stable
+
+
+def affected_mask(texts, old_font, new_font, changed, missing_stable):
+    """
+    آرایه بولی رشته‌هایی که ممکن است متفاوت رندر شوند (با یک گذر برداری روی همه متن‌ها).
+
+    رشته‌ای که همه کاراکترهایش گلیف یکسان دارند (یا در هر دو فونت ناموجودند و advance
+    فاصله تغییر نکرده) در هر دو فونت دقیقاً یکسان رندر می‌شود.
+    """
+    defined = sorted(set(old_font.chars.id) | set(new_font.chars.id))
+    # همان چینش جدول‌های TextMetrics: بخش متراکم، خانه size برای کدپوینت‌های ناموجود و خانه کدپوینت‌های بزرگ‌تر
+    size = dense_size(defined)
+    sparse_ids = np.array([cid for cid in defined if cid >= size], dtype=np.uint32)
+    unstable = np.full(size + 1 + sparse_ids.size, not missing_stable, dtype=bool)
+    unstable[codepoint_index(np.array(defined, dtype=np.uint32), size, sparse_ids)] = False
+    unstable[codepoint_index(np.array(sorted(changed), dtype=np.uint32), size, sparse_ids)] = True
+
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    mask = np.zeros(len(texts), dtype=bool)
+    codes = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    if codes.size:
+        nonempty = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+        flags = unstable[codepoint_index(codes, size, sparse_ids)]
+        mask[nonempty] = np.maximum.reduceat(flags, starts)
+    return mask
+
+
+def pad_to(img, size, background):
+    """آرایه RGBA تصویر در قاب size؛ بیرون تصویر رنگ پس‌زمینه است"""
+    if img.size == size:
+        return np.asarray(img)
+    width, height = size
+    canvas = np.empty((height, width, 4), dtype=np.uint8)
+    canvas[:] = background
+    canvas[:img.height, :img.width] = np.asarray(img)
+    return canvas
+
+
+def diff_images(old_img, new_img, background):
+    """
+    مقایسه دو تصویر هم‌تراز از گوشه بالا چپ.
+
+    Returns:
+        tuple: (تعداد پیکسل‌های متفاوت، کادر (چپ، بالا، راست، پایین) یا None، آرایه قدیم، آرایه جدید)
+    """
+    size = (max(old_img.width, new_img.width), max(old_img.height, new_img.height))
+    old = pad_to(old_img, size, background)
+    new = pad_to(new_img, size, background)
+    changed = np.any(old != new, axis=2)
+    count = int(np.count_nonzero(changed))
+    if not count:
+        return 0, None, old, new
+    rows = np.flatnonzero(changed.any(axis=1))
+    columns = np.flatnonzero(changed.any(axis=0))
+    return count, (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1), old, new
+
+
+def heatmap(old, new):
+    """تصویر سه‌ردیفه قدیم، جدید و تفاوت (قرمز به اندازه بیشترین اختلاف کانال‌ها روی جدید کم‌رنگ)"""
+    height, width = old.shape[:2]
+    magnitude = np.abs(old.astype(np.int16) - new.astype(np.int16)).max(axis=2).astype(np.uint8)
+    heat = np.empty_like(new)
+    heat[..., :3] = (new[..., :3].mean(axis=2, keepdims=True) * 0.3).astype(np.uint8)
+    heat[..., 0] = np.maximum(heat[..., 0], magnitude)
+    heat[..., 3] = 255
+    # خط مشکی یک‌پیکسلی بین ردیف‌ها
+    out = np.zeros((height * 3 + 2, width, 4), dtype=np.uint8)
+    out[..., 3] = 255
+    out[:height] = old
+    out[height + 1:2 * height + 1] = new
+    out[2 * height + 2:] = heat
+    return Image.fromarray(out, "RGBA")
+
+
+def _init_worker(old_path, new_path, engine, background):
+    global _worker_fonts, _worker_background
+    _worker_fonts = tuple(MonoGameFont(path, os.path.dirname(path), render_engine=engine)
+                          for path in (old_path, new_path))
+    _worker_background = background
+
+
+def _diff_text(item):
+    index, text = item
+    old_font, new_font = _worker_fonts
+    old_img = old_font.render_text(text, background_color=_worker_background)
+    new_img = new_font.render_text(text, background_color=_worker_background)
+    count, box, _, _ = diff_images(old_img, new_img, _worker_background)
+    return index, count, box, old_img.size, new_img.size
+
+
+def compare_fonts(old_path, new_path, rows, workers=None, engine="pil", background=DEFAULT_BACKGROUND,
+                  chunksize=CHUNKSIZE):
+    """
+    مقایسه رندر رشته‌های rows ((مسیر، id، متن)) با دو فونت.
+
+    Returns:
+        tuple: (فهرست نتیجه رشته‌های متفاوت به ترتیب تعداد پیکسل، دیکشنری آمار)
+    """
+    start = time.perf_counter()
+    # در پردازه اصلی هم بارگذاری می‌شوند تا کش دیسکی پیش از شروع کارگرها گرم شود
+    _init_worker(old_path, new_path, engine, background)
+    old_font, new_font = _worker_fonts
+    changed, missing_stable = changed_codepoints(old_font, new_font)
+
+    # هر متن یکتا یک بار مقایسه می‌شود
+    occurrences = {}
+    for source, string_id, text in rows:
+        occurrences.setdefault(text, []).append((source, string_id))
+    texts = list(occurrences)
+    mask = affected_mask(texts, old_font, new_font, changed, missing_stable)
+    candidates = [(int(i), texts[i]) for i in np.flatnonzero(mask)]
+    prepared = time.perf_counter()
+
+    if workers == 1 or len(candidates) < chunksize:
+        results = map(_diff_text, candidates)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, _init_worker, (old_path, new_path, engine, background))
+        results = pool.imap_unordered(_diff_text, candidates, chunksize=chunksize)
+    differences = []
+    try:
+        for index, count, box, old_size, new_size in results:
+            if not count:
+                continue
+            text = texts[index]
+            source, string_id = occurrences[text][0]
+            differences.append({
+                "source": source, "id": string_id, "text": text, "occurrences": len(occurrences[text]),
+                "changed_pixels": count, "bbox": box, "old_size": list(old_size), "new_size": list(new_size),
+                "width_delta": new_size[0] - old_size[0],
+            })
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    differences.sort(key=lambda entry: (-entry["changed_pixels"], -abs(entry["width_delta"])))
+
+    stats = {
+        "strings": sum(len(refs) for refs in occurrences.values()),
+        "unique_texts": len(texts),
+        "skipped": len(texts) - len(candidates),
+        "compared": len(candidates),
+        "different": len(differences),
+        "changed_glyphs": [f"U+{cid:04X}" for cid in sorted(changed)],
+        "missing_advance_changed": not missing_stable,
+        "prepare_seconds": round(prepared - start, 3),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    return differences, stats
+
+
+def write_heatmaps(differences, out_dir, top=TOP_HEATMAPS, background=DEFAULT_BACKGROUND):
+    """نوشتن heatmap بدترین رشته‌ها با فونت‌های پردازه اصلی؛ نام فایل در نتیجه هر رشته ثبت می‌شود"""
+    old_font, new_font = _worker_fonts
+    folder = os.path.join(out_dir, "heatmaps")
+    os.makedirs(folder, exist_ok=True)
+    for rank, entry in enumerate(differences[:top], 1):
+        old_img = old_font.render_text(entry["text"], background_color=background)
+        new_img = new_font.render_text(entry["text"], background_color=background)
+        _, _, old, new = diff_images(old_img, new_img, background)
+        name = f"{rank:04d}_{safe_name(entry['id'])}.png"
+        heatmap(old, new).save(os.path.join(folder, name), compress_level=1)
+        entry["heatmap"] = f"heatmaps/{name}"
+
+
+def print_report(differences, stats, limit=10):
+    print(f"رشته‌ها: {stats['strings']} ({stats['unique_texts']} متن یکتا)")
+    print(f"گلیف‌های تغییرکرده: {len(stats['changed_glyphs'])}"
+          + ("، advance کاراکترهای ناموجود تغییر کرده است" if stats["missing_advance_changed"] else ""))
+    print(f"بدون گلیف تغییرکرده (رد شده): {stats['skipped']}، مقایسه‌شده: {stats['compared']}، "
+          f"متفاوت: {stats['different']}")
+    for entry in differences[:limit]:
+        print(f"  {entry['changed_pixels']:8d} پیکسل  Δعرض {entry['width_delta']:+4d}  "
+              f"{entry['source']}:{entry['id']}  {entry['text'][:50]!r}")
+    print(f"زمان: {stats['seconds']:.1f} ثانیه (آماده‌سازی {stats['prepare_seconds']:.2f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="مقایسه رندر دو نسخه یک فونت MonoGame روی پیکره رشته‌ها")
+    parser.add_argument("old", help="فونت قدیم (.json/.xnb)")
+    parser.add_argument("new", help="فونت جدید (.json/.xnb)")
+    parser.add_argument("corpus", nargs="+", help="فایل‌ها یا پوشه‌های رشته‌ها (CSV، JSON یا TXT)")
+    parser.add_argument("-o", "--out", required=True, help="پوشه خروجی گزارش و heatmapها")
+    parser.add_argument("--top", type=int, default=TOP_HEATMAPS, help="تعداد heatmapها")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--engine", choices=RENDER_ENGINES, default="pil")
+    parser.add_argument("--background", type=parse_color, default=DEFAULT_BACKGROUND)
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--fail-on-diff", action="store_true", help="کد خروج ۱ اگر رشته‌ای متفاوت باشد")
+    args = parser.parse_args(argv)
+
+    rows = iter_corpus(args.corpus, args.id_column, args.text_column)
+    differences, stats = compare_fonts(args.old, args.new, rows, args.workers, args.engine,
+                                       args.background, args.chunksize)
+    write_heatmaps(differences, args.out, args.top, args.background)
+    report_path = os.path.join(args.out, "report.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({"old": args.old, "new": args.new, "stats": stats, "differences": differences},
+                  f, ensure_ascii=False, indent=1)
+    print_report(differences, stats)
+    print(f"گزارش: {report_path}")
+    return 1 if args.fail_on_diff and differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
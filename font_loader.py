@@ -0,0 +1,100 @@
+"""
+بارگذاری هم‌زمان تعداد زیادی فونت (بدون PyQt).
+
+کار سنگین هر فونت (خواندن JSON/.xnb، رمزگشایی صفحه‌ها و نوشتن کش دیسکی) در
+پردازه‌های جداگانه انجام می‌شود؛ سپس پردازه اصلی فونت را از کش mmap شده می‌خواند
+که فقط چند میلی‌ثانیه طول می‌کشد. فونت‌هایی که کش معتبر دارند (مثلاً بازیابی جلسه)
+بدون پردازه کارگر مستقیماً خوانده می‌شوند. بدون کش دیسکی فونت‌ها با نخ‌ها بارگذاری
+می‌شوند.
+
+پردازه‌های کارگر با روش spawn ساخته می‌شوند: load_fonts معمولاً در نخ پس‌زمینه
+اجرا می‌شود و fork در حالی که نخ دیگری قفلی (مثلاً قفل textures یا profiler) را
+نگه داشته، پردازه فرزند را قفل می‌کند. برنامه فریزشده (PyInstaller) باید در شروع
+multiprocessing.freeze_support() را فراخوانی کند.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import font_cache
+from font import MonoGameFont
+
+FONT_EXTENSIONS = ('.json', '.xnb')
+# حداکثر تعداد کارگرهای بارگذاری
+LOAD_WORKERS = os.cpu_count() or 1
+
+
+def find_fonts(folder):
+    """یافتن همه فایل‌های فونت (.json/.xnb) در یک پوشه و زیرپوشه‌هایش"""
+    found = []
+    for root, _, files in os.walk(folder):
+        for file in files:
+            if file.lower().endswith(FONT_EXTENSIONS):
+                found.append(os.path.join(root, file))
+    return sorted(found)
+
+
+def _prepare_font(path):
+    """اجرا در پردازه کارگر: ساخت فونت تا کش دیسکی آن نوشته شود"""
+    try:
+        MonoGameFont(path, os.path.dirname(path))
+    except Exception as e:
+        return path, str(e)
+    return path, None
+
+
+def _open_font(path, font_options):
+    try:
+        return MonoGameFont(path, os.path.dirname(path), **font_options), None
+    except Exception as e:
+        return None, str(e)
+
+
+def load_fonts(paths, workers=LOAD_WORKERS, progress=None, **font_options):
+    """
+    بارگذاری چند فونت با تعداد محدودی کارگر.
+
+    Args:
+        paths (list): مسیر فایل‌های فونت
+        workers (int): حداکثر تعداد کارگرها
+        progress (callable): progress(done, total, path, font, error) پس از آماده شدن هر فونت
+        font_options: آرگومان‌های اضافه MonoGameFont (مثلاً render_engine)
+
+    Returns:
+        list: (path, font, error) برای هر مسیر به ترتیب ورودی؛ font یا error برابر None است
+    """
+    paths = list(dict.fromkeys(paths))
+    total = len(paths)
+    results = {}
+
+    def finish(path, font, error):
+        results[path] = (path, font, error)
+        if progress:
+            progress(len(results), total, path, font, error)
+
+    # فونت‌های دارای کش معتبر در همین نخ خوانده می‌شوند؛ فقط بقیه کارگر لازم دارند
+    cached = {path for path in paths if font_cache.is_cached(path, os.path.dirname(path))}
+    pending = [path for path in paths if path not in cached]
+    workers = max(1, min(workers, len(pending)))
+
+    if workers == 1:
+        for path in paths:
+            finish(path, *_open_font(path, font_options))
+    elif font_cache.CACHE_ENABLED:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_prepare_font, path) for path in pending]
+            for path in paths:
+                if path in cached:
+                    finish(path, *_open_font(path, font_options))
+            for future in as_completed(futures):
+                path, error = future.result()
+                if error:
+                    finish(path, None, error)
+                else:
+                    finish(path, *_open_font(path, font_options))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_open_font, path, font_options): path for path in pending}
+            for future in as_completed(futures):
+                finish(futures[future], *future.result())
+
+    return [results[path] for path in paths]
@@ -1,17 +1,51 @@
 import os
 from PyQt5.QtWidgets import QLineEdit, QPushButton, QFileDialog, QMessageBox, QHBoxLayout
-from font import MonoGameFont
-from renderer import render_fonts
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 import recent_files
 
+# font و font_loader (همراه PIL و NumPy) فقط هنگام نیاز وارد می‌شوند تا پنجره
+# پیش از آن‌ها نمایش داده شود؛ بارگذاری پس‌زمینه آن‌ها را در نخ کارگر وارد می‌کند
+
+class FontLoadSignals(QObject):
+    progress = pyqtSignal(int, int, str, object, object)
+    finished = pyqtSignal(list)
+
+class FontLoadJob(QRunnable):
+    """
+    بارگذاری چند فونت در پس‌زمینه با load_fonts.
+
+    هر فونت به محض آماده شدن با سیگنال progress (done, total, path, font, error)
+    به نخ رابط کاربری فرستاده می‌شود و در پایان فهرست کامل نتایج با finished.
+    """
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = list(paths)
+        self.signals = FontLoadSignals()
+
+    def run(self):
+        try:
+            from font_loader import load_fonts
+            results = load_fonts(self.paths, progress=self.signals.progress.emit)
+        except Exception as e:
+            print(f"خطا در بارگذاری فونت‌ها: {e}")
+            results = [(path, None, str(e)) for path in self.paths]
+        self.signals.finished.emit(results)
+
 class FontManager:
-    def __init__(self, initial_font):
-        self.fonts = [initial_font]
+    def __init__(self, initial_font=None):
+        # بدون initial_font برنامه بدون فونت شروع می‌شود و فونت‌ها در پس‌زمینه اضافه می‌شوند
+        self.fonts = [initial_font] if initial_font is not None else []
         self.text_fields = []
         self.field_layouts = []
         self.text_fields_layout = None
         self.update_callback = None
         self.last_folder = os.path.expanduser("~")
+        # متن ردیف‌های جلسه‌ای که در حال بازیابی است، به ترتیب فونت‌ها
+        self.session_entries = None
+        # یک بارگذاری پوشه در هر زمان؛ خود load_fonts کارها را بین چند پردازه پخش می‌کند
+        self.load_pool = QThreadPool()
+        self.load_pool.setMaxThreadCount(1)
 
     def add_text_field(self, parent_layout, update_callback):
         field_layout = QHBoxLayout()
@@ -27,45 +61,142 @@ class FontManager:
         self.text_fields.append(text_field)
         self.field_layouts.append(field_layout)
 
-    def load_font(self, parent_layout, update_callback, mode="add", fnt_file=None):
+    def ensure_text_field(self, parent_layout, update_callback):
+        """ردیف متن برای آخرین فونت؛ فیلد خالی اولیه (پیش از هر فونت) دوباره استفاده می‌شود"""
+        if len(self.text_fields) < len(self.fonts):
+            self.add_text_field(parent_layout, update_callback)
+
+    def load_font(self, parent_layout, update_callback, mode="add", fnt_file=None, finished_callback=None):
+        """
+        انتخاب یک فونت (یا fnt_file) و بارگذاری آن در پس‌زمینه با FontLoadJob.
+
+        با mode="add" فونت یک ردیف تازه می‌گیرد و در حالت‌های دیگر جای همه فونت‌ها را می‌گیرد.
+
+        Returns:
+            FontLoadJob | None: None اگر فایلی انتخاب نشد
+        """
         if not fnt_file:
             fnt_file, _ = QFileDialog.getOpenFileName(
                 None, "Select MonoGame Font File", self.last_folder, "Font Files (*.json *.xnb);;All Files (*)"
             )
         if not fnt_file:
+            return None
+        self.set_layout(parent_layout, update_callback)
+        self.last_folder = os.path.dirname(fnt_file)
+        job = FontLoadJob([fnt_file])
+        job.signals.finished.connect(lambda results: self.on_font_file_loaded(results, mode))
+        if finished_callback:
+            job.signals.finished.connect(finished_callback)
+        self.load_pool.start(job)
+        return job
+
+    def on_font_file_loaded(self, results, mode):
+        fnt_file, font, error = results[0]
+        if font is None:
+            QMessageBox.critical(None, "Error", f"خطا در بارگذاری فونت: {error}. لطفاً مطمئن شوید فایل .xnb یا .json و فایل PNG مرتبط (مثل {os.path.splitext(os.path.basename(fnt_file))[0]}.png) معتبر هستند.")
             return
-        try:
-            font = MonoGameFont(fnt_file, os.path.dirname(fnt_file))
-            if mode == "add":
-                self.fonts.append(font)
-            else:
-                self.fonts = [font]
-                self.clear_fields(parent_layout)
-                self.text_fields = []
-                self.field_layouts = []
-            self.add_text_field(parent_layout, update_callback)
-            recent_files.save_recent_file(fnt_file)
-            self.last_folder = os.path.dirname(fnt_file)
-            self.set_layout(parent_layout, update_callback)
-            self.update_callback()
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"خطا در بارگذاری فونت: {e}. لطفاً مطمئن شوید فایل .xnb یا .json و فایل PNG مرتبط (مثل {os.path.splitext(os.path.basename(fnt_file))[0]}.png) معتبر هستند.")
+        if mode == "add":
+            self.fonts.append(font)
+        else:
+            self.close_fonts(self.fonts, keep=[font])
+            self.fonts = [font]
+            self.clear_fields(self.text_fields_layout)
+            self.text_fields = []
+            self.field_layouts = []
+        self.ensure_text_field(self.text_fields_layout, self.update_callback)
+        recent_files.save_recent_file(fnt_file)
+        self.update_callback()
+
+    def add_font(self, parent_layout, update_callback, finished_callback=None):
+        return self.load_font(parent_layout, update_callback, mode="add", finished_callback=finished_callback)
+
+    def open_font(self, parent_layout, update_callback, finished_callback=None):
+        return self.load_font(parent_layout, update_callback, mode="open", finished_callback=finished_callback)
+
+    def load_recent_font(self, fnt_file, parent_layout, update_callback, finished_callback=None):
+        return self.load_font(parent_layout, update_callback, mode="recent", fnt_file=fnt_file,
+                              finished_callback=finished_callback)
+
+    def open_folder(self, parent_layout, update_callback, progress_callback=None, finished_callback=None):
+        """انتخاب یک پوشه و افزودن همه فونت‌های .xnb/.json آن و زیرپوشه‌هایش"""
+        folder = QFileDialog.getExistingDirectory(None, "Select Content Folder", self.last_folder)
+        if not folder:
+            return None
+        from font_loader import find_fonts
+        paths = find_fonts(folder)
+        if not paths:
+            QMessageBox.information(None, "Open Folder", f"هیچ فایل .xnb یا .json در {folder} پیدا نشد.")
+            return None
+        self.last_folder = folder
+        return self.load_fonts(paths, parent_layout, update_callback, progress_callback, finished_callback)
+
+    def load_fonts(self, paths, parent_layout, update_callback, progress_callback=None, finished_callback=None):
+        """افزودن چند فونت در پس‌زمینه؛ هر فونت به محض آماده شدن یک ردیف می‌گیرد"""
+        self.set_layout(parent_layout, update_callback)
+        job = FontLoadJob(paths)
+        job.signals.progress.connect(self.on_font_loaded)
+        job.signals.finished.connect(self.on_fonts_finished)
+        if progress_callback:
+            job.signals.progress.connect(progress_callback)
+        if finished_callback:
+            job.signals.finished.connect(finished_callback)
+        self.load_pool.start(job)
+        return job
+
+    def on_font_loaded(self, done, total, path, font, error):
+        if font is None:
+            return
+        self.fonts.append(font)
+        self.ensure_text_field(self.text_fields_layout, self.update_callback)
+        self.update_callback()
+
+    def restore_fonts(self, entries, parent_layout, update_callback, finished_callback=None):
+        """
+        بارگذاری پس‌زمینه فونت‌های یک جلسه ذخیره‌شده؛ ردیف‌ها به همان ترتیب و با همان متن‌ها ساخته می‌شوند.
+
+        Args:
+            entries (list): [{"path", "text"}, ...] از session.load_session
+        """
+        self.set_layout(parent_layout, update_callback)
+        self.session_entries = list(entries)
+        job = FontLoadJob([entry["path"] for entry in self.session_entries])
+        job.signals.finished.connect(self.on_session_loaded)
+        if finished_callback:
+            job.signals.finished.connect(finished_callback)
+        self.load_pool.start(job)
+        return job
 
-    def add_font(self, parent_layout, update_callback):
-        self.load_font(parent_layout, update_callback, mode="add")
+    def on_session_loaded(self, results):
+        fonts = {path: font for path, font, _ in results}
+        for entry in self.session_entries or ():
+            font = fonts.get(entry["path"])
+            if font is None:
+                continue
+            # فونتی که دو بار باز شده بود هر دو ردیف را با یک شیء می‌گیرد
+            self.fonts.append(font)
+            self.ensure_text_field(self.text_fields_layout, self.update_callback)
+            self.text_fields[len(self.fonts) - 1].setText(entry.get("text", ""))
+        self.session_entries = None
+        self.on_fonts_finished(results)
+        self.update_callback()
 
-    def open_font(self, parent_layout, update_callback):
-        self.load_font(parent_layout, update_callback, mode="open")
+    def session_fonts(self):
+        """[{"path", "text"}, ...] فونت‌های باز برای ذخیره در جلسه"""
+        return [{"path": os.path.abspath(font.fnt_file), "text": text_field.text()}
+                for font, text_field in zip(self.fonts, self.text_fields)]
 
-    def load_recent_font(self, fnt_file, parent_layout, update_callback):
-        self.load_font(parent_layout, update_callback, mode="recent", fnt_file=fnt_file)
+    def on_fonts_finished(self, results):
+        errors = [f"{os.path.basename(path)}: {error}" for path, font, error in results if error]
+        if errors:
+            details = "\n".join(errors[:10]) + (f"\n... و {len(errors) - 10} خطای دیگر" if len(errors) > 10 else "")
+            QMessageBox.warning(None, "Warning", f"{len(errors)} فونت بارگذاری نشد:\n{details}")
 
     def remove_font_by_field(self, text_field):
         try:
             index = self.text_fields.index(text_field)
             if len(self.fonts) <= 1 or index == 0:
                 return
-            self.fonts.pop(index)
+            self.close_fonts([self.fonts.pop(index)])
             self.text_fields.pop(index)
             field_layout = self.field_layouts.pop(index)
             self.text_fields_layout.removeItem(field_layout)
@@ -80,6 +211,7 @@ class FontManager:
     def remove_all_fonts(self):
         if len(self.fonts) <= 1:
             return
+        self.close_fonts(self.fonts[1:], keep=self.fonts[:1])
         self.fonts = [self.fonts[0]]
         self.clear_fields(self.text_fields_layout)
         self.text_fields = []
@@ -87,6 +219,20 @@ class FontManager:
         self.add_text_field(self.text_fields_layout, self.update_callback)
         self.update_callback()
 
+    def close_fonts(self, fonts, keep=None):
+        """
+        بستن فونت‌های حذف‌شده‌ای که ردیف دیگری ندارند تا صفحه‌هایشان از textures رها شوند.
+
+        کاشی در حال رندر فونت بسته خطا می‌دهد و چون ردیفش حذف شده رسم نمی‌شود.
+        """
+        keep = self.fonts if keep is None else keep
+        closed = []
+        for font in fonts:
+            if any(font is other for other in keep) or any(font is other for other in closed):
+                continue
+            font.close()
+            closed.append(font)
+
     def clear_fields(self, parent_layout):
         for field_layout in self.field_layouts:
             parent_layout.removeItem(field_layout)
@@ -99,9 +245,3 @@ class FontManager:
     def set_layout(self, layout, callback):
         self.text_fields_layout = layout
         self.update_callback = callback
-
-    def render(self, background_color, zoom_factor):
-        pixmap = render_fonts(self.fonts, self.text_fields, background_color, zoom_factor)
-        if pixmap.isNull():
-            QMessageBox.warning(None, "Warning", "هیچ کاراکتری برای رندر یافت نشد یا فایل تصویر فونت موجود نیست. لطفاً کاراکترهای پشتیبانی‌شده را وارد کنید.")
-        return pixmap
\ No newline at end of file
@@ -0,0 +1,78 @@
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+# مکث پس از آخرین تغییر فایل پیش از بارگذاری دوباره (میلی‌ثانیه)؛ خروجی گرفتن یک اطلس
+# معمولاً چند نوشتن پشت‌سرهم (یا حذف و جایگزینی فایل) است
+RELOAD_DEBOUNCE_MS = 200
+
+class FontWatcher(QObject):
+    """
+    پایش فایل‌های فونت‌های باز و بارگذاری دوباره خودکار آن‌ها با MonoGameFont.reload.
+
+    هم خود فایل‌ها و هم پوشه‌هایشان پایش می‌شوند، چون بسیاری از ابزارها فایل را با
+    حذف و جایگزینی می‌نویسند و QFileSystemWatcher پس از آن فایل را رها می‌کند. هر
+    رویداد فقط تایمر debounce را از نو شروع می‌کند؛ پس از آن مهر (اندازه، زمان تغییر)
+    فایل‌ها با changed_sources مقایسه و فقط فونت‌های تغییرکرده بارگذاری می‌شوند.
+    """
+    # فونت دوباره بارگذاری‌شده
+    font_reloaded = pyqtSignal(object)
+    # (فونت، پیام خطا)؛ فونت بدون تغییر می‌ماند و تغییر بعدی فایل دوباره امتحان می‌شود
+    reload_failed = pyqtSignal(object, str)
+
+    def __init__(self, parent=None, debounce_ms=RELOAD_DEBOUNCE_MS, before_reload=None):
+        super().__init__(parent)
+        self.fonts = []
+        # پیش از تغییر فونت‌ها فراخوانی می‌شود (مثلاً انتظار برای کارهای رندر پس‌زمینه‌ای که از آن‌ها می‌خوانند)
+        self.before_reload = before_reload
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_changed)
+        self.watcher.directoryChanged.connect(self.on_changed)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.check)
+
+    def set_fonts(self, fonts):
+        """پایش فایل‌های این فونت‌ها به جای فونت‌های قبلی"""
+        fonts = list(fonts)
+        if len(fonts) == len(self.fonts) and all(a is b for a, b in zip(fonts, self.fonts)):
+            return
+        self.fonts = fonts
+        self.update_paths()
+
+    def update_paths(self):
+        files = set()
+        for font in self.fonts:
+            files.update(font.source_files())
+        folders = {os.path.dirname(path) for path in files}
+        wanted = {path for path in files if os.path.exists(path)} | {path for path in folders if os.path.isdir(path)}
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        stale = watched - wanted
+        new = wanted - watched
+        if stale:
+            self.watcher.removePaths(list(stale))
+        if new:
+            self.watcher.addPaths(list(new))
+
+    def on_changed(self, path):
+        self.timer.start()
+
+    def check(self):
+        """بارگذاری دوباره فونت‌هایی که فایلشان تغییر کرده است"""
+        waited = False
+        for font in self.fonts:
+            changed = font.changed_sources()
+            if not changed:
+                continue
+            if self.before_reload and not waited:
+                self.before_reload()
+                waited = True
+            try:
+                font.reload(changed)
+            except Exception as e:
+                print(f"خطا در بارگذاری دوباره {font.fnt_file}: {e}")
+                self.reload_failed.emit(font, str(e))
+                continue
+            self.font_reloaded.emit(font)
+        # فایل جایگزین‌شده یا صفحه تازه باید دوباره به پایش اضافه شود
+        self.update_paths()
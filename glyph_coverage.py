@@ -0,0 +1,287 @@
+"""
+پوشش گلیف فونت‌ها روی پیکره متنی ترجمه‌ها (بدون PyQt).
+
+پیکره (فایل‌های CSV/JSON/TXT یا پوشه‌ای از آن‌ها) در یک گذر جریانی به هیستوگرام
+کدپوینت‌ها تبدیل می‌شود. پوشش هر فونت یک بیت‌مپ فشرده است و کاراکترهای ناموجود
+هر فونت با یک عمل بیتی (پیکره & ~فونت) به دست می‌آیند. فقط رشته‌هایی که کاراکتری
+بیرون از پوشش مشترک همه فونت‌ها دارند جداگانه بررسی می‌شوند.
+
+    python glyph_coverage.py strings/ --fonts fonts/ --json coverage.json --fail-on-missing
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+import numpy as np
+from batch_render import read_string_table
+from font_loader import find_fonts, load_fonts
+
+CORPUS_EXTENSIONS = ('.csv', '.json', '.txt')
+# حداکثر تعداد رشته نمونه برای هر کاراکتر ناموجود
+MAX_EXAMPLES = 3
+# تعداد رشته‌هایی که با هم به هیستوگرام اضافه می‌شوند
+SCAN_BATCH = 65536
+# نویسه‌های کنترلی (خط جدید، تب و ...) گلیف لازم ندارند
+IGNORED_CHARS = frozenset(chr(c) for c in range(0x20))
+IGNORED_BITS = (1 << 0x20) - 1
+
+
+def codepoint_bitmap(codepoints):
+    """بیت‌مپ فشرده کدپوینت‌ها به صورت عدد صحیح پایتون؛ بیت n یعنی کدپوینت n"""
+    codepoints = list(codepoints)
+    if not codepoints:
+        return 0
+    bits = bytearray((max(codepoints) >> 3) + 1)
+    for cp in codepoints:
+        bits[cp >> 3] |= 1 << (cp & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_bits(bitmap):
+    """کدپوینت‌های یک بیت‌مپ به ترتیب صعودی"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        if not byte:
+            continue
+        base = index << 3
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield base + bit
+
+
+def font_bitmap(font):
+    """بیت‌مپ کدپوینت‌هایی که فونت برایشان گلیف دارد (از ستون id جدول گلیف‌ها)"""
+    return codepoint_bitmap(font.chars.id)
+
+
+def font_labels(font_paths, font_args):
+    """
+    برچسب یکتای هر فونت در گزارش: مسیر نسبی آن به پوشه --fonts (یا نام فایل)، با پسوند.
+
+    فونت‌هایی که برچسب یکسان دارند (مثلاً Main.xnb در دو پوشه جدا) با هشدار مسیر کامل
+    خود را می‌گیرند تا در گزارش روی هم نوشته نشوند.
+
+    Returns:
+        dict: مسیر فونت به برچسب
+    """
+    labels = {}
+    for path in font_paths:
+        folder = next((f for f in font_args if os.path.isdir(f) and
+                       os.path.realpath(path).startswith(os.path.realpath(f) + os.sep)), os.path.dirname(path))
+        labels[path] = os.path.relpath(path, folder)
+    counts = Counter(labels.values())
+    for path, label in labels.items():
+        if counts[label] > 1:
+            labels[path] = os.path.abspath(path)
+            print(f"هشدار: چند فونت برچسب {label} دارند؛ برای {path} مسیر کامل به کار می‌رود")
+    return labels
+
+
+def iter_corpus(paths, id_column="id", text_column="text"):
+    """
+    خواندن جریانی رشته‌های پیکره.
+
+    پوشه‌ها با همه زیرپوشه‌هایشان پیمایش می‌شوند. CSV و JSON با read_string_table و
+    فایل‌های متنی خط به خط خوانده می‌شوند (شناسه هر خط شماره آن است).
+
+    Yields:
+        tuple: (مسیر فایل، id، متن)
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(root, file)
+                           for root, _, names in os.walk(path)
+                           for file in names if file.lower().endswith(CORPUS_EXTENSIONS))
+        else:
+            files = [path]
+        for file in files:
+            if file.lower().endswith(('.csv', '.json')):
+                for string_id, text in read_string_table(file, id_column, text_column):
+                    yield file, string_id, text
+            else:
+                with open(file, 'r', encoding='utf-8-sig') as f:
+                    for i, line in enumerate(f, 1):
+                        yield file, str(i), line.rstrip('\r\n')
+
+
+class CorpusScan:
+    """
+    هیستوگرام کدپوینت‌های پیکره به همراه رشته‌های نمونه و تعداد رشته‌های آسیب‌دیده هر فونت.
+
+    counts آرایه NumPy تعداد رخداد هر کدپوینت است؛ رشته‌ها دسته‌ای به UTF-32 تبدیل و
+    با bincount شمرده می‌شوند.
+
+    Args:
+        font_chars (dict): نام فونت به مجموعه کاراکترهای پشتیبانی‌شده آن
+        max_examples (int): حداکثر رشته نمونه برای هر کاراکتر بیرون از پوشش مشترک
+    """
+
+    def __init__(self, font_chars, max_examples=MAX_EXAMPLES):
+        self.font_chars = {label: frozenset(chars) | IGNORED_CHARS for label, chars in font_chars.items()}
+        sets = list(self.font_chars.values())
+        self.common = frozenset.intersection(*sets) if sets else IGNORED_CHARS
+        self.max_examples = max_examples
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.examples = {}
+        self.affected = Counter()
+        self.strings = 0
+        self._batch = []
+
+    def add(self, source, string_id, text):
+        self.strings += 1
+        self._batch.append(text)
+        if len(self._batch) >= SCAN_BATCH:
+            self._flush()
+        # بیشتر رشته‌ها با همه فونت‌ها قابل رندرند و همین یک بررسی برایشان کافی است
+        if self.common.issuperset(text):
+            return
+        for ch in set(text).difference(self.common):
+            examples = self.examples.setdefault(ch, [])
+            if len(examples) < self.max_examples:
+                examples.append((source, string_id, text))
+        for label, chars in self.font_chars.items():
+            if not chars.issuperset(text):
+                self.affected[label] += 1
+
+    def scan(self, rows):
+        """افزودن همه (مسیر، id، متن)های rows؛ خود شیء را برمی‌گرداند"""
+        for row in rows:
+            self.add(*row)
+        self._flush()
+        return self
+
+    def _flush(self):
+        if not self._batch:
+            return
+        data = "".join(self._batch).encode("utf-32-le", "surrogatepass")
+        self._batch.clear()
+        batch_counts = np.bincount(np.frombuffer(data, dtype=np.uint32))
+        if batch_counts.size > self.counts.size:
+            batch_counts[:self.counts.size] += self.counts
+            self.counts = batch_counts
+        else:
+            self.counts[:batch_counts.size] += batch_counts
+
+    def count(self, cp):
+        """تعداد رخداد کدپوینت cp در پیکره"""
+        self._flush()
+        return int(self.counts[cp]) if cp < self.counts.size else 0
+
+    def distinct(self):
+        """تعداد کاراکترهای متمایز پیکره"""
+        self._flush()
+        return int(np.count_nonzero(self.counts))
+
+    def bitmap(self):
+        """بیت‌مپ کدپوینت‌های به‌کاررفته در پیکره (بدون نویسه‌های کنترلی)"""
+        self._flush()
+        bits = np.packbits(self.counts > 0, bitorder="little").tobytes()
+        return int.from_bytes(bits, "little") & ~IGNORED_BITS
+
+
+def missing_report(scan, font_bitmaps):
+    """
+    گزارش کاراکترهای ناموجود هر فونت.
+
+    Args:
+        scan (CorpusScan): پیکره پیمایش‌شده
+        font_bitmaps (dict): نام فونت به بیت‌مپ پوشش آن (font_bitmap)
+
+    Returns:
+        list: برای هر فونت {"font", "missing_chars", "missing_occurrences", "affected_strings",
+        "missing": [{"codepoint", "char", "count", "examples"}]} به ترتیب بیشترین رخداد
+    """
+    corpus = scan.bitmap()
+    report = []
+    for label, bits in font_bitmaps.items():
+        missing = []
+        for cp in iter_bits(corpus & ~bits):
+            ch = chr(cp)
+            missing.append({
+                "codepoint": f"U+{cp:04X}",
+                "char": ch,
+                "count": scan.count(cp),
+                "examples": [{"file": source, "id": string_id, "text": text}
+                             for source, string_id, text in scan.examples.get(ch, [])],
+            })
+        missing.sort(key=lambda entry: -entry["count"])
+        report.append({
+            "font": label,
+            "missing_chars": len(missing),
+            "missing_occurrences": sum(entry["count"] for entry in missing),
+            "affected_strings": scan.affected[label],
+            "missing": missing,
+        })
+    return report
+
+
+def print_report(report, scan, limit=10):
+    print(f"پیکره: {scan.strings} رشته، {scan.distinct()} کاراکتر متمایز")
+    for entry in report:
+        if not entry["missing_chars"]:
+            print(f"{entry['font']}: همه کاراکترها موجود است")
+            continue
+        print(f"{entry['font']}: {entry['missing_chars']} کاراکتر ناموجود، "
+              f"{entry['missing_occurrences']} رخداد در {entry['affected_strings']} رشته")
+        for missing in entry["missing"][:limit]:
+            example = missing["examples"][0] if missing["examples"] else None
+            where = f"  مثال {example['file']}#{example['id']}: {example['text'][:60]!r}" if example else ""
+            print(f"  {missing['codepoint']} {missing['char']!r} × {missing['count']}{where}")
+        if entry["missing_chars"] > limit:
+            print(f"  ... و {entry['missing_chars'] - limit} کاراکتر دیگر")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="گزارش کاراکترهای بدون گلیف فونت‌های MonoGame در پیکره ترجمه‌ها")
+    parser.add_argument("corpus", nargs="+", help="فایل‌ها یا پوشه‌های رشته‌ها (CSV، JSON یا TXT)")
+    parser.add_argument("--fonts", nargs="+", required=True, help="فایل‌ها یا پوشه‌های فونت (.json/.xnb)")
+    parser.add_argument("--max-examples", type=int, default=MAX_EXAMPLES)
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--json", help="نوشتن گزارش کامل در این فایل JSON")
+    parser.add_argument("--fail-on-missing", action="store_true",
+                        help="کد خروج ۱ اگر فونتی کاراکتر ناموجود داشته باشد (برای ساخت محتوا)")
+    args = parser.parse_args(argv)
+
+    font_paths = {}
+    for path in args.fonts:
+        for font_path in (find_fonts(path) if os.path.isdir(path) else [path]):
+            # فونتی که با چند آرگومان پیدا شده یک بار گزارش می‌شود
+            font_paths.setdefault(os.path.realpath(font_path), font_path)
+    font_paths = list(font_paths.values())
+    if not font_paths:
+        print("هیچ فونتی پیدا نشد")
+        return 1
+    labels = font_labels(font_paths, args.fonts)
+
+    start = time.perf_counter()
+    font_chars = {}
+    font_bitmaps = {}
+    for path, font, error in load_fonts(font_paths):
+        if error:
+            print(f"خطا در بارگذاری فونت {path}: {error}")
+            return 1
+        label = labels[path]
+        font_chars[label] = map(chr, font.chars.id)
+        font_bitmaps[label] = font_bitmap(font)
+
+    scan = CorpusScan(font_chars, args.max_examples)
+    scan.scan(iter_corpus(args.corpus, args.id_column, args.text_column))
+    report = missing_report(scan, font_bitmaps)
+    elapsed = time.perf_counter() - start
+
+    print_report(report, scan)
+    print(f"زمان: {elapsed:.2f} ثانیه برای {scan.strings} رشته × {len(font_bitmaps)} فونت")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"strings": scan.strings, "fonts": report}, f, ensure_ascii=False, indent=2)
+        print(f"گزارش: {args.json}")
+    if args.fail_on_missing and any(entry["missing_chars"] for entry in report):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
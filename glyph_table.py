@@ -0,0 +1,128 @@
+"""جدول فشرده گلیف‌ها: ستون‌های array به جای یک شیء پایتون برای هر گلیف."""
+from array import array
+from bisect import bisect_left
+from character import FontCharacter
+
+# ترتیب ستون‌ها؛ همان ترتیب آرگومان‌های FontCharacter
+COLUMNS = ("id", "x", "y", "width", "height", "xoffset", "yoffset", "xadvance", "page")
+BMP_LIMIT = 0x10000
+
+
+class GlyphTable:
+    """
+    نگاشت کدپوینت به گلیف با رابط شبیه dict (get، items، values، in، len).
+
+    هر مشخصه گلیف یک ستون array('i') است و ردیف هر کدپوینت BMP از یک جدول متراکم
+    و ردیف کدپوینت‌های بالاتر با جستجوی دودویی در فهرست مرتب آن‌ها پیدا می‌شود.
+    get و values اشیاء FontCharacter را فقط هنگام نیاز می‌سازند؛ مسیرهای پرکار رندر
+    مستقیماً از row و ستون‌ها استفاده می‌کنند.
+    """
+
+    def __init__(self):
+        for name in COLUMNS:
+            setattr(self, name, array('i'))
+        self._columns = tuple(getattr(self, name) for name in COLUMNS)
+        # ردیف هر کدپوینت BMP (یا -1)؛ فقط تا بزرگ‌ترین کدپوینت موجود بزرگ می‌شود
+        self.bmp_rows = array('i')
+        self.astral_ids = array('i')
+        self.astral_rows = array('i')
+
+    @classmethod
+    def from_columns(cls, columns):
+        """ساخت جدول از ستون‌های آماده (مثلاً خوانده‌شده از کش دیسکی)"""
+        table = cls()
+        table.load_columns(columns)
+        return table
+
+    def load_columns(self, columns):
+        """جایگزینی کل محتوای جدول با ستون‌های array('i')؛ کدپوینت‌ها باید یکتا باشند"""
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+        self._columns = tuple(columns[name] for name in COLUMNS)
+        self._build_lookup()
+
+    def _build_lookup(self):
+        ids = self.id
+        bmp_max = max((cid for cid in ids if cid < BMP_LIMIT), default=-1)
+        self.bmp_rows = array('i', [-1]) * (bmp_max + 1)
+        astral = []
+        bmp_rows = self.bmp_rows
+        for row, cid in enumerate(ids):
+            if cid < BMP_LIMIT:
+                bmp_rows[cid] = row
+            else:
+                astral.append((cid, row))
+        astral.sort()
+        self.astral_ids = array('i', [cid for cid, _ in astral])
+        self.astral_rows = array('i', [row for _, row in astral])
+
+    def row(self, cid):
+        """شماره ردیف کدپوینت در ستون‌ها یا -1 اگر گلیفی ندارد"""
+        if cid < len(self.bmp_rows):
+            return self.bmp_rows[cid]
+        if cid < BMP_LIMIT or not self.astral_ids:
+            return -1
+        i = bisect_left(self.astral_ids, cid)
+        if i < len(self.astral_ids) and self.astral_ids[i] == cid:
+            return self.astral_rows[i]
+        return -1
+
+    def add(self, id, x, y, width, height, xoffset, yoffset, xadvance, page):
+        """افزودن یک گلیف؛ کدپوینت تکراری مانند dict جایگزین مقدار قبلی می‌شود"""
+        values = (id, x, y, width, height, xoffset, yoffset, xadvance, page)
+        row = self.row(id)
+        if row >= 0:
+            for column, value in zip(self._columns, values):
+                column[row] = value
+            return
+        row = len(self.id)
+        for column, value in zip(self._columns, values):
+            column.append(value)
+        if id < BMP_LIMIT:
+            if id >= len(self.bmp_rows):
+                self.bmp_rows.extend([-1] * (id + 1 - len(self.bmp_rows)))
+            self.bmp_rows[id] = row
+        else:
+            i = bisect_left(self.astral_ids, id)
+            self.astral_ids.insert(i, id)
+            self.astral_rows.insert(i, row)
+
+    def character(self, row):
+        """شیء FontCharacter برای یک ردیف"""
+        return FontCharacter(*[column[row] for column in self._columns])
+
+    def get(self, cid, default=None):
+        row = self.row(cid)
+        return self.character(row) if row >= 0 else default
+
+    def __getitem__(self, cid):
+        row = self.row(cid)
+        if row < 0:
+            raise KeyError(cid)
+        return self.character(row)
+
+    def __setitem__(self, cid, c):
+        self.add(cid, c.x, c.y, c.width, c.height, c.xoffset, c.yoffset, c.xadvance, c.page)
+
+    def __contains__(self, cid):
+        return self.row(cid) >= 0
+
+    def __len__(self):
+        return len(self.id)
+
+    def __iter__(self):
+        return iter(self.id)
+
+    def keys(self):
+        return list(self.id)
+
+    def values(self):
+        return [self.character(row) for row in range(len(self.id))]
+
+    def items(self):
+        return [(self.id[row], self.character(row)) for row in range(len(self.id))]
+
+    def memory_bytes(self):
+        """حافظه ستون‌ها و جدول‌های جستجو (بایت)"""
+        arrays = list(self._columns) + [self.bmp_rows, self.astral_ids, self.astral_rows]
+        return sum(len(a) * a.itemsize for a in arrays)
@@ -0,0 +1,158 @@
+"""خواندن جریانی JSON: مقدارها تکه به تکه از فایل خوانده می‌شوند و کل سند هرگز در حافظه ساخته نمی‌شود."""
+import json
+import re
+
+CHUNK_SIZE = 1024 * 1024
+_WHITESPACE = " \t\n\r"
+# جداکننده پس از هر عنصر به همراه فاصله‌های دو طرفش
+_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]}])[ \t\n\r]*")
+# عناصر کامل تا آخرین "}," یا "\"," پیش از اولین "]" بافر با یک فراخوانی decode خوانده می‌شوند
+_BATCH_ENDINGS = ('},', '",')
+
+class JsonStream:
+    """
+    پیمایش اشیاء و آرایه‌های JSON یک فایل متنی بدون بارگذاری کامل آن.
+
+    iter_object کلیدها را برمی‌گرداند و فراخواننده باید پیش از کلید بعدی مقدار آن را با
+    value، iter_array یا skip مصرف کند. iter_array عناصر کامل موجود در بافر را دسته‌ای
+    رمزگشایی می‌کند، پس حافظه مصرفی به اندازه یک تکه فایل محدود است نه کل آرایه.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """اولین نویسه غیرفاصله بعدی ('' در پایان فایل)"""
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"انتظار '{ch}' در JSON")
+        self.pos += 1
+
+    def value(self):
+        """خواندن کامل مقدار بعدی"""
+        self.peek()
+        while True:
+            try:
+                result, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # عدد در انتهای بافر ممکن است در تکه بعدی ادامه داشته باشد (مثلاً "-2." یا "1.5e")
+            truncated = end == len(self.buf) or (
+                len(self.buf) - end <= 2 and self.buf[end] in ".eE" and isinstance(result, (int, float)))
+            if truncated and self._fill():
+                continue
+            self.pos = end
+            return result
+
+    def _separator(self, close):
+        """پس از هر عنصر: True اگر عنصر دیگری هست، False در پایان آرایه/شیء"""
+        ch = self.peek()
+        self.pos += 1
+        if ch == ",":
+            return True
+        if ch == close:
+            return False
+        raise ValueError(f"نویسه نامعتبر '{ch}' در JSON")
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        scan = self.decoder.scan_once
+        decode = self.decoder.decode
+        separator = _SEPARATOR.match
+        barrier = -1
+        while True:
+            buf = self.buf
+            pos = self.pos
+            if pos > barrier:
+                limit = buf.find("]", pos)
+                if limit < 0:
+                    limit = len(buf)
+                cut = max(buf.rfind(ending, pos, limit) for ending in _BATCH_ENDINGS)
+                if cut > pos:
+                    try:
+                        values = decode("[" + buf[pos:cut + 1] + "]")
+                    except ValueError:
+                        # برش درون یک عنصر افتاده است؛ تا عبور از آن عنصر به عنصر خوانده می‌شود
+                        barrier = cut
+                    else:
+                        self.pos = cut + 2
+                        barrier = -1
+                        yield from values
+                        self.peek()
+                        continue
+            try:
+                result, end = scan(buf, self.pos)
+                match = separator(buf, end)
+            except (StopIteration, json.JSONDecodeError):
+                match = None
+            # عنصر یا جداکننده بعدی‌اش هنوز کامل در بافر نیست
+            if match is None or match.end() == len(buf):
+                consumed = self.pos
+                if self._fill():
+                    barrier -= consumed
+                    continue
+                if match is None:
+                    raise ValueError("آرایه JSON ناتمام است")
+            self.pos = match.end()
+            yield result
+            close = match.group(1)
+            if close == "]":
+                return
+            if close != ",":
+                raise ValueError(f"نویسه نامعتبر '{close}' در JSON")
+
+    def iter_object(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+    def skip(self):
+        """رد شدن از مقدار بعدی؛ آرایه‌ها عنصر به عنصر خوانده و دور ریخته می‌شوند"""
+        ch = self.peek()
+        if ch == "[":
+            for _ in self.iter_array():
+                pass
+        elif ch == "{":
+            for _ in self.iter_object():
+                self.skip()
+        else:
+            self.value()
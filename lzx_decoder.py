@@ -0,0 +1,325 @@
+"""رمزگشای LZX به سبک فایل‌های .xnb (پنجره ۶۴ کیلوبایتی، بلوک‌های Verbatim/Aligned/Uncompressed)."""
+
+MIN_MATCH = 2
+NUM_CHARS = 256
+BLOCKTYPE_VERBATIM = 1
+BLOCKTYPE_ALIGNED = 2
+BLOCKTYPE_UNCOMPRESSED = 3
+PRETREE_NUM_ELEMENTS = 20
+ALIGNED_NUM_ELEMENTS = 8
+NUM_PRIMARY_LENGTHS = 7
+NUM_SECONDARY_LENGTHS = 249
+MAX_CODE_BITS = 16
+
+_POSITION_SLOTS = {15: 30, 16: 32, 17: 34, 18: 36, 19: 38, 20: 42, 21: 50}
+
+_EXTRA_BITS = []
+_j = 0
+for _i in range(0, 52, 2):
+    _EXTRA_BITS += [_j, _j]
+    if _i != 0 and _j < 17:
+        _j += 1
+_POSITION_BASE = []
+_j = 0
+for _bits in _EXTRA_BITS:
+    _POSITION_BASE.append(_j)
+    _j += 1 << _bits
+del _i, _j, _bits
+
+
+class _BitReader:
+    """خواندن بیت‌ها از کلمات ۱۶ بیتی little-endian، با پرارزش‌ترین بیت در ابتدا"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.buffer = 0
+        self.bits_left = 0
+
+    def ensure(self, count):
+        while self.bits_left < count:
+            lo = self.data[self.pos] if self.pos < len(self.data) else 0
+            hi = self.data[self.pos + 1] if self.pos + 1 < len(self.data) else 0
+            self.pos += 2
+            self.buffer = (self.buffer << 16) | (hi << 8) | lo
+            self.bits_left += 16
+
+    def peek(self, count):
+        self.ensure(count)
+        return (self.buffer >> (self.bits_left - count)) & ((1 << count) - 1)
+
+    def remove(self, count):
+        self.bits_left -= count
+        self.buffer &= (1 << self.bits_left) - 1
+
+    def read(self, count):
+        if count == 0:
+            return 0
+        value = self.peek(count)
+        self.remove(count)
+        return value
+
+    def align(self):
+        """کنار گذاشتن ۱ تا ۱۶ بیت برای رسیدن به مرز بایت (پیش از بلوک فشرده‌نشده)"""
+        if self.bits_left == 0:
+            self.pos += 2
+        self.buffer = 0
+        self.bits_left = 0
+
+    def read_bytes(self, count):
+        chunk = self.data[self.pos:self.pos + count]
+        if len(chunk) != count:
+            raise ValueError("داده LZX ناقص است")
+        self.pos += count
+        return chunk
+
+
+def _make_decode_table(lengths):
+    """
+    جدول جستجوی کامل کد هافمن کانونی به پهنای بلندترین کد؛ هر خانه (نماد << 5) | طول است.
+    جدول کامل ۱۶ بیتی برای هر پیش‌درخت چند میلی‌ثانیه در هر بلوک هزینه داشت.
+
+    Returns:
+        tuple[list[int], int]: (جدول، تعداد بیت‌های نگاه پیش‌رو)
+    """
+    table_bits = max(max(lengths, default=0), 1)
+    if table_bits > MAX_CODE_BITS:
+        raise ValueError("جدول هافمن LZX نامعتبر است")
+    table = [0] * (1 << table_bits)
+    code = 0
+    code_length = 1
+    for length, symbol in sorted((length, symbol) for symbol, length in enumerate(lengths) if length):
+        code <<= length - code_length
+        code_length = length
+        span = 1 << (table_bits - length)
+        start = code * span
+        if start + span > len(table):
+            raise ValueError("جدول هافمن LZX نامعتبر است")
+        table[start:start + span] = [(symbol << 5) | length] * span
+        code += 1
+    return table, table_bits
+
+
+def _read_symbol(bits, decode_table):
+    # همان peek و remove، باز شده چون برای هر نماد اجرا می‌شود
+    table, table_bits = decode_table
+    if bits.bits_left < table_bits:
+        bits.ensure(table_bits)
+    entry = table[(bits.buffer >> (bits.bits_left - table_bits)) & ((1 << table_bits) - 1)]
+    length = entry & 31
+    if length == 0:
+        raise ValueError("نماد هافمن LZX نامعتبر است")
+    bits.bits_left -= length
+    bits.buffer &= (1 << bits.bits_left) - 1
+    return entry >> 5
+
+
+class LzxDecoder:
+    """حالت رمزگشای LZX که بین فریم‌های پشت‌سرهم یک فایل حفظ می‌شود"""
+
+    def __init__(self, window_bits=16):
+        if window_bits not in _POSITION_SLOTS:
+            raise ValueError(f"اندازه پنجره LZX پشتیبانی نمی‌شود: {window_bits}")
+        self.window_size = 1 << window_bits
+        self.window = bytearray(self.window_size)
+        self.window_posn = 0
+        self.main_elements = NUM_CHARS + (_POSITION_SLOTS[window_bits] << 3)
+        self.maintree_len = [0] * self.main_elements
+        self.length_len = [0] * (NUM_SECONDARY_LENGTHS + 1)
+        self.maintree_table = None
+        self.length_table = None
+        self.aligned_table = None
+        self.r0 = self.r1 = self.r2 = 1
+        self.header_read = False
+        self.block_type = 0
+        self.block_length = 0
+        self.block_remaining = 0
+        self.intel_filesize = 0
+        self.intel_curpos = 0
+        self.intel_started = False
+        self.frames_read = 0
+
+    def _read_lengths(self, bits, lengths, first, last):
+        pretree = _make_decode_table([bits.read(4) for _ in range(PRETREE_NUM_ELEMENTS)])
+        x = first
+        while x < last:
+            z = _read_symbol(bits, pretree)
+            if z == 17:
+                run = bits.read(4) + 4
+                lengths[x:x + run] = [0] * run
+                x += run
+            elif z == 18:
+                run = bits.read(5) + 20
+                lengths[x:x + run] = [0] * run
+                x += run
+            elif z == 19:
+                run = bits.read(1) + 4
+                z = (lengths[x] - _read_symbol(bits, pretree)) % 17
+                lengths[x:x + run] = [z] * run
+                x += run
+            else:
+                lengths[x] = (lengths[x] - z) % 17
+                x += 1
+
+    def _read_block_header(self, bits):
+        if self.block_type == BLOCKTYPE_UNCOMPRESSED:
+            if self.block_length & 1:
+                bits.pos += 1
+            bits.buffer = 0
+            bits.bits_left = 0
+
+        self.block_type = bits.read(3)
+        self.block_length = self.block_remaining = (bits.read(16) << 8) | bits.read(8)
+
+        if self.block_type == BLOCKTYPE_ALIGNED:
+            self.aligned_table = _make_decode_table([bits.read(3) for _ in range(ALIGNED_NUM_ELEMENTS)])
+
+        if self.block_type in (BLOCKTYPE_VERBATIM, BLOCKTYPE_ALIGNED):
+            self._read_lengths(bits, self.maintree_len, 0, NUM_CHARS)
+            self._read_lengths(bits, self.maintree_len, NUM_CHARS, self.main_elements)
+            del self.maintree_len[self.main_elements:]
+            self.maintree_table = _make_decode_table(self.maintree_len)
+            if self.maintree_len[0xE8] != 0:
+                self.intel_started = True
+            self._read_lengths(bits, self.length_len, 0, NUM_SECONDARY_LENGTHS)
+            del self.length_len[NUM_SECONDARY_LENGTHS + 1:]
+            self.length_table = _make_decode_table(self.length_len)
+        elif self.block_type == BLOCKTYPE_UNCOMPRESSED:
+            self.intel_started = True
+            bits.align()
+            header = bits.read_bytes(12)
+            self.r0 = int.from_bytes(header[0:4], "little")
+            self.r1 = int.from_bytes(header[4:8], "little")
+            self.r2 = int.from_bytes(header[8:12], "little")
+        else:
+            raise ValueError(f"نوع بلوک LZX نامعتبر است: {self.block_type}")
+
+    def _copy_match(self, match_offset, match_length):
+        window = self.window
+        dest = self.window_posn
+        if dest + match_length > self.window_size:
+            raise ValueError("تطابق LZX از انتهای پنجره عبور می‌کند")
+        src = dest - match_offset
+        if src < 0:
+            src += self.window_size
+            first = min(self.window_size - src, match_length)
+            window[dest:dest + first] = window[src:src + first]
+            dest += first
+            match_length -= first
+            src = 0
+        if match_length <= dest - src:
+            window[dest:dest + match_length] = window[src:src + match_length]
+        elif match_length:
+            # تطابق هم‌پوشان الگوی window[src:dest] را تکرار می‌کند (مثلاً ردیف‌های شفاف اطلس)
+            pattern = window[src:dest]
+            window[dest:dest + match_length] = (pattern * (match_length // len(pattern) + 1))[:match_length]
+        self.window_posn = dest + match_length
+
+    def _decode_run(self, bits, this_run):
+        window = self.window
+        aligned = self.block_type == BLOCKTYPE_ALIGNED
+        maintree = self.maintree_table
+        length_table = self.length_table
+        while this_run > 0:
+            main_element = _read_symbol(bits, maintree)
+            if main_element < NUM_CHARS:
+                window[self.window_posn] = main_element
+                self.window_posn += 1
+                this_run -= 1
+                continue
+
+            main_element -= NUM_CHARS
+            match_length = main_element & NUM_PRIMARY_LENGTHS
+            if match_length == NUM_PRIMARY_LENGTHS:
+                match_length += _read_symbol(bits, length_table)
+            match_length += MIN_MATCH
+
+            match_offset = main_element >> 3
+            if match_offset > 2:
+                extra = _EXTRA_BITS[match_offset]
+                if not aligned:
+                    match_offset = _POSITION_BASE[match_offset] - 2 + bits.read(extra)
+                else:
+                    match_offset = _POSITION_BASE[match_offset] - 2
+                    if extra > 3:
+                        match_offset += bits.read(extra - 3) << 3
+                        match_offset += _read_symbol(bits, self.aligned_table)
+                    elif extra == 3:
+                        match_offset += _read_symbol(bits, self.aligned_table)
+                    elif extra > 0:
+                        match_offset += bits.read(extra)
+                    else:
+                        match_offset = 1
+                self.r2, self.r1, self.r0 = self.r1, self.r0, match_offset
+            elif match_offset == 0:
+                match_offset = self.r0
+            elif match_offset == 1:
+                match_offset = self.r1
+                self.r1, self.r0 = self.r0, match_offset
+            else:
+                match_offset = self.r2
+                self.r2, self.r0 = self.r0, match_offset
+
+            self._copy_match(match_offset, match_length)
+            this_run -= match_length
+        return this_run
+
+    def decompress(self, data, out_length):
+        """رمزگشایی یک فریم فشرده و برگرداندن out_length بایت خروجی"""
+        bits = _BitReader(data)
+
+        if not self.header_read:
+            if bits.read(1):
+                self.intel_filesize = (bits.read(16) << 16) | bits.read(16)
+            self.header_read = True
+
+        togo = out_length
+        while togo > 0:
+            if self.block_remaining == 0:
+                self._read_block_header(bits)
+
+            this_run = min(self.block_remaining, togo)
+            togo -= this_run
+            self.block_remaining -= this_run
+            self.window_posn &= self.window_size - 1
+            if self.window_posn + this_run > self.window_size:
+                raise ValueError("فریم LZX از انتهای پنجره عبور می‌کند")
+
+            if self.block_type == BLOCKTYPE_UNCOMPRESSED:
+                self.window[self.window_posn:self.window_posn + this_run] = bits.read_bytes(this_run)
+                self.window_posn += this_run
+                continue
+
+            this_run = self._decode_run(bits, this_run)
+            if this_run < 0:
+                if -this_run > self.block_remaining:
+                    raise ValueError("اندازه بلوک LZX نامعتبر است")
+                self.block_remaining += this_run
+
+        start = (self.window_posn or self.window_size) - out_length
+        if start < 0:
+            raise ValueError("اندازه فریم LZX نامعتبر است")
+        output = bytearray(self.window[start:start + out_length])
+        self._intel_e8(output)
+        return output
+
+    def _intel_e8(self, data):
+        self.frames_read += 1
+        if not (self.intel_started and self.intel_filesize and self.frames_read <= 32768 and len(data) > 10):
+            self.intel_curpos += len(data)
+            return
+        curpos = self.intel_curpos
+        i = 0
+        end = len(data) - 10
+        while i < end:
+            if data[i] != 0xE8:
+                i += 1
+                curpos += 1
+                continue
+            abs_off = int.from_bytes(data[i + 1:i + 5], "little", signed=True)
+            if -curpos <= abs_off < self.intel_filesize:
+                rel_off = abs_off - curpos if abs_off >= 0 else abs_off + self.intel_filesize
+                data[i + 1:i + 5] = rel_off.to_bytes(4, "little", signed=True)
+            i += 5
+            curpos += 5
+        self.intel_curpos += len(data)
@@ -1,33 +1,71 @@
+import time
+STARTED = time.perf_counter()
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
-from font import MonoGameFont
-from ui import FontRendererWidget
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtCore import QTimer
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-
-    if len(sys.argv) < 2:
-        fnt_file, _ = QFileDialog.getOpenFileName(
-            None,
-            "Select MonoGame Font File",
-            os.path.expanduser("~"),
-            "Font Files (*.json *.xnb);;All Files (*)"
-        )
-        if not fnt_file:
-            sys.exit(0)
-    else:
-        fnt_file = sys.argv[1]
-
-    if not os.path.isfile(fnt_file):
+# مکث بین بررسی‌های حالت MGFONT_STARTUP_PROBE (میلی‌ثانیه)
+PROBE_INTERVAL_MS = 5
+
+
+def elapsed_ms():
+    return (time.perf_counter() - STARTED) * 1000
+
+
+def startup_probe(app, viewer):
+    """
+    MGFONT_STARTUP_PROBE=1: چاپ زمان نمایش پنجره و زمان آماده شدن فونت‌ها، سپس خروج
+    (برای benchmarks.bench_startup).
+    """
+    QTimer.singleShot(0, lambda: print(f"STARTUP window_shown {elapsed_ms():.1f}", flush=True))
+    timer = QTimer(viewer)
+    timer.setInterval(PROBE_INTERVAL_MS)
+
+    def check():
+        # بارگذاری پس‌زمینه تمام شده و همه کاشی‌های دیدنی ردیف‌ها روی صفحه رسم شده‌اند
+        if viewer.load_progress.isVisible() or viewer.render_timer.isActive() or not viewer.canvas.complete:
+            return
+        timer.stop()
+        print(f"STARTUP fonts_ready {elapsed_ms():.1f}", flush=True)
+        app.quit()
+
+    timer.timeout.connect(check)
+    timer.start()
+
+
+def main(argv):
+    app = QApplication(argv)
+    fnt_file = argv[1] if len(argv) >= 2 else None
+    if fnt_file and not os.path.isfile(fnt_file):
         QMessageBox.critical(None, "Error", f"فایل '{fnt_file}' وجود ندارد.")
-        sys.exit(1)
+        return 1
 
-    images_folder = os.path.dirname(fnt_file)
+    # پنجره پیش از بارگذاری هر فونت نمایش داده می‌شود؛ فونت‌ها در پس‌زمینه اضافه می‌شوند
+    from ui import FontRendererWidget
+    import session
     try:
-        font = MonoGameFont(fnt_file, images_folder)
-        viewer = FontRendererWidget(font)
+        viewer = FontRendererWidget()
+        state = None if fnt_file else session.load_session()
+        if state:
+            viewer.apply_session(state)
         viewer.show()
-        app.exec_()
+        if fnt_file:
+            viewer.load_paths([fnt_file])
+        elif state and state["fonts"]:
+            viewer.restore_session(state)
+        elif not os.environ.get("MGFONT_STARTUP_PROBE"):
+            QTimer.singleShot(0, viewer.open_font)
+        if os.environ.get("MGFONT_STARTUP_PROBE"):
+            startup_probe(app, viewer)
+        return app.exec_()
     except Exception as e:
-        QMessageBox.critical(None, "Error", f"خطا در بارگذاری فونت: {e}")
\ No newline at end of file
+        QMessageBox.critical(None, "Error", f"خطا در بارگذاری فونت: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    # نسخه فریزشده ویندوز بدون این، برای هر پردازه کارگر font_loader پنجره تازه‌ای باز می‌کند
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main(sys.argv))
@@ -3,7 +3,18 @@ import os
 import subprocess
 import sys
 import shutil
-from character import FontCharacter
+import tempfile
+from array import array
+from json_stream import CHUNK_SIZE, JsonStream
+from profiling import stage
+from xnb_reader import read_xnb_spritefont
+
+# با MGFONT_NO_STREAM_JSON=1 فایل‌های JSON مانند قبل یک‌جا با json.load خوانده می‌شوند
+STREAM_JSON = os.environ.get("MGFONT_NO_STREAM_JSON", "") not in ("1", "true", "yes")
+
+
+class UnsupportedJsonLayout(ValueError):
+    """ساختار فایل JSON فونت که خواندن جریانی پشتیبانی نمی‌کند؛ خواندن کامل با json.load جایش را می‌گیرد"""
 
 def get_base_path():
     """یافتن مسیر پایه برای xnbcli.exe و temp با پشتیبانی از PyInstaller"""
@@ -48,12 +59,13 @@ def extract_xnb_file(xnb_file, output_dir):
         # کپی فایل .xnb به پوشه packed
         xnb_filename = os.path.basename(xnb_file)
         packed_xnb = os.path.join(packed_dir, xnb_filename)
-        with open(xnb_file, 'rb') as src, open(packed_xnb, 'wb') as dst:
+        with stage("xnb_copy", "load"), open(xnb_file, 'rb') as src, open(packed_xnb, 'wb') as dst:
             dst.write(src.read())
 
         # اجرای دستور unpack
         cmd = [xnbcli_path, 'unpack', packed_dir, unpacked_dir]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        with stage("xnbcli", "load"):
+            result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             print(f"خروجی xnbcli: {result.stdout}")
             print(f"خطای xnbcli: {result.stderr}")
@@ -91,7 +103,7 @@ def extract_xnb_file(xnb_file, output_dir):
             
             # کپی PNG به دایرکتوری فایل اصلی
             dest_png = os.path.join(os.path.dirname(xnb_file), os.path.basename(png_file))
-            with open(png_file, 'rb') as src, open(dest_png, 'wb') as dst:
+            with stage("png_copy", "load"), open(png_file, 'rb') as src, open(dest_png, 'wb') as dst:
                 dst.write(src.read())
             print(f"کپی فایل PNG به: {dest_png}")
             png_file = dest_png
@@ -101,68 +113,246 @@ def extract_xnb_file(xnb_file, output_dir):
     except Exception as e:
         raise ValueError(f"خطا در استخراج فایل .xnb {xnb_file}: {e}")
 
-def parse_monogame_fnt(filename, chars, pages):
+def _find_existing_png(xnb_file):
+    """یافتن فایل PNG هم‌نام کنار فایل .xnb (در صورت وجود)"""
+    xnb_basename = os.path.splitext(os.path.basename(xnb_file))[0]
+    existing_png = os.path.join(os.path.dirname(xnb_file), f"{xnb_basename}.png")
+    return existing_png if os.path.isfile(existing_png) else None
+
+def read_xnb_content(xnb_file, pages):
+    """
+    خواندن فایل .xnb با خواننده داخلی و پر کردن pages.
+
+    اگر خواننده داخلی نتواند فایل را بخواند (مثلاً فرمت تصویر پشتیبانی‌نشده) و
+    xnbcli.exe موجود باشد، به روش قدیمی استخراج با xnbcli برمی‌گردد.
+
+    Args:
+        xnb_file (str): مسیر فایل .xnb
+        pages (dict): دیکشنری برای ذخیره نام فایل یا تصویر هر صفحه
+
+    Returns:
+        dict: بخش content فونت با همان ساختار JSON خروجی xnbcli
+    """
+    try:
+        with stage("xnb_read", "load"):
+            content, texture = read_xnb_spritefont(xnb_file)
+    except Exception as e:
+        try:
+            get_xnbcli_path()
+        except FileNotFoundError:
+            raise ValueError(f"خطا در خواندن فایل .xnb {xnb_file}: {e}")
+        print(f"خواننده داخلی XNB موفق نبود ({e})؛ استفاده از xnbcli")
+        return _read_xnb_content_with_xnbcli(xnb_file, pages)
+
+    existing_png = _find_existing_png(xnb_file)
+    if existing_png:
+        print(f"استفاده از فایل PNG موجود: {existing_png}")
+        pages[0] = os.path.basename(existing_png)
+    else:
+        pages[0] = texture
+    return content
+
+def _read_xnb_content_with_xnbcli(xnb_file, pages):
+    # هر استخراج پوشه موقت خودش را دارد تا چند فایل هم‌زمان استخراج شوند
+    temp_root = os.path.join(get_base_path(), 'App', 'temp')
+    os.makedirs(temp_root, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix='xnb_', dir=temp_root)
+    try:
+        json_file, temp_png = extract_xnb_file(xnb_file, temp_dir)
+        if temp_png:
+            pages[0] = os.path.basename(temp_png)
+        return load_json_content(json_file)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def load_json_content(json_file):
+    """
+    بخش content یک فایل JSON فونت (خروجی xnbcli) به صورت dict.
+
+    Raises:
+        ValueError: اگر فایل خوانده یا پردازش نشود
+    """
+    try:
+        with stage("json_parse", "load"), open(json_file, 'r', encoding='utf-8') as f:
+            font_data = json.load(f)
+    except Exception as e:
+        raise ValueError(f"خطا در پردازش فایل JSON {json_file}: {e}")
+    return font_data.get("content", {})
+
+def _expect_container(stream, opening, name):
+    if stream.peek() != opening:
+        kind = "شیء" if opening == "{" else "آرایه"
+        raise UnsupportedJsonLayout(f"{name} {kind} JSON نیست")
+
+
+def _stream_json_font(json_file, chars, chunk_size=CHUNK_SIZE):
+    """
+    خواندن جریانی glyphs، cropping و characterMap یک فایل JSON مستقیماً در ستون‌های array.
+
+    آرایه‌های بزرگ عنصر به عنصر خوانده می‌شوند و فهرست دیکشنری‌ها هرگز ساخته نمی‌شود.
+    chars فقط پس از خواندن و بررسی کامل فایل پر می‌شود.
+
+    Returns:
+        str: نام فایل تصویر فونت
+
+    Raises:
+        UnsupportedJsonLayout: اگر ساختار فایل با خروجی معمول xnbcli فرق دارد (مثلاً
+            characterMap رشته است یا مختصات گلیف عدد صحیح نیست)
+        ValueError: اگر فایل خوانده نشود یا JSON نامعتبر باشد
+    """
+    glyph_columns = crop_columns = None
+    ids = array('i')
+    texture = {}
+    horizontal_spacing = 0
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            stream = JsonStream(f, chunk_size)
+            _expect_container(stream, "{", "ریشه فایل")
+            for key in stream.iter_object():
+                if key != "content":
+                    stream.skip()
+                    continue
+                _expect_container(stream, "{", "content")
+                for content_key in stream.iter_object():
+                    if content_key == "glyphs":
+                        _expect_container(stream, "[", "glyphs")
+                        glyph_columns = [array('i') for _ in range(4)]
+                        x, y, width, height = glyph_columns
+                        try:
+                            for glyph in stream.iter_array():
+                                x.append(glyph.get('x', 0))
+                                y.append(glyph.get('y', 0))
+                                width.append(glyph.get('width', 0))
+                                height.append(glyph.get('height', 0))
+                        except (AttributeError, TypeError, OverflowError) as e:
+                            raise UnsupportedJsonLayout(f"glyphs: {e}") from e
+                    elif content_key == "cropping":
+                        _expect_container(stream, "[", "cropping")
+                        crop_columns = [array('i') for _ in range(2)]
+                        xoffset, yoffset = crop_columns
+                        try:
+                            for crop in stream.iter_array():
+                                xoffset.append(crop.get('x', 0))
+                                yoffset.append(crop.get('y', 0))
+                        except (AttributeError, TypeError, OverflowError) as e:
+                            raise UnsupportedJsonLayout(f"cropping: {e}") from e
+                    elif content_key == "characterMap":
+                        _expect_container(stream, "[", "characterMap")
+                        try:
+                            ids = array('i', (ord(char) for char in stream.iter_array()))
+                        except TypeError as e:
+                            raise UnsupportedJsonLayout(f"characterMap: {e}") from e
+                    elif content_key == "texture":
+                        texture = stream.value()
+                        if not isinstance(texture, dict):
+                            raise UnsupportedJsonLayout("texture شیء JSON نیست")
+                    elif content_key == "horizontalSpacing":
+                        horizontal_spacing = stream.value()
+                    else:
+                        stream.skip()
+    except UnsupportedJsonLayout:
+        raise
+    except (OSError, ValueError) as e:
+        raise ValueError(f"خطا در پردازش فایل JSON {json_file}: {e}") from e
+
+    if not glyph_columns or not glyph_columns[0] or not ids:
+        raise ValueError("فایل JSON فاقد داده‌های گلیف یا نگاشت کاراکتر است")
+    texture_file = texture.get("export")
+    if not texture_file:
+        raise ValueError("فایل JSON فاقد نام فایل تصویر است")
+
+    x, y, width, height = glyph_columns
+    xoffset, yoffset = crop_columns or (array('i'), array('i'))
+    glyph_count = len(x)
+    crop_count = len(xoffset)
+    count = min(len(ids), glyph_count)
+    if not len(chars) and len(set(ids[:count])) == count:
+        # حالت معمول (کدپوینت‌های یکتا): ستون‌ها یک‌جا به جدول داده می‌شوند
+        padding = array('i', [0]) * max(0, count - crop_count)
+        chars.load_columns({
+            "id": ids[:count],
+            "x": x[:count],
+            "y": y[:count],
+            "width": width[:count],
+            "height": height[:count],
+            "xoffset": xoffset[:count] + padding,
+            "yoffset": yoffset[:count] + padding,
+            "xadvance": array('i', [int(w + horizontal_spacing) for w in width[:count]]),
+            "page": array('i', [0]) * count,
+        })
+        return texture_file
+
+    for i, cid in enumerate(ids):
+        if i >= glyph_count:
+            continue
+        chars.add(
+            id=cid,
+            x=x[i],
+            y=y[i],
+            width=width[i],
+            height=height[i],
+            xoffset=xoffset[i] if i < crop_count else 0,
+            yoffset=yoffset[i] if i < crop_count else 0,
+            xadvance=int(width[i] + horizontal_spacing),
+            page=0
+        )
+    return texture_file
+
+def parse_monogame_fnt(filename, chars, pages, stream=None):
     """
     پردازش فایل فونت JSON یا .xnb تولیدشده توسط MonoGame.
     
     Args:
         filename (str): مسیر فایل JSON یا .xnb
-        chars (dict): دیکشنری برای ذخیره اشیاء FontCharacter
-        pages (dict): دیکشنری برای ذخیره نام فایل‌های تصویر
+        chars (GlyphTable): جدول ستونی برای ذخیره گلیف‌ها
+        pages (dict): دیکشنری برای ذخیره نام فایل‌های تصویر (یا تصویر رمزگشایی‌شده .xnb)
+        stream (bool): خواندن جریانی فایل JSON (پیش‌فرض: STREAM_JSON)
     """
-    temp_dir = os.path.join(get_base_path(), 'App', 'temp')
-    json_file = filename
-    temp_png = None
+    if stream is None:
+        stream = STREAM_JSON
+    if stream and not filename.endswith('.xnb'):
+        try:
+            with stage("json_parse", "load"):
+                pages[0] = _stream_json_font(filename, chars)
+            return
+        except UnsupportedJsonLayout as e:
+            # فقط ساختار غیرمعمول به json.load واگذار می‌شود؛ JSON نامعتبر یا خطای دیگر همین‌جا گزارش می‌شود
+            print(f"خواندن جریانی {filename} ممکن نبود ({e})؛ فایل یک‌جا با json.load خوانده می‌شود")
 
-    try:
-        if filename.endswith('.xnb'):
-            json_file, temp_png = extract_xnb_file(filename, temp_dir)
-            if temp_png:
-                pages[0] = os.path.basename(temp_png)
+    if filename.endswith('.xnb'):
+        content = read_xnb_content(filename, pages)
+    else:
+        content = load_json_content(filename)
 
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                font_data = json.load(f)
-        except Exception as e:
-            raise ValueError(f"خطا در پردازش فایل JSON {json_file}: {e}")
-
-        content = font_data.get("content", {})
-
-        if not content.get("glyphs") or not content.get("characterMap"):
-            raise ValueError("فایل JSON فاقد داده‌های گلیف یا نگاشت کاراکتر است")
-
-        if not filename.endswith('.xnb'):
-            texture_info = content.get("texture", {})
-            texture_file = texture_info.get("export")
-            if not texture_file:
-                raise ValueError("فایل JSON فاقد نام فایل تصویر است")
-            pages[0] = texture_file
-
-        glyphs_data = content.get("glyphs", [])
-        cropping_data = content.get("cropping", [])
-        character_map = content.get("characterMap", [])
-        horizontal_spacing = content.get("horizontalSpacing", 0)
-
-        for i, char in enumerate(character_map):
-            if i >= len(glyphs_data):
-                continue
-            glyph = glyphs_data[i]
-            crop = cropping_data[i] if i < len(cropping_data) else {}
-
-            c = FontCharacter(
-                id=ord(char),
-                x=glyph.get('x', 0),
-                y=glyph.get('y', 0),
-                width=glyph.get('width', 0),
-                height=glyph.get('height', 0),
-                xoffset=crop.get('x', 0),
-                yoffset=crop.get('y', 0),
-                xadvance=int(glyph.get('width', 0) + horizontal_spacing),
-                page=0
-            )
-            chars[c.id] = c
+    if not content.get("glyphs") or not content.get("characterMap"):
+        raise ValueError("فایل JSON فاقد داده‌های گلیف یا نگاشت کاراکتر است")
 
-    finally:
-        # پاک‌سازی پوشه temp فقط برای .xnb
-        if filename.endswith('.xnb'):
-            shutil.rmtree(temp_dir, ignore_errors=True)
\ No newline at end of file
+    if not filename.endswith('.xnb'):
+        texture_info = content.get("texture", {})
+        texture_file = texture_info.get("export")
+        if not texture_file:
+            raise ValueError("فایل JSON فاقد نام فایل تصویر است")
+        pages[0] = texture_file
+
+    glyphs_data = content.get("glyphs", [])
+    cropping_data = content.get("cropping", [])
+    character_map = content.get("characterMap", [])
+    horizontal_spacing = content.get("horizontalSpacing", 0)
+
+    for i, char in enumerate(character_map):
+        if i >= len(glyphs_data):
+            continue
+        glyph = glyphs_data[i]
+        crop = cropping_data[i] if i < len(cropping_data) else {}
+
+        chars.add(
+            id=ord(char),
+            x=glyph.get('x', 0),
+            y=glyph.get('y', 0),
+            width=glyph.get('width', 0),
+            height=glyph.get('height', 0),
+            xoffset=crop.get('x', 0),
+            yoffset=crop.get('y', 0),
+            xadvance=int(glyph.get('width', 0) + horizontal_spacing),
+            page=0
+        )
@@ -0,0 +1,142 @@
+"""
+اندازه‌گیری زمان مرحله‌های بارگذاری و رندر (بدون PyQt).
+
+هر مرحله با profiler.stage("نام") اندازه‌گیری می‌شود. وقتی اندازه‌گیری خاموش است
+stage یک context manager مشترک و بی‌کار برمی‌گرداند و هزینه‌اش ناچیز است. با
+MGFONT_PROFILE=1 از ابتدا روشن است و در برنامه از منوی View هم روشن می‌شود.
+
+برای هر مرحله زمان آخرین HISTORY اجرا نگه داشته می‌شود (هیستوگرام غلتان) و
+رویدادها با export_chrome_trace به فرمت Trace Event کروم (chrome://tracing یا
+Perfetto) نوشته می‌شوند.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# تعداد آخرین اندازه‌گیری‌های نگه‌داشته‌شده برای هر مرحله
+HISTORY = 512
+# حداکثر رویدادهای نگه‌داشته‌شده برای خروجی trace
+MAX_EVENTS = 100000
+# مرزهای بالای دسته‌های هیستوگرام (میلی‌ثانیه)؛ دسته آخر بیشتر از همه است
+BUCKETS_MS = (1, 2, 4, 8, 16, 33, 66, 133, 266, 533, 1000)
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "category", "start")
+
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.category, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """
+    جمع‌آوری زمان مرحله‌ها از همه نخ‌ها.
+
+    دسته (category) هر مرحله در trace دیده می‌شود؛ دو مرحله کلی "frame" (از درخواست
+    رندر تا نمایش) و "font_load" (باز کردن کامل یک فونت) زمان فریم و زمان بارگذاری‌اند.
+    """
+
+    def __init__(self, enabled=False, history=HISTORY, max_events=MAX_EVENTS):
+        self.enabled = enabled
+        self.history = history
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter_ns()
+        self.samples = {}
+        self.counts = {}
+        self.events = deque(maxlen=max_events)
+        self.thread_names = {}
+
+    def stage(self, name, category="render"):
+        """context manager اندازه‌گیری یک مرحله"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, category)
+
+    def record(self, name, category, start_ns, end_ns):
+        """ثبت مرحله‌ای که زمان شروع و پایانش (perf_counter_ns) جای دیگری گرفته شده است"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        duration_ms = (end_ns - start_ns) / 1e6
+        with self.lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.history)
+            samples.append(duration_ms)
+            self.counts[name] = self.counts.get(name, 0) + 1
+            self.events.append((name, category, start_ns, end_ns, thread.ident))
+            self.thread_names.setdefault(thread.ident, thread.name)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+
+    def reset(self):
+        with self.lock:
+            self.origin = time.perf_counter_ns()
+            self.samples.clear()
+            self.counts.clear()
+            self.events.clear()
+
+    def histogram(self, name):
+        """تعداد اندازه‌گیری‌های اخیر name در هر دسته BUCKETS_MS (به علاوه دسته آخر)"""
+        with self.lock:
+            samples = list(self.samples.get(name, ()))
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        for value in samples:
+            for i, bound in enumerate(BUCKETS_MS):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def summary(self):
+        """
+        Returns:
+            list: برای هر مرحله (نام، تعداد کل، آخرین، میانگین، میانه، p95، بیشینه) به میلی‌ثانیه
+        """
+        with self.lock:
+            items = [(name, self.counts[name], list(samples)) for name, samples in self.samples.items()]
+        rows = []
+        for name, count, samples in sorted(items):
+            ordered = sorted(samples)
+            rows.append((name, count, samples[-1], sum(samples) / len(samples),
+                         ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                         ordered[-1]))
+        return rows
+
+    def export_chrome_trace(self, path):
+        """نوشتن رویدادها با فرمت Trace Event (JSON) برای chrome://tracing یا Perfetto"""
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+            thread_names = dict(self.thread_names)
+            origin = self.origin
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in thread_names.items()]
+        for name, category, start_ns, end_ns, tid in events:
+            trace.append({"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                          "ts": (start_ns - origin) / 1000, "dur": (end_ns - start_ns) / 1000})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+profiler = Profiler(enabled=os.environ.get("MGFONT_PROFILE", "") in ("1", "true", "yes"))
+stage = profiler.stage
@@ -1,8 +1,21 @@
 import json
 import os
 from PyQt5.QtWidgets import QAction
+from session import config_path
 
-recent_files_file = 'recent_files.json'
+# فایل فهرست اخیر در پوشه تنظیمات است، نه پوشه جاری (که به محل اجرای برنامه بستگی دارد)
+RECENT_FILES_FILE = 'recent_files.json'
+# محل قدیمی فایل؛ اگر فایل جدید هنوز ساخته نشده از آن خوانده می‌شود
+legacy_recent_files_file = 'recent_files.json'
+
+def recent_files_path():
+    """مسیر فایل فهرست اخیر؛ هر بار ساخته می‌شود تا تغییر MGFONT_CONFIG_DIR پس از import هم دیده شود"""
+    return config_path(RECENT_FILES_FILE)
+
+def _recent_files_source(path):
+    if not os.path.exists(path) and os.path.exists(legacy_recent_files_file):
+        return legacy_recent_files_file
+    return path
 
 def save_recent_file(file_path):
     """ذخیره فایل اخیر در JSON"""
@@ -10,9 +23,11 @@ def save_recent_file(file_path):
         print(f"خطا: فایل {file_path} وجود ندارد.")
         return
     
-    if os.path.exists(recent_files_file):
+    path = recent_files_path()
+    source = _recent_files_source(path)
+    if os.path.exists(source):
         try:
-            with open(recent_files_file, 'r') as f:
+            with open(source, 'r') as f:
                 recent_files = json.load(f)
         except json.JSONDecodeError:
             recent_files = []
@@ -24,16 +39,18 @@ def save_recent_file(file_path):
     recent_files.insert(0, file_entry)
 
     try:
-        with open(recent_files_file, 'w') as f:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
             json.dump(recent_files[:5], f, indent=4)
     except Exception as e:
         print(f"خطا در ذخیره فایل‌های اخیر: {e}")
 
 def load_recent_files():
     """بارگذاری فایل‌های اخیر از JSON"""
-    if os.path.exists(recent_files_file):
+    source = _recent_files_source(recent_files_path())
+    if os.path.exists(source):
         try:
-            with open(recent_files_file, 'r') as f:
+            with open(source, 'r') as f:
                 recent_files = json.load(f)
             return [entry['file_path'] for entry in recent_files if os.path.exists(entry['file_path'])]
         except json.JSONDecodeError:
@@ -46,4 +63,4 @@ def populate_recent_menu(recent_menu, load_callback):
     for fnt_file in load_recent_files():
         action = QAction(fnt_file, recent_menu)
         action.triggered.connect(lambda checked, file=fnt_file: load_callback(file))
-        recent_menu.addAction(action)
\ No newline at end of file
+        recent_menu.addAction(action)
\ No newline at end of file
@@ -0,0 +1,474 @@
+"""
+سرویس محلی رندر و اندازه‌گیری متن که فونت‌ها را در حافظه نگه می‌دارد (بدون PyQt).
+
+اسکریپت‌های ساخت به جای بارگذاری دوباره فونت در هر پردازه، درخواست‌ها را با HTTP روی
+localhost یا یک سوکت یونیکس می‌فرستند. فونت‌ها در اولین درخواست بارگذاری و با LRU
+کنار گذاشته می‌شوند؛ اگر فایل فونت یا تصویر آن تغییر کند فقط بخش تغییرکرده دوباره بارگذاری می‌شود.
+
+    python render_server.py --port 8765
+    python render_server.py --socket /tmp/mgfont.sock --out-dir build/renders
+
+درخواست‌ها (POST با Content-Type: application/json):
+    /measure  {"font": مسیر, "text": متن} یا {"font", "texts": [...]}  -> {"size"} یا {"sizes"}
+    /render   {"font", "text", "background"?, "highlight"?, "out"?}     -> PNG (یا JSON اگر out داده شود)
+    /batch    {"requests": [{"op": "measure" | "render", ...}, ...]}   -> {"results": [...]}
+    GET /stats                                                         -> آمار فونت‌ها و درخواست‌ها
+
+out نام یک فایل نسبی داخل پوشه --out-dir است و بدون --out-dir پذیرفته نمی‌شود، تا
+هیچ درخواستی (مثلاً از یک صفحه وب روی همین سیستم) نتواند فایل دلخواهی را بازنویسی
+کند. درخواست‌های غیر JSON رد می‌شوند؛ مرورگر بدون اجازه CORS نمی‌تواند چنین
+درخواستی را به سرور محلی بفرستد. درخواست HTTP با سرآیند Host غیر از localhost (یا
+نام‌های --allow-host) هم رد می‌شود تا صفحه وب با DNS rebinding نتواند از نام دامنه
+خودش به سرور برسد. با --fonts-root فقط فونت‌های داخل آن پوشه بارگذاری می‌شوند.
+"""
+import argparse
+import base64
+import http.client
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from font import MonoGameFont, RENDER_ENGINES
+from texture_registry import TextureRegistry
+
+DEFAULT_PORT = 8765
+# حداکثر تعداد فونت‌های نگه‌داشته‌شده در حافظه
+MAX_FONTS = 32
+# سطح فشرده‌سازی PNG پاسخ‌ها؛ کم برای تأخیر کمتر
+PNG_COMPRESS_LEVEL = 1
+DEFAULT_BACKGROUND = (50, 50, 50, 255)
+# سقف اندازه بدنه هر درخواست (بایت)
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# نام‌هایی که سرآیند Host درخواست‌های HTTP می‌تواند داشته باشد (بدون پورت)
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "[::1]")
+
+
+class ResidentFont:
+    __slots__ = ("font", "lock")
+
+    def __init__(self, font):
+        self.font = font
+        # MonoGameFont (کش گلیف‌ها) امن برای چند نخ نیست؛ هر فونت قفل خودش را دارد و
+        # فونت کنارگذاشته‌شده هم زیر همین قفل بسته می‌شود
+        self.lock = threading.Lock()
+
+
+class FontPool:
+    """
+    فونت‌های بارگذاری‌شده به ترتیب LRU؛ هر مسیر فقط یک بار بارگذاری می‌شود حتی اگر
+    چند درخواست هم‌زمان آن را بخواهند. فونت کنارگذاشته‌شده بسته می‌شود تا صفحه‌هایش از
+    textures رها شوند.
+    """
+
+    def __init__(self, max_fonts=MAX_FONTS, render_engine="pil", textures=None, fonts_root=None):
+        self.max_fonts = max_fonts
+        self.render_engine = render_engine
+        self.textures = textures or TextureRegistry()
+        # اگر داده شود فقط فونت‌های داخل این پوشه بارگذاری می‌شوند
+        self.fonts_root = os.path.realpath(fonts_root) if fonts_root else None
+        self.fonts = OrderedDict()
+        self.lock = threading.Lock()
+        self.load_locks = {}
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def get(self, path):
+        """ResidentFont مسیر path؛ در صورت نبودن بارگذاری و در صورت تغییر فایل‌هایش به‌روز می‌شود"""
+        if not isinstance(path, str):
+            raise ValueError(f"font باید مسیر فایل باشد: {path!r}")
+        real_path = os.path.realpath(path)
+        if self.fonts_root and os.path.commonpath([self.fonts_root, real_path]) != self.fonts_root:
+            raise ValueError(f"فونت بیرون از پوشه فونت‌ها است: {path}")
+        with self.lock:
+            entry = self.fonts.get(real_path)
+            if entry is not None:
+                self.fonts.move_to_end(real_path)
+        if entry is not None:
+            with entry.lock:
+                if entry.font.changed_sources():
+                    entry.font.reload()
+                    with self.lock:
+                        self.reloads += 1
+            return entry
+        with self.lock:
+            load_lock = self.load_locks.setdefault(real_path, threading.Lock())
+        evicted = []
+        with load_lock:
+            try:
+                with self.lock:
+                    entry = self.fonts.get(real_path)
+                    if entry is not None:
+                        return entry
+                font = MonoGameFont(real_path, os.path.dirname(real_path), render_engine=self.render_engine,
+                                    textures=self.textures)
+                entry = ResidentFont(font)
+                with self.lock:
+                    self.fonts[real_path] = entry
+                    self.fonts.move_to_end(real_path)
+                    self.loads += 1
+                    while len(self.fonts) > self.max_fonts:
+                        evicted.append(self.fonts.popitem(last=False)[1])
+                        self.evictions += 1
+            finally:
+                # قفل فقط هنگام بارگذاری لازم است؛ منتظرهای همین قفل پس از آن فونت را در fonts می‌بینند
+                with self.lock:
+                    if self.load_locks.get(real_path) is load_lock:
+                        del self.load_locks[real_path]
+        for old in evicted:
+            with old.lock:
+                old.font.close()
+        return entry
+
+    @contextmanager
+    def use(self, path):
+        """فونت مسیر path با قفل آن؛ اگر فونت میان get و قفل کنار گذاشته شده باشد دوباره گرفته می‌شود"""
+        while True:
+            entry = self.get(path)
+            with entry.lock:
+                if not entry.font.closed:
+                    yield entry.font
+                    return
+
+    def stats(self):
+        with self.lock:
+            return {"fonts": list(self.fonts), "loads": self.loads, "reloads": self.reloads, "evictions": self.evictions,
+                    "textures": self.textures.stats_text()}
+
+
+def parse_color(value, default):
+    if value is None:
+        return default
+    color = tuple(int(c) for c in value)
+    if len(color) not in (3, 4):
+        raise ValueError("رنگ باید [R, G, B] یا [R, G, B, A] باشد")
+    return color + (255,) * (4 - len(color))
+
+
+class RenderService:
+    """منطق درخواست‌ها، جدا از HTTP تا در یک پردازه دیگر هم مستقیماً قابل استفاده باشد"""
+
+    def __init__(self, pool, out_dir=None):
+        self.pool = pool
+        self.out_dir = os.path.realpath(out_dir) if out_dir else None
+        self.started = time.time()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def count(self, n=1):
+        with self.lock:
+            self.requests += n
+
+    def measure(self, request):
+        with self.pool.use(request["font"]) as font:
+            if "texts" in request:
+                widths, heights = font.measure_many(request["texts"])
+                return {"sizes": [[int(w), int(h)] for w, h in zip(widths, heights)]}
+            return {"size": list(font.measure_text(request["text"]))}
+
+    def render(self, request):
+        """تصویر PIL رندرشده برای یک درخواست render"""
+        background = parse_color(request.get("background"), DEFAULT_BACKGROUND)
+        highlight = parse_color(request.get("highlight"), None) if request.get("highlight") else None
+        with self.pool.use(request["font"]) as font:
+            return font.render_text(request["text"], background_color=background, highlight_color=highlight)
+
+    def out_path(self, name):
+        """مسیر فایل خروجی out داخل out_dir؛ مسیر مطلق یا بیرون از پوشه پذیرفته نمی‌شود"""
+        if self.out_dir is None:
+            raise ValueError("ذخیره خروجی روی دیسک غیرفعال است (سرور را با --out-dir اجرا کنید)")
+        if not isinstance(name, str) or os.path.isabs(name):
+            raise ValueError(f"out باید نام نسبی داخل پوشه خروجی باشد: {name}")
+        path = os.path.realpath(os.path.join(self.out_dir, name))
+        if os.path.commonpath([self.out_dir, path]) != self.out_dir or path == self.out_dir:
+            raise ValueError(f"out بیرون از پوشه خروجی است: {name}")
+        if os.path.splitext(path)[1].lower() != ".png":
+            raise ValueError(f"out باید فایل .png باشد: {name}")
+        return path
+
+    def render_result(self, request):
+        """نتیجه JSON یک render: ذخیره در out (داخل out_dir) یا PNG با base64"""
+        path = self.out_path(request["out"]) if request.get("out") else None
+        img = self.render(request)
+        result = {"size": [img.width, img.height]}
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            img.save(path, compress_level=PNG_COMPRESS_LEVEL)
+            result["out"] = request["out"]
+        else:
+            result["png"] = base64.b64encode(encode_png(img)).decode("ascii")
+        return result
+
+    def batch(self, request):
+        results = []
+        for item in request["requests"]:
+            try:
+                if item.get("op") == "measure":
+                    results.append(self.measure(item))
+                elif item.get("op") == "render":
+                    results.append(self.render_result(item))
+                else:
+                    results.append({"error": f"عملیات نامعتبر: {item.get('op')}"})
+            except Exception as e:
+                results.append({"error": str(e)})
+        return {"results": results}
+
+    def stats(self):
+        stats = self.pool.stats()
+        stats.update({"requests": self.requests, "uptime": round(time.time() - self.started, 1)})
+        return stats
+
+
+def encode_png(img):
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    # اتصال‌های keep-alive تا هزینه اتصال در هر درخواست پرداخت نشود
+    protocol_version = "HTTP/1.1"
+    # سرآیندها و بدنه جدا نوشته می‌شوند؛ بدون این، Nagle و ACK تأخیری هر پاسخ را ~40ms کند می‌کنند
+    disable_nagle_algorithm = True
+
+    def send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, data):
+        self.send_body(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def host_allowed(self):
+        """آیا سرآیند Host یکی از server.allowed_hosts است (None یعنی بدون بررسی، مثل سوکت یونیکس)"""
+        allowed = self.server.allowed_hosts
+        if allowed is None:
+            return True
+        host = self.headers.get("Host", "").strip().lower()
+        if host.startswith("["):
+            host = host[:host.find("]") + 1]
+        else:
+            host = host.split(":")[0]
+        return host in allowed
+
+    def check_host(self):
+        if self.host_allowed():
+            return True
+        self.close_connection = True
+        self.send_json(403, {"error": f"سرآیند Host پذیرفته نیست: {self.headers.get('Host', '')}"})
+        return False
+
+    def do_GET(self):
+        if not self.check_host():
+            return
+        if self.path == "/stats":
+            self.send_json(200, self.server.service.stats())
+        else:
+            self.send_json(404, {"error": f"مسیر نامعتبر: {self.path}"})
+
+    def read_request(self):
+        """بدنه JSON درخواست، یا None اگر درخواست رد و پاسخ خطا فرستاده شده باشد"""
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        length = self.headers.get("Content-Length")
+        error = None
+        if content_type != "application/json":
+            error = (415, "فقط درخواست با Content-Type: application/json پذیرفته می‌شود")
+        elif length is None or not length.isdigit():
+            error = (411, "Content-Length لازم است")
+        elif int(length) > MAX_BODY_BYTES:
+            error = (413, f"بدنه درخواست بیشتر از {MAX_BODY_BYTES} بایت است")
+        if error:
+            # بدنه خوانده نشده است؛ اتصال پس از پاسخ بسته می‌شود
+            self.close_connection = True
+            self.send_json(error[0], {"error": error[1]})
+            return None
+        request = json.loads(self.rfile.read(int(length)) or b"{}")
+        if not isinstance(request, dict):
+            raise ValueError("بدنه درخواست باید یک شیء JSON باشد")
+        return request
+
+    def do_POST(self):
+        service = self.server.service
+        if not self.check_host():
+            return
+        try:
+            request = self.read_request()
+            if request is None:
+                return
+            if self.path == "/measure":
+                service.count()
+                self.send_json(200, service.measure(request))
+            elif self.path == "/render":
+                service.count()
+                if request.get("out"):
+                    self.send_json(200, service.render_result(request))
+                else:
+                    self.send_body(200, encode_png(service.render(request)), "image/png")
+            elif self.path == "/batch":
+                service.count(len(request.get("requests", ())))
+                self.send_json(200, service.batch(request))
+            else:
+                self.send_json(404, {"error": f"مسیر نامعتبر: {self.path}"})
+        except (KeyError, ValueError, TypeError, OSError) as e:
+            self.send_json(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def address_string(self):
+        # روی سوکت یونیکس client_address رشته خالی است
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RenderHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose=False, allowed_hosts=LOCAL_HOSTS):
+        super().__init__(address, RenderRequestHandler)
+        self.service = service
+        self.verbose = verbose
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+
+
+# سوکت یونیکس روی ویندوز در دسترس نیست؛ آنجا فقط HTTP روی localhost استفاده می‌شود
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixRenderRequestHandler(RenderRequestHandler):
+        # TCP_NODELAY روی سوکت یونیکس معنی ندارد
+        disable_nagle_algorithm = False
+
+    class RenderUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, path, service, verbose=False):
+            if os.path.exists(path):
+                os.unlink(path)
+            super().__init__(path, _UnixRenderRequestHandler)
+            self.service = service
+            self.verbose = verbose
+            # فقط پردازه‌های همین سیستم با دسترسی به فایل سوکت وصل می‌شوند؛ مرورگر راهی به آن ندارد
+            self.allowed_hosts = None
+else:
+    RenderUnixServer = None
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class RenderClient:
+    """
+    کلاینت ساده با یک اتصال keep-alive (برای هر نخ یک نمونه بسازید).
+
+        client = RenderClient(port=8765)   # یا RenderClient(socket_path="/tmp/mgfont.sock")
+        client.measure("fonts/Main.xnb", "Hello")
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, socket_path=None, timeout=60):
+        if socket_path:
+            self.connection = _UnixHTTPConnection(socket_path, timeout=timeout)
+        else:
+            self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, path, data=None):
+        """(وضعیت HTTP، نوع محتوا، بدنه)"""
+        if data is None:
+            self.connection.request("GET", path)
+        else:
+            body = json.dumps(data).encode("utf-8")
+            self.connection.request("POST", path, body, {"Content-Type": "application/json"})
+        response = self.connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+
+    def call(self, path, data=None):
+        status, _, body = self.request(path, data)
+        result = json.loads(body)
+        if status != 200:
+            raise RuntimeError(result.get("error", f"HTTP {status}"))
+        return result
+
+    def measure(self, font, text):
+        return tuple(self.call("/measure", {"font": font, "text": text})["size"])
+
+    def measure_many(self, font, texts):
+        return [tuple(size) for size in self.call("/measure", {"font": font, "texts": list(texts)})["sizes"]]
+
+    def render_png(self, font, text, **options):
+        status, _, body = self.request("/render", dict(options, font=font, text=text))
+        if status != 200:
+            raise RuntimeError(json.loads(body).get("error", f"HTTP {status}"))
+        return body
+
+    def batch(self, requests):
+        return self.call("/batch", {"requests": list(requests)})["results"]
+
+    def stats(self):
+        return self.call("/stats")
+
+    def close(self):
+        self.connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="سرویس محلی رندر و اندازه‌گیری متن با فونت‌های MonoGame")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="گوش دادن روی این سوکت یونیکس به جای TCP")
+    parser.add_argument("--max-fonts", type=int, default=MAX_FONTS)
+    parser.add_argument("--engine", choices=RENDER_ENGINES, default="pil")
+    parser.add_argument("--preload", nargs="*", default=[], help="فونت‌هایی که پیش از شروع بارگذاری می‌شوند")
+    parser.add_argument("--out-dir", help="پوشه‌ای که out درخواست‌های render داخل آن نوشته می‌شود (بدون آن out غیرفعال است)")
+    parser.add_argument("--fonts-root", help="فقط فونت‌های داخل این پوشه بارگذاری می‌شوند")
+    parser.add_argument("--allow-host", action="append", default=[],
+                        help="نام دیگری که سرآیند Host درخواست‌ها می‌تواند داشته باشد (علاوه بر localhost)")
+    parser.add_argument("--verbose", action="store_true", help="چاپ هر درخواست")
+    args = parser.parse_args(argv)
+
+    service = RenderService(FontPool(args.max_fonts, args.engine, fonts_root=args.fonts_root), args.out_dir)
+    for path in args.preload:
+        service.pool.get(path)
+
+    if args.socket:
+        if RenderUnixServer is None:
+            print("سوکت یونیکس در این سیستم پشتیبانی نمی‌شود؛ از --port استفاده کنید")
+            return 1
+        server = RenderUnixServer(args.socket, service, args.verbose)
+        print(f"سرویس رندر روی سوکت {args.socket}")
+    else:
+        if args.host not in ("127.0.0.1", "localhost", "::1"):
+            print(f"هشدار: سرویس بدون احراز هویت روی {args.host} از بیرون این سیستم در دسترس است")
+        allowed_hosts = LOCAL_HOSTS + tuple(args.allow_host)
+        if args.host not in ("127.0.0.1", "localhost", "::1", "0.0.0.0", "::"):
+            allowed_hosts += (f"[{args.host}]" if ":" in args.host else args.host,)
+        server = RenderHTTPServer((args.host, args.port), service, args.verbose, allowed_hosts)
+        print(f"سرویس رندر روی http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
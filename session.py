@@ -0,0 +1,75 @@
+"""
+ذخیره و بازیابی جلسه نمایشگر (فونت‌های باز، متن هر ردیف، زوم و رنگ پس‌زمینه).
+
+فایل جلسه فقط مسیر فونت‌ها را نگه می‌دارد؛ داده پردازش‌شده هر فونت در کش دیسکی
+font_cache است و هنگام بازیابی بدون پردازش دوباره JSON/.xnb و رمزگشایی PNG خوانده
+می‌شود. این ماژول عمداً به PyQt و PIL وابسته نیست تا شروع برنامه را کند نکند.
+"""
+import json
+import os
+
+SESSION_VERSION = 1
+SESSION_FILE = "session.json"
+# با MGFONT_NO_SESSION=1 جلسه نه بازیابی و نه ذخیره می‌شود
+SESSION_ENABLED = os.environ.get("MGFONT_NO_SESSION", "") not in ("1", "true", "yes")
+
+
+def get_config_dir():
+    """پوشه تنظیمات برنامه (قابل تغییر با MGFONT_CONFIG_DIR)"""
+    override = os.environ.get("MGFONT_CONFIG_DIR")
+    if override:
+        return override
+    base = os.environ.get("APPDATA") or os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "View-MonoGame-font")
+
+
+def config_path(name):
+    return os.path.join(get_config_dir(), name)
+
+
+def write_json(path, data):
+    """نوشتن JSON با جایگزینی اتمی تا بستن ناگهانی برنامه فایل نیمه‌کاره نگذارد"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(temp_path, path)
+
+
+def save_session(state):
+    """
+    ذخیره جلسه.
+
+    Args:
+        state (dict): {"fonts": [{"path", "text"}, ...], "zoom", "background", "smooth", "highlight_missing", "last_folder"}
+    """
+    if not SESSION_ENABLED:
+        return
+    try:
+        write_json(config_path(SESSION_FILE), dict(state, version=SESSION_VERSION))
+    except Exception as e:
+        print(f"خطا در ذخیره جلسه: {e}")
+
+
+def load_session():
+    """
+    جلسه ذخیره‌شده با حذف فونت‌هایی که دیگر وجود ندارند.
+
+    Returns:
+        dict | None: None اگر جلسه‌ای نیست، خراب است یا نسخه‌اش فرق دارد
+    """
+    if not SESSION_ENABLED:
+        return None
+    try:
+        with open(config_path(SESSION_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"فایل جلسه خراب است و نادیده گرفته شد: {e}")
+        return None
+    if not isinstance(state, dict) or state.get("version") != SESSION_VERSION:
+        return None
+    state["fonts"] = [entry for entry in state.get("fonts", [])
+                      if isinstance(entry, dict) and os.path.isfile(entry.get("path", ""))]
+    return state
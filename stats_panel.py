@@ -0,0 +1,97 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QFileDialog, QMessageBox
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtCore import QTimer
+from profiling import profiler, BUCKETS_MS
+
+# فاصله به‌روزرسانی پنل (میلی‌ثانیه)
+REFRESH_MS = 500
+# مرحله‌هایی که هیستوگرامشان در پنل کشیده می‌شود
+HISTOGRAM_STAGES = ("frame", "font_load")
+BAR_WIDTH = 30
+
+def format_histogram(name):
+    counts = profiler.histogram(name)
+    total = sum(counts)
+    if not total:
+        return []
+    labels = [f"<={bound} ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]} ms"]
+    peak = max(counts)
+    lines = [f"{name} (آخرین {total}):"]
+    for label, count in zip(labels, counts):
+        if count:
+            lines.append(f"  {label:>10s} {'#' * max(1, count * BAR_WIDTH // peak):{BAR_WIDTH}s} {count}")
+    return lines
+
+def format_summary():
+    rows = profiler.summary()
+    if not rows:
+        return "هنوز اندازه‌گیری‌ای ثبت نشده است."
+    lines = [f"{'مرحله':14s} {'تعداد':>7s} {'آخرین':>9s} {'میانگین':>9s} {'میانه':>9s} {'p95':>9s} {'بیشینه':>9s}"]
+    for name, count, last, mean, median, p95, peak in rows:
+        lines.append(f"{name:14s} {count:7d} {last:9.2f} {mean:9.2f} {median:9.2f} {p95:9.2f} {peak:9.2f}")
+    for name in HISTOGRAM_STAGES:
+        histogram = format_histogram(name)
+        if histogram:
+            lines.append("")
+            lines.extend(histogram)
+    return "\n".join(lines)
+
+class StatsPanel(QWidget):
+    """
+    پنل زنده زمان مرحله‌ها (میلی‌ثانیه) و هیستوگرام زمان فریم و بارگذاری فونت.
+
+    فقط وقتی دیده می‌شود به‌روز می‌شود؛ خروجی trace با دکمه Export Trace ذخیره می‌شود.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.text = QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.text.setMinimumHeight(160)
+        layout.addWidget(self.text)
+
+        buttons = QHBoxLayout()
+        reset_button = QPushButton("Reset", self)
+        reset_button.clicked.connect(self.reset)
+        export_button = QPushButton("Export Trace", self)
+        export_button.clicked.connect(self.export_trace)
+        buttons.addWidget(reset_button)
+        buttons.addWidget(export_button)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        text = format_summary()
+        if text != self.text.toPlainText():
+            self.text.setPlainText(text)
+
+    def reset(self):
+        profiler.reset()
+        self.refresh()
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Chrome Trace", "trace.json", "Trace Files (*.json)")
+        if not path:
+            return
+        try:
+            count = profiler.export_chrome_trace(path)
+            print(f"{count} رویداد در {path} ذخیره شد")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"خطا در ذخیره trace: {e}")
@@ -0,0 +1,31 @@
+"""
+تنظیمات مشترک آزمون‌ها.
+
+آزمون‌ها از ریشه مخزن اجرا می‌شوند (python -m pytest) و ماژول‌های ریشه مستقیماً وارد
+می‌شوند. کش دیسکی فونت‌ها و تنظیمات برنامه در پوشه موقت هر آزمون نوشته می‌شوند تا
+کش و جلسه کاربر دست نخورد.
+"""
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    monkeypatch.setenv("MGFONT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("MGFONT_CONFIG_DIR", str(tmp_path / "config"))
+
+
+@pytest.fixture(scope="session")
+def synthetic_font(tmp_path_factory):
+    """(مسیر JSON، پوشه) یک فونت مصنوعی ۵۰۰ گلیفی"""
+    from benchmarks.synthetic_font import generate_font
+
+    folder = tmp_path_factory.mktemp("font")
+    return generate_font(str(folder), 500), str(folder)
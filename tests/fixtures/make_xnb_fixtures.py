@@ -0,0 +1,550 @@
+"""
+ساخت فایل‌های نمونه .xnb برای آزمون‌های xnb_reader و lzx_decoder.
+
+ابزار XNA/MonoGame در این مخزن در دسترس نیست، پس فشرده‌ساز LZX و LZ4 کوچکی از روی
+مشخصات قالب‌ها اینجا نوشته شده است. فشرده‌ساز LZX همه بخش‌های رمزگشا را به کار
+می‌گیرد: بلوک‌های Verbatim و Aligned و Uncompressed (با طول فرد)، بلوک‌هایی که از
+مرز فریم می‌گذرند، درخت‌های هافمن واقعی با کدهای تکرار ۱۷ تا ۱۹ پیش‌درخت، فاصله‌های
+تکراری R0 تا R2، چرخش پنجره ۶۴ کیلوبایتی و ترجمه E8.
+
+spritefont_lz4_reference.xnb همان بدنه است که با ابزار مرجع lz4 (liblz4، کتابخانه‌ای که
+xnbcli هم به کار می‌برد) فشرده شده تا رمزگشای LZ4 با فشرده‌سازی جدا از این فایل هم آزموده شود.
+
+فایل‌های ساخته‌شده در مخزن ثبت شده‌اند (تصویر اطلس به فونت پیش‌فرض PIL وابسته است)؛
+ساخت دوباره از ریشه مخزن:
+    python -m tests.fixtures.make_xnb_fixtures
+"""
+import heapq
+import os
+import shutil
+import struct
+import subprocess
+import sys
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from lzx_decoder import _EXTRA_BITS, _POSITION_BASE  # noqa: E402
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+FRAME_SIZE = 0x8000
+WINDOW_SIZE = 1 << 16
+MAIN_ELEMENTS = 256 + 32 * 8
+MAX_MATCH = 257
+MIN_MATCH = 3
+CHAIN_DEPTH = 24
+
+# نویسه‌ها و چیدمان اطلس فونت نمونه
+CHARACTERS = [chr(c) for c in range(32, 127)] + ["ب", "پ", "€", "ß"]
+CELL_WIDTH = 8
+CELL_HEIGHT = 12
+ATLAS_SIZE = (128, 144)
+GLYPH_COLOR = (255, 200, 100, 255)
+# اندازه فایل در سرآیند ترجمه E8 (مقدار رایج فشرده‌سازهای LZX)
+E8_FILE_SIZE = 12000000
+
+
+# ---------------------------------------------------------------- XNB
+
+def _7bit(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _string(text):
+    data = text.encode("utf-8")
+    return _7bit(len(data)) + data
+
+
+def spritefont_payload(image, chars, glyphs, crops, line_spacing=10, spacing=1.0, kerning=(0, 5, 0), default="?"):
+    """بدنه فشرده‌نشده یک SpriteFont با بافت رنگی پیش‌ضرب‌شده، همان‌طور که MonoGame می‌نویسد"""
+    readers = [
+        "Microsoft.Xna.Framework.Content.SpriteFontReader, Microsoft.Xna.Framework.Graphics",
+        "Microsoft.Xna.Framework.Content.Texture2DReader, Microsoft.Xna.Framework.Graphics",
+        "Microsoft.Xna.Framework.Content.ListReader`1[[Microsoft.Xna.Framework.Rectangle, Microsoft.Xna.Framework]]",
+        "Microsoft.Xna.Framework.Content.RectangleReader",
+        "Microsoft.Xna.Framework.Content.ListReader`1[[System.Char, mscorlib]]",
+        "Microsoft.Xna.Framework.Content.CharReader",
+        "Microsoft.Xna.Framework.Content.ListReader`1[[Microsoft.Xna.Framework.Vector3, Microsoft.Xna.Framework]]",
+        "Microsoft.Xna.Framework.Content.Vector3Reader",
+    ]
+    payload = bytearray(_7bit(len(readers)))
+    for reader in readers:
+        payload += _string(reader) + struct.pack("<i", 0)
+    payload += _7bit(0) + _7bit(1) + _7bit(2)
+
+    pixels = image.convert("RGBa").tobytes()
+    payload += struct.pack("<iIII", 0, image.width, image.height, 1)
+    payload += struct.pack("<I", len(pixels)) + pixels
+    for rects in (glyphs, crops):
+        payload += _7bit(3) + struct.pack("<I", len(rects))
+        for rect in rects:
+            payload += struct.pack("<4i", *rect)
+    payload += _7bit(5) + struct.pack("<I", len(chars))
+    for char in chars:
+        payload += char.encode("utf-8")
+    payload += struct.pack("<if", line_spacing, spacing)
+    payload += _7bit(7) + struct.pack("<I", len(chars))
+    for index in range(len(chars)):
+        payload += struct.pack("<3f", *(kerning if index == 0 else (0, CELL_WIDTH - 1, 1)))
+    payload += b"\x01" + default.encode("utf-8")
+    return bytes(payload)
+
+
+def wrap_xnb(payload, flag=0, body=None):
+    """قرار دادن بدنه (فشرده با flag یا خام) پشت هدر XNB نسخه ۵ برای Windows"""
+    if not flag:
+        return b"XNBw\x05\x00" + struct.pack("<I", 10 + len(payload)) + payload
+    return b"XNBw\x05" + bytes([flag]) + struct.pack("<II", 14 + len(body), len(payload)) + body
+
+
+# ---------------------------------------------------------------- LZ4
+
+def lz4_compress(data):
+    """یک بلوک خام LZ4 با جستجوی ساده چهاربایتی"""
+    out = bytearray()
+    table = {}
+    pos = literal_start = 0
+    end = len(data)
+
+    def emit(literals, match_length, offset):
+        extra = match_length - 4 if match_length else 0
+        out.append((min(len(literals), 15) << 4) | min(extra, 15))
+        if len(literals) >= 15:
+            rest = len(literals) - 15
+            while rest >= 255:
+                out.append(255)
+                rest -= 255
+            out.append(rest)
+        out.extend(literals)
+        if match_length:
+            out.extend(struct.pack("<H", offset))
+            if extra >= 15:
+                rest = extra - 15
+                while rest >= 255:
+                    out.append(255)
+                    rest -= 255
+                out.append(rest)
+
+    # طبق قالب، ۱۲ بایت آخر همیشه به صورت لیترال می‌آیند
+    while pos < end - 12:
+        key = data[pos:pos + 4]
+        candidate = table.get(key)
+        table[key] = pos
+        if candidate is not None and pos - candidate < 0xFFFF:
+            length = 4
+            while pos + length < end - 5 and data[candidate + length] == data[pos + length]:
+                length += 1
+            emit(data[literal_start:pos], length, pos - candidate)
+            pos += length
+            literal_start = pos
+        else:
+            pos += 1
+    emit(data[literal_start:], 0, 0)
+    return bytes(out)
+
+
+def reference_lz4_block(data, level=1):
+    """
+    بلوک خام LZ4 ساخته‌شده با ابزار خط فرمان lz4 در سطح level (۱ پیش‌فرض است و از ۳ به بعد HC).
+
+    قاب LZ4 با یک بلوک ۴ مگابایتی مستقل و بدون checksum ساخته و بلوک خام از آن جدا می‌شود.
+    """
+    frame = subprocess.run(["lz4", "-c", f"-{level}", "-B7", "-BI", "--no-frame-crc"], input=data,
+                           stdout=subprocess.PIPE, check=True).stdout
+    magic, flags = struct.unpack_from("<IB", frame)
+    assert magic == 0x184D2204 and not flags & 0x1C, (hex(magic), flags)  # بدون checksum و اندازه محتوا
+    block_size = struct.unpack_from("<I", frame, 7)[0]
+    assert not block_size & 0x80000000, "بلوک فشرده‌نشده ذخیره شده است"
+    block = frame[11:11 + block_size]
+    assert frame[11 + block_size:] == b"\0\0\0\0", "قاب بیش از یک بلوک دارد"
+    return block
+
+
+# ---------------------------------------------------------------- LZX
+
+class _BitWriter:
+    """نوشتن بیت‌ها در کلمات ۱۶ بیتی little-endian، پرارزش‌ترین بیت اول"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.word = 0
+        self.count = 0
+
+    def write(self, value, bits):
+        for shift in range(bits - 1, -1, -1):
+            self.word = (self.word << 1) | ((value >> shift) & 1)
+            self.count += 1
+            if self.count == 16:
+                self.data += struct.pack("<H", self.word)
+                self.word = 0
+                self.count = 0
+
+    def align(self):
+        """پر کردن ۱ تا ۱۶ بیت تا مرز کلمه، مانند پیش از داده بلوک فشرده‌نشده"""
+        self.write(0, 16 - self.count)
+
+    def flush(self):
+        if self.count:
+            self.write(0, 16 - self.count)
+        data = bytes(self.data)
+        self.data = bytearray()
+        return data
+
+
+def _huffman_lengths(freqs, limit):
+    """طول کدهای هافمن با سقف limit بیت؛ نمادهای بی‌استفاده طول صفر دارند"""
+    freqs = list(freqs)
+    while True:
+        used = [symbol for symbol, freq in enumerate(freqs) if freq]
+        lengths = [0] * len(freqs)
+        if len(used) == 1:
+            lengths[used[0]] = 1
+        if len(used) <= 1:
+            return lengths
+        heap = [(freqs[symbol], symbol, (symbol,)) for symbol in used]
+        heapq.heapify(heap)
+        tiebreak = len(freqs)
+        while len(heap) > 1:
+            freq_a, _, symbols_a = heapq.heappop(heap)
+            freq_b, _, symbols_b = heapq.heappop(heap)
+            for symbol in symbols_a + symbols_b:
+                lengths[symbol] += 1
+            heapq.heappush(heap, (freq_a + freq_b, tiebreak, symbols_a + symbols_b))
+            tiebreak += 1
+        if max(lengths) <= limit:
+            return lengths
+        freqs = [(freq + 1) // 2 if freq else 0 for freq in freqs]
+
+
+def _canonical_codes(lengths):
+    """کدهای کانونی به همان ترتیبی که _make_decode_table می‌سازد"""
+    codes = {}
+    code = 0
+    for bit_length in range(1, 17):
+        for symbol, length in enumerate(lengths):
+            if length == bit_length:
+                codes[symbol] = (code, bit_length)
+                code += 1
+        code <<= 1
+    return codes
+
+
+def _write_lengths(bits, new, old):
+    """نوشتن طول‌های درخت به صورت تفاضل با بلوک قبل، با پیش‌درخت و کدهای تکرار"""
+    ops = []
+    x = 0
+    while x < len(new):
+        run = 1
+        while x + run < len(new) and new[x + run] == new[x]:
+            run += 1
+        if new[x] == 0 and run >= 20:
+            run = min(run, 51)
+            ops.append((18, run - 20, 5, None))
+        elif new[x] == 0 and run >= 4:
+            run = min(run, 19)
+            ops.append((17, run - 4, 4, None))
+        elif run >= 4:
+            run = min(run, 5)
+            ops.append((19, run - 4, 1, (old[x] - new[x]) % 17))
+        else:
+            run = 1
+            ops.append(((old[x] - new[x]) % 17, 0, 0, None))
+        x += run
+
+    freqs = [0] * 20
+    for symbol, _, _, delta in ops:
+        freqs[symbol] += 1
+        if delta is not None:
+            freqs[delta] += 1
+    pretree = _huffman_lengths(freqs, 15)
+    codes = _canonical_codes(pretree)
+    for length in pretree:
+        bits.write(length, 4)
+    for symbol, extra, extra_bits, delta in ops:
+        bits.write(*codes[symbol])
+        bits.write(extra, extra_bits)
+        if delta is not None:
+            bits.write(*codes[delta])
+
+
+class _MatchFinder:
+    """جستجوی تطابق با زنجیره درهم‌سازی سه‌بایتی روی کل داده (فاصله تا اندازه پنجره)"""
+
+    def __init__(self, data):
+        self.data = data
+        self.heads = {}
+        self.chains = [0] * len(data)
+
+    def insert(self, pos):
+        if pos + MIN_MATCH <= len(self.data):
+            key = self.data[pos:pos + MIN_MATCH]
+            self.chains[pos] = self.heads.get(key, -1)
+            self.heads[key] = pos
+
+    def _length(self, pos, candidate, limit):
+        data = self.data
+        length = 0
+        while length < limit and data[candidate + length] == data[pos + length]:
+            length += 1
+        return length
+
+    def find(self, pos, limit, repeats):
+        """(طول، فاصله) بهترین تطابق؛ فاصله‌های تکراری در طول برابر ترجیح دارند"""
+        best = (0, 0)
+        for offset in repeats:
+            if offset <= pos:
+                length = self._length(pos, pos - offset, limit)
+                if length > best[0]:
+                    best = (length, offset)
+        if pos + MIN_MATCH <= len(self.data):
+            candidate = self.heads.get(self.data[pos:pos + MIN_MATCH], -1)
+            for _ in range(CHAIN_DEPTH):
+                if candidate < 0 or pos - candidate > WINDOW_SIZE - 3:
+                    break
+                length = self._length(pos, candidate, limit)
+                if length > best[0]:
+                    best = (length, pos - candidate)
+                candidate = self.chains[candidate]
+        return best if best[0] >= MIN_MATCH else (0, 0)
+
+
+def _e8_translate(data, file_size):
+    """عکس ترجمه E8 رمزگشا: فاصله‌های نسبی پس از بایت 0xE8 مطلق می‌شوند (برای هر فریم جدا)"""
+    data = bytearray(data)
+    for frame_start in range(0, len(data), FRAME_SIZE):
+        end = min(frame_start + FRAME_SIZE, len(data)) - 10
+        i = frame_start
+        while i < end:
+            if data[i] != 0xE8:
+                i += 1
+                continue
+            rel = int.from_bytes(data[i + 1:i + 5], "little", signed=True)
+            if -i <= rel < file_size:
+                absolute = rel + i if rel < file_size - i else rel - file_size
+                data[i + 1:i + 5] = absolute.to_bytes(4, "little", signed=True)
+            i += 5
+    return bytes(data)
+
+
+def lzx_compress(data, blocks=None, e8_file_size=0):
+    """
+    فشرده‌سازی LZX با پنجره ۶۴ کیلوبایتی به قالب فریم‌های .xnb.
+
+    Args:
+        data (bytes): داده خام
+        blocks (list[tuple[str, int]] | None): نوع ("verbatim"، "aligned" یا "uncompressed")
+            و طول بلوک‌ها پشت سر هم؛ بلوک فشرده‌نشده باید درون یک فریم بماند.
+            پیش‌فرض یک بلوک Verbatim برای هر فریم است
+        e8_file_size (int): اگر صفر نباشد ترجمه E8 با این اندازه فعال می‌شود
+
+    Returns:
+        bytes: فریم‌ها با سرآیند اندازه MonoGame (۲ بایت، یا 0xFF و ۴ بایت برای فریم ناقص)
+    """
+    if blocks is None:
+        blocks = [("verbatim", min(FRAME_SIZE, len(data) - start)) for start in range(0, len(data), FRAME_SIZE)]
+    if sum(length for _, length in blocks) != len(data):
+        raise ValueError("مجموع طول بلوک‌ها با طول داده یکی نیست")
+    source = _e8_translate(data, e8_file_size) if e8_file_size else data
+
+    # ۱) توکن‌سازی: تطابق‌ها از مرز بلوک و فریم نمی‌گذرند
+    finder = _MatchFinder(source)
+    repeats = [1, 1, 1]
+    plan = []
+    pos = 0
+    for kind, length in blocks:
+        end = pos + length
+        tokens = []
+        if kind == "uncompressed":
+            if pos // FRAME_SIZE != (end - 1) // FRAME_SIZE:
+                raise ValueError("بلوک فشرده‌نشده نباید از مرز فریم بگذرد")
+            for p in range(pos, end):
+                finder.insert(p)
+            plan.append((kind, pos, end, tuple(repeats), tokens))
+            pos = end
+            continue
+        while pos < end:
+            frame_end = min((pos // FRAME_SIZE + 1) * FRAME_SIZE, end)
+            match_length, offset = finder.find(pos, min(MAX_MATCH, frame_end - pos), repeats)
+            if match_length:
+                if offset == repeats[0]:
+                    slot = 0
+                elif offset == repeats[1]:
+                    slot = 1
+                    repeats[0], repeats[1] = repeats[1], repeats[0]
+                elif offset == repeats[2]:
+                    slot = 2
+                    repeats[0], repeats[2] = repeats[2], repeats[0]
+                else:
+                    slot = max(s for s in range(3, 32) if _POSITION_BASE[s] <= offset + 2)
+                    repeats = [offset, repeats[0], repeats[1]]
+                tokens.append((pos, match_length, slot, offset + 2 - _POSITION_BASE[slot]))
+                for p in range(pos, pos + match_length):
+                    finder.insert(p)
+                pos += match_length
+            else:
+                tokens.append((pos, source[pos], None, None))
+                finder.insert(pos)
+                pos += 1
+        plan.append((kind, end - length, end, None, tokens))
+
+    # ۲) نوشتن فریم‌ها؛ هر فریم جریان بیتی جدایی است
+    frames = [bytearray() for _ in range(0, len(data), FRAME_SIZE)]
+    bits = _BitWriter()
+    main_lengths = [0] * MAIN_ELEMENTS
+    length_lengths = [0] * 249
+    frame = 0
+    first_frame = True
+
+    def close_frames(until):
+        nonlocal frame
+        while frame < until:
+            frames[frame] += bits.flush()
+            frame += 1
+
+    def start_stream():
+        nonlocal first_frame
+        if first_frame:
+            bits.write(1 if e8_file_size else 0, 1)
+            if e8_file_size:
+                bits.write(e8_file_size >> 16, 16)
+                bits.write(e8_file_size & 0xFFFF, 16)
+            first_frame = False
+
+    for kind, start, end, saved_repeats, tokens in plan:
+        close_frames(start // FRAME_SIZE)
+        start_stream()
+        block_type = {"verbatim": 1, "aligned": 2, "uncompressed": 3}[kind]
+        bits.write(block_type, 3)
+        bits.write((end - start) >> 8, 16)
+        bits.write((end - start) & 0xFF, 8)
+
+        if kind == "uncompressed":
+            bits.align()
+            frames[frame] += bits.flush() + struct.pack("<3I", *saved_repeats) + source[start:end]
+            if (end - start) & 1:
+                frames[frame] += b"\0"
+            continue
+
+        aligned = kind == "aligned"
+        main_freqs = [0] * MAIN_ELEMENTS
+        length_freqs = [0] * 249
+        aligned_freqs = [0] * 8
+        for _, value, slot, extra in tokens:
+            if slot is None:
+                main_freqs[value] += 1
+                continue
+            header = min(value - 2, 7)
+            main_freqs[256 + (slot << 3) + header] += 1
+            if header == 7:
+                length_freqs[value - 2 - 7] += 1
+            if aligned and slot >= 3 and _EXTRA_BITS[slot] >= 3:
+                aligned_freqs[extra & 7] += 1
+        if e8_file_size:
+            # طول ناصفر برای لیترال 0xE8 ترجمه E8 را در رمزگشا روشن می‌کند
+            main_freqs[0xE8] = max(main_freqs[0xE8], 1)
+
+        if aligned:
+            aligned_lengths = _huffman_lengths(aligned_freqs, 7)
+            for length in aligned_lengths:
+                bits.write(length, 3)
+            aligned_codes = _canonical_codes(aligned_lengths)
+        new_main = _huffman_lengths(main_freqs, 16)
+        new_length = _huffman_lengths(length_freqs, 16)
+        _write_lengths(bits, new_main[:256], main_lengths[:256])
+        _write_lengths(bits, new_main[256:], main_lengths[256:])
+        _write_lengths(bits, new_length, length_lengths)
+        main_lengths, length_lengths = new_main, new_length
+        main_codes = _canonical_codes(new_main)
+        length_codes = _canonical_codes(new_length)
+
+        for pos, value, slot, extra in tokens:
+            if pos // FRAME_SIZE != frame:
+                close_frames(pos // FRAME_SIZE)
+            if slot is None:
+                bits.write(*main_codes[value])
+                continue
+            header = min(value - 2, 7)
+            bits.write(*main_codes[256 + (slot << 3) + header])
+            if header == 7:
+                bits.write(*length_codes[value - 2 - 7])
+            if slot < 3:
+                continue
+            extra_bits = _EXTRA_BITS[slot]
+            if aligned and extra_bits >= 3:
+                bits.write(extra >> 3, extra_bits - 3)
+                bits.write(*aligned_codes[extra & 7])
+            else:
+                bits.write(extra, extra_bits)
+    close_frames(len(frames))
+
+    out = bytearray()
+    for index, chunk in enumerate(frames):
+        frame_length = min(FRAME_SIZE, len(data) - index * FRAME_SIZE)
+        if frame_length == FRAME_SIZE:
+            out += struct.pack(">H", len(chunk)) + chunk
+        else:
+            out += b"\xFF" + struct.pack(">HH", frame_length, len(chunk)) + chunk
+    return bytes(out)
+
+
+# ---------------------------------------------------------------- نمونه‌ها
+
+def fixture_font():
+    """(تصویر اطلس، نویسه‌ها، مستطیل‌های گلیف، مستطیل‌های برش) فونت نمونه"""
+    image = Image.new("RGBA", ATLAS_SIZE, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    columns = ATLAS_SIZE[0] // CELL_WIDTH
+    glyphs = []
+    crops = []
+    for index, char in enumerate(CHARACTERS):
+        x = (index % columns) * CELL_WIDTH
+        y = (index // columns) * CELL_HEIGHT
+        draw.text((x, y), char, fill=GLYPH_COLOR)
+        glyphs.append((x, y, CELL_WIDTH - 1, CELL_HEIGHT - 1))
+        crops.append((0, index % 4, CELL_WIDTH - 1, CELL_HEIGHT - 1))
+    # نوار گرادیان نیمه‌شفاف تا پیش‌ضرب آلفا هم آزموده شود
+    for x in range(ATLAS_SIZE[0]):
+        for y in range(ATLAS_SIZE[1] - 8, ATLAS_SIZE[1]):
+            image.putpixel((x, y), (x * 2, 255 - x, 90, x * 2))
+    return image, CHARACTERS, glyphs, crops
+
+
+def lzx_fixture_blocks(size):
+    """بلوک‌بندی نمونه LZX: همه نوع بلوک، بلوک گذرنده از مرز فریم و بلوک فشرده‌نشده با طول فرد"""
+    return [
+        ("verbatim", 12000),
+        ("aligned", 40000 - 12000),       # از مرز فریم اول می‌گذرد
+        ("uncompressed", 9999),           # طول فرد، درون فریم دوم
+        ("aligned", 70001 - 49999),       # پنجره ۶۴ کیلوبایتی را دور می‌زند
+        ("verbatim", size - 70001),
+    ]
+
+
+def main():
+    image, chars, glyphs, crops = fixture_font()
+    payload = spritefont_payload(image, chars, glyphs, crops)
+    # طول بدنه باید از پنجره LZX بزرگ‌تر باشد تا چرخش پنجره آزموده شود
+    assert len(payload) > 70001, len(payload)
+    with open(os.path.join(FIXTURE_DIR, "spritefont_lz4.xnb"), "wb") as f:
+        f.write(wrap_xnb(payload, 0x40, lz4_compress(payload)))
+    body = lzx_compress(payload, lzx_fixture_blocks(len(payload)), E8_FILE_SIZE)
+    with open(os.path.join(FIXTURE_DIR, "spritefont_lzx.xnb"), "wb") as f:
+        f.write(wrap_xnb(payload, 0x80, body))
+    if shutil.which("lz4"):
+        with open(os.path.join(FIXTURE_DIR, "spritefont_lz4_reference.xnb"), "wb") as f:
+            f.write(wrap_xnb(payload, 0x40, reference_lz4_block(payload)))
+    else:
+        print("ابزار lz4 پیدا نشد؛ spritefont_lz4_reference.xnb ساخته نشد")
+    image.save(os.path.join(FIXTURE_DIR, "spritefont_atlas.png"))
+    print(f"بدنه {len(payload)} بایت، LZ4 {len(lz4_compress(payload))} بایت، LZX {len(body)} بایت")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""کوچک کردن اطلس فونت بر اساس پیکره (atlas_subset)"""
+import json
+import os
+import atlas_subset
+from benchmarks.synthetic_font import generate_font
+from monogame_font_parser import load_json_content
+
+
+def make_font(folder, default_character=None, drop_space=False):
+    fnt_file = generate_font(str(folder), 200)
+    with open(fnt_file, encoding="utf-8") as f:
+        descriptor = json.load(f)
+    content = descriptor["content"]
+    content["defaultCharacter"] = default_character
+    if drop_space:
+        for key in ("glyphs", "cropping", "characterMap", "kerning"):
+            del content[key][0]
+    with open(fnt_file, "w", encoding="utf-8") as f:
+        json.dump(descriptor, f, ensure_ascii=False)
+    return fnt_file
+
+
+def write_corpus(folder, *lines):
+    path = os.path.join(str(folder), "strings.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return path
+
+
+def test_subset_keeps_corpus_space_and_default(tmp_path, capsys):
+    fnt_file = make_font(tmp_path / "font", default_character="~")
+    corpus = write_corpus(tmp_path, "abc", "一 ☃")
+    out = tmp_path / "out"
+
+    assert atlas_subset.main([fnt_file, corpus, "-o", str(out), "--name", "small"]) == 0
+    content = load_json_content(str(out / "small.json"))
+    assert content["characterMap"] == [" ", "a", "b", "c", "~", "一"]
+    assert content["defaultCharacter"] == "~"
+    assert "یکسان است" in capsys.readouterr().out
+
+
+def test_subset_without_glyphs_fails_early(tmp_path, capsys):
+    fnt_file = make_font(tmp_path / "font", drop_space=True)
+    corpus = write_corpus(tmp_path, "☃☃", "")
+    out = tmp_path / "out"
+
+    assert atlas_subset.main([fnt_file, corpus, "-o", str(out)]) == 1
+    assert "هیچ کاراکتری از پیکره در فونت نیست" in capsys.readouterr().out
+    assert not out.exists()
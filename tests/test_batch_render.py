@@ -0,0 +1,27 @@
+"""رندر دسته‌ای جدول رشته‌ها (batch_render) با چند پردازه"""
+import json
+import batch_render
+from benchmarks.synthetic_font import generate_font
+
+
+def read_manifest(out):
+    with open(out / "manifest.jsonl", encoding="utf-8") as f:
+        return sorted((json.loads(line) for line in f), key=lambda entry: entry["id"])
+
+
+def test_render_table_with_workers(tmp_path, capsys):
+    generate_font(str(tmp_path / "fonts"), 100, name="Main")
+    strings = tmp_path / "strings.csv"
+    # نام فایل رشته سوم از سقف طول نام در سیستم فایل بیشتر است و ذخیره‌اش شکست می‌خورد
+    long_id = "x" * 300
+    strings.write_text(f"id,text\nhello,Hello\nbye,abc xyz\n{long_id},boom\n", encoding="utf-8")
+    out = tmp_path / "out"
+
+    status = batch_render.main([str(strings), str(tmp_path / "fonts"), str(out), "--workers", "2", "--chunksize", "1"])
+    assert status == 1
+    entries = read_manifest(out)
+    assert [(entry["id"], entry["font"]) for entry in entries] == [("bye", "Main"), ("hello", "Main"), (long_id, "Main")]
+    for entry in entries[:2]:
+        assert (out / entry["file"]).is_file() and entry["width"] > 0 and entry["height"] > 0
+    assert set(entries[2]) == {"id", "font", "error"} and "OSError" in entries[2]["error"]
+    assert "1 تصویر به دلیل خطا ساخته نشد" in capsys.readouterr().out
@@ -0,0 +1,77 @@
+"""یکسان بودن خروجی موتورهای رندر "pil" و "numpy" (compositor)"""
+import pytest
+from PIL import Image
+from benchmarks.synthetic_font import sample_text
+from font import MonoGameFont
+from texture_registry import TextureRegistry
+
+BACKGROUNDS = ((50, 50, 50, 255), (255, 255, 255, 255), (0, 0, 0, 0))
+
+
+@pytest.fixture
+def fonts(synthetic_font):
+    fnt_file, folder = synthetic_font
+    return (MonoGameFont(fnt_file, folder, use_cache=False, render_engine="pil"),
+            MonoGameFont(fnt_file, folder, use_cache=False, render_engine="numpy"))
+
+
+def assert_same_render(fonts, text, background):
+    expected = fonts[0].render_text(text, background)
+    actual = fonts[1].render_text(text, background)
+    assert actual.size == expected.size
+    assert actual.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("background", BACKGROUNDS)
+@pytest.mark.parametrize("length", (0, 1, 10, 300))
+def test_engines_identical(fonts, length, background):
+    for seed in range(3):
+        text = sample_text(length, 500, seed)
+        # کاراکتر ناموجود در میانه متن: گلیف‌های بعدی باید به اندازه فاصله جابه‌جا شوند
+        assert_same_render(fonts, text[:length // 2] + "☃" + text[length // 2:], background)
+
+
+@pytest.mark.parametrize("text", ("\ud800", "ab\udc00cd", "a\U0001F600b", "😀"))
+def test_lone_surrogates_and_astral(fonts, text):
+    assert_same_render(fonts, text, BACKGROUNDS[0])
+
+
+def test_measure_many_lone_surrogate(fonts):
+    font = fonts[0]
+    texts = ["ab\ud800c", "", "\udfff", "hello"]
+    widths, heights = font.measure_many(texts)
+    assert [(int(w), int(h)) for w, h in zip(widths, heights)] == [font.measure_text(text) for text in texts]
+
+
+def test_engines_identical_with_two_pages(fonts, tmp_path):
+    # نیمی از گلیف‌ها به صفحه دوم با رنگ‌های جابه‌جاشده منتقل می‌شوند
+    r, g, b, a = fonts[0].get_page(0).split()
+    second = tmp_path / "page1.png"
+    Image.merge("RGBA", (b, r, g, a)).save(second)
+    for font in fonts:
+        font.pages[1] = font.textures.register_file(str(second))
+        for row in range(1, len(font.chars.page), 2):
+            font.chars.page[row] = 1
+        font.clear_glyph_cache()
+    text = sample_text(300, 500, 1)
+    for background in BACKGROUNDS:
+        assert_same_render(fonts, text, background)
+        assert_same_render(fonts, text[:40] + text[:40], background)
+
+
+def test_atlas_arrays_count_in_texture_budget(synthetic_font, tmp_path):
+    fnt_file, folder = synthetic_font
+    textures = TextureRegistry()
+    font = MonoGameFont(fnt_file, folder, use_cache=False, render_engine="numpy", textures=textures)
+    page = textures.pages[font.pages[0]]
+    font.render_text("abc")
+    image_bytes = page.width * page.height * 4
+    # تصویر صفحه، پیکسل‌های اطلس و اطلس ترکیب‌شده با پس‌زمینه
+    assert textures.decoded_bytes == 3 * image_bytes
+
+    textures.set_budget(0)
+    other = tmp_path / "other.png"
+    Image.new("RGBA", (8, 8)).save(other)
+    textures.get(textures.register_file(str(other)))
+    assert page.image is None and page.arrays == {}
+    assert font.render_text("abc").tobytes() == MonoGameFont(fnt_file, folder, use_cache=False).render_text("abc").tobytes()
@@ -0,0 +1,106 @@
+"""کش دیسکی فونت‌ها (font_cache): نسخه‌ها، پاک‌سازی و سقف حجم"""
+import os
+import shutil
+import time
+import font_cache
+from benchmarks.synthetic_font import generate_font
+from font import MonoGameFont
+
+
+def cache_files(root):
+    return sorted(os.path.relpath(os.path.join(folder, name), root)
+                  for folder, _, names in os.walk(root) for name in names)
+
+
+def make_font(folder, name, glyph_count=150):
+    fnt_file = generate_font(str(folder), glyph_count, name=name)
+    return fnt_file, str(folder)
+
+
+def store(font):
+    pages = {pid: font.get_page(pid) for pid in font.pages}
+    font_cache.store_cached_font(font.fnt_file, font.images_folder, font.chars, pages, font.page_files)
+
+
+def test_store_and_reload(tmp_path):
+    fnt_file, folder = make_font(tmp_path / "fonts", "a")
+    first = MonoGameFont(fnt_file, folder)
+    assert font_cache.is_cached(fnt_file, folder)
+    files = cache_files(font_cache.get_cache_dir())
+    key = font_cache._cache_key(fnt_file, folder)
+    assert len(files) == 1 and files[0].startswith(key + os.sep)
+
+    second = MonoGameFont(fnt_file, folder)
+    assert second.render_text("abc").tobytes() == first.render_text("abc").tobytes()
+
+    # ذخیره دوباره نسخه تازه می‌نویسد و نسخه قبلی پاک می‌شود
+    second.close()
+    first.close()
+    store(MonoGameFont(fnt_file, folder, use_cache=False))
+    newer = cache_files(font_cache.get_cache_dir())
+    assert len(newer) == 1 and newer != files
+
+
+def test_prune_removes_fonts_that_no_longer_exist(tmp_path):
+    gone, gone_folder = make_font(tmp_path / "gone", "gone")
+    kept, kept_folder = make_font(tmp_path / "kept", "kept")
+    MonoGameFont(gone, gone_folder).close()
+    shutil.rmtree(gone_folder)
+    MonoGameFont(kept, kept_folder).close()
+
+    keys = os.listdir(font_cache.get_cache_dir())
+    assert keys == [font_cache._cache_key(kept, kept_folder)]
+
+
+def test_prune_keeps_recently_used_under_cap(tmp_path):
+    fonts = [make_font(tmp_path / name, name) for name in ("a", "b", "c")]
+    for fnt_file, folder in fonts:
+        MonoGameFont(fnt_file, folder).close()
+    cache_dir = font_cache.get_cache_dir()
+    keys = [font_cache._cache_key(fnt_file, folder) for fnt_file, folder in fonts]
+    sizes = {key: sum(os.path.getsize(os.path.join(cache_dir, key, name))
+                      for name in os.listdir(os.path.join(cache_dir, key))) for key in keys}
+
+    # "a" قدیمی‌ترین است ولی با بارگذاری دوباره تازه‌ترین استفاده می‌شود
+    old = time.time() - 1000
+    for age, key in enumerate(keys):
+        os.utime(os.path.join(cache_dir, key), (old + age, old + age))
+        for name in os.listdir(os.path.join(cache_dir, key)):
+            os.utime(os.path.join(cache_dir, key, name), (old + age, old + age))
+    MonoGameFont(*fonts[0]).close()
+
+    font_cache.prune_cache(keep_key=keys[2], max_bytes=sizes[keys[0]] + sizes[keys[2]])
+    assert sorted(os.listdir(cache_dir)) == sorted([keys[0], keys[2]])
+
+
+def test_failed_store_leaves_no_temp_file(tmp_path, monkeypatch, capsys):
+    fnt_file, folder = make_font(tmp_path / "fonts", "a")
+    font = MonoGameFont(fnt_file, folder, use_cache=False)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(font_cache.os, "replace", fail)
+    store(font)
+    assert "disk full" in capsys.readouterr().out
+    assert [name for name in cache_files(font_cache.get_cache_dir()) if name.endswith(".tmp")] == []
+    assert not font_cache.is_cached(fnt_file, folder)
+
+
+def test_legacy_and_abandoned_files_are_removed(tmp_path):
+    fnt_file, folder = make_font(tmp_path / "fonts", "a")
+    cache_dir = font_cache.get_cache_dir()
+    key = font_cache._cache_key(fnt_file, folder)
+    os.makedirs(os.path.join(cache_dir, key))
+    legacy = os.path.join(cache_dir, key + ".fontcache")
+    abandoned = os.path.join(cache_dir, key, "00000000000000000001.fontcache.123.tmp")
+    unrelated = os.path.join(cache_dir, "notes.txt")
+    for path in (legacy, abandoned, unrelated):
+        with open(path, "wb") as f:
+            f.write(b"x")
+    old = time.time() - 2 * font_cache.STALE_TEMP_SECONDS
+    os.utime(abandoned, (old, old))
+
+    MonoGameFont(fnt_file, folder).close()
+    assert not os.path.exists(legacy) and not os.path.exists(abandoned)
+    assert os.path.exists(unrelated)
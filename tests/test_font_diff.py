@@ -0,0 +1,99 @@
+"""مقایسه دو نسخه فونت (font_diff): فیلتر برداری رشته‌ها و گزارش رشته‌های متفاوت"""
+import json
+import os
+from PIL import Image
+from benchmarks.synthetic_font import generate_font
+from font import MonoGameFont
+from font_diff import affected_mask, changed_codepoints, compare_fonts
+
+# «q» گلیفی است که پیکسل‌هایش عوض می‌شود؛ «☃» در فونت مصنوعی نیست و به اندازه فاصله جلو می‌رود
+TEXTS = ["abc", "xyz", "q", "", "a b", "a☃c", "qq q", "ab☃"]
+
+
+def make_versions(tmp_path, change, last_character=None):
+    """
+    (مسیر قدیم، مسیر جدید) دو نسخه یک فونت مصنوعی ۲۰۰ گلیفی که change روی نسخه جدید اعمال شده است.
+
+    last_character کاراکتر گلیف آخر را در هر دو نسخه عوض می‌کند.
+    """
+    old_path = generate_font(str(tmp_path / "old"), 200, name="font")
+    new_folder = tmp_path / "new"
+    new_folder.mkdir()
+    with open(old_path, encoding="utf-8") as f:
+        descriptor = json.load(f)
+    if last_character:
+        descriptor["content"]["characterMap"][-1] = last_character
+        with open(old_path, "w", encoding="utf-8") as f:
+            json.dump(descriptor, f, ensure_ascii=False)
+    image = Image.open(os.path.join(os.path.dirname(old_path), "font.png")).convert("RGBA")
+    change(descriptor["content"], image)
+    image.save(new_folder / "font.png")
+    new_path = str(new_folder / "font.json")
+    with open(new_path, "w", encoding="utf-8") as f:
+        json.dump(descriptor, f, ensure_ascii=False)
+    return old_path, new_path
+
+
+def invert_glyph(char):
+    def change(content, image):
+        glyph = content["glyphs"][content["characterMap"].index(char)]
+        box = (glyph["x"], glyph["y"], glyph["x"] + glyph["width"], glyph["y"] + glyph["height"])
+        r, g, b, a = image.crop(box).split()
+        image.paste(Image.merge("RGBA", (b, r, g, a)), box[:2])
+    return change
+
+
+def widen_space(content, image):
+    content["glyphs"][content["characterMap"].index(" ")]["width"] += 3
+
+
+def diff_texts(old_path, new_path, texts=TEXTS):
+    """({متن رشته متفاوت: تغییر عرض}، آمار) مقایسه texts در همین پردازه"""
+    rows = [("strings.txt", str(i), text) for i, text in enumerate(texts)]
+    differences, stats = compare_fonts(old_path, new_path, rows, workers=1)
+    return {texts[int(entry["id"])]: entry["width_delta"] for entry in differences}, stats
+
+
+def test_changed_glyph_pixels(tmp_path):
+    old_path, new_path = make_versions(tmp_path, invert_glyph("q"))
+    old_font, new_font = MonoGameFont(old_path, str(tmp_path / "old")), MonoGameFont(new_path, str(tmp_path / "new"))
+    changed, missing_stable = changed_codepoints(old_font, new_font)
+    assert changed == {ord("q")} and missing_stable
+
+    mask = affected_mask(TEXTS, old_font, new_font, changed, missing_stable)
+    assert [text for text, flag in zip(TEXTS, mask) if flag] == ["q", "qq q"]
+
+    found, stats = diff_texts(old_path, new_path)
+    assert found == {"q": 0, "qq q": 0}
+    assert stats["compared"] == 2 and stats["skipped"] == len(TEXTS) - 2
+    assert stats["changed_glyphs"] == ["U+0071"] and not stats["missing_advance_changed"]
+
+
+def test_changed_space_advance_moves_missing_characters(tmp_path):
+    old_path, new_path = make_versions(tmp_path, widen_space)
+    old_font, new_font = MonoGameFont(old_path, str(tmp_path / "old")), MonoGameFont(new_path, str(tmp_path / "new"))
+    changed, missing_stable = changed_codepoints(old_font, new_font)
+    assert changed == {ord(" ")} and not missing_stable
+
+    expected = ["a b", "a☃c", "qq q", "ab☃"]
+    mask = affected_mask(TEXTS, old_font, new_font, changed, missing_stable)
+    assert [text for text, flag in zip(TEXTS, mask) if flag] == expected
+
+    # در «ab☃» فقط فاصله انتهایی پهن‌تر می‌شود و با پس‌زمینه پرشده پیکسلی تغییر نمی‌کند
+    found, stats = diff_texts(old_path, new_path)
+    assert found == {"a b": 3, "a☃c": 3, "qq q": 3}
+    assert stats["compared"] == 4 and stats["missing_advance_changed"]
+
+
+
+def test_changed_glyph_outside_dense_table(tmp_path):
+    emoji = "\U0001F600"
+    old_path, new_path = make_versions(tmp_path, invert_glyph(emoji), last_character=emoji)
+    old_font, new_font = MonoGameFont(old_path, str(tmp_path / "old")), MonoGameFont(new_path, str(tmp_path / "new"))
+    changed, missing_stable = changed_codepoints(old_font, new_font)
+    assert changed == {ord(emoji)} and missing_stable
+
+    texts = TEXTS + ["a" + emoji, "\U0001F601", emoji + "\uE000"]
+    mask = affected_mask(texts, old_font, new_font, changed, missing_stable)
+    assert [text for text, flag in zip(texts, mask) if flag] == ["a" + emoji, emoji + "\uE000"]
+    assert set(diff_texts(old_path, new_path, texts)[0]) == {"a" + emoji, emoji + "\uE000"}
@@ -0,0 +1,39 @@
+"""گزارش پوشش گلیف فونت‌ها روی پیکره (glyph_coverage)"""
+import json
+import os
+import glyph_coverage
+from benchmarks.synthetic_font import generate_font
+
+
+def run_report(tmp_path, fonts, lines):
+    corpus = tmp_path / "strings.txt"
+    corpus.write_text("\n".join(lines), encoding="utf-8")
+    out = tmp_path / "coverage.json"
+    status = glyph_coverage.main([str(corpus), "--fonts", *fonts, "--json", str(out)])
+    with open(out, encoding="utf-8") as f:
+        return status, {entry["font"]: entry for entry in json.load(f)["fonts"]}
+
+
+def test_labels_are_relative_paths(tmp_path):
+    fonts = tmp_path / "fonts"
+    generate_font(str(fonts / "ui"), 100, name="Main")
+    generate_font(str(fonts / "hud"), 200, name="Main")
+
+    status, report = run_report(tmp_path, [str(fonts)], ["abc", "\u4e10\u4e20"])
+    assert status == 0
+    assert sorted(report) == [os.path.join("hud", "Main.json"), os.path.join("ui", "Main.json")]
+    assert report[os.path.join("ui", "Main.json")]["missing_chars"] == 2
+    assert report[os.path.join("hud", "Main.json")]["missing_chars"] == 0
+
+
+def test_duplicate_labels_use_full_paths(tmp_path, capsys):
+    small = generate_font(str(tmp_path / "a"), 100, name="Main")
+    large = generate_font(str(tmp_path / "b"), 200, name="Main")
+
+    # دو فونت هم‌نام در پوشه‌های جدا، و یک فونت که دو بار داده شده است
+    status, report = run_report(tmp_path, [small, large, str(tmp_path / "b")], ["\u4e10\u4e20"])
+    assert status == 0
+    assert sorted(report) == sorted([os.path.abspath(small), os.path.abspath(large)])
+    assert report[os.path.abspath(small)]["missing_chars"] == 2
+    assert report[os.path.abspath(large)]["missing_chars"] == 0
+    assert "هشدار: چند فونت برچسب Main.json دارند" in capsys.readouterr().out
@@ -0,0 +1,97 @@
+"""خواندن جریانی JSON (json_stream) و فونت‌های JSON با آن، در برابر json.load"""
+import io
+import json
+import pytest
+import monogame_font_parser
+from benchmarks.synthetic_font import generate_font
+from glyph_table import COLUMNS, GlyphTable
+from json_stream import JsonStream
+
+# تکه‌های کوچک تا مرز تکه‌ها درون عددها، رشته‌ها، escape ها و جداکننده‌ها بیفتد
+CHUNK_SIZES = (1, 2, 3, 5, 7, 16, 64)
+
+DOCUMENT = {
+    "header": {"target": "w", "formatVersion": 5, "hidef": False, "compressed": None},
+    "content": {
+        "glyphs": [{"x": i * 13, "y": -i, "width": 10 ** (i % 6), "height": 2} for i in range(40)],
+        "cropping": [{"x": -2.5e-3, "y": 1e10}, {"x": -0.0, "y": 12345678901234567890}, {}],
+        "characterMap": ["a", "\"", "\\", "]", "}", ",", "一", "\U0001F600", " "],
+        "strings": ["},", "\",", "],]", "{\"x\": 1},", "\\u0041", ""],
+        "nested": [[1, [2, [3, {"a": [4]}]]], [], {}, [[]]],
+        "texture": {"format": 0, "export": "font.png"},
+    },
+}
+
+
+def read_all(stream):
+    """کل مقدار بعدی، فقط با iter_object، iter_array و value"""
+    ch = stream.peek()
+    if ch == "{":
+        return {key: read_all(stream) for key in stream.iter_object()}
+    if ch == "[":
+        return list(stream.iter_array())
+    return stream.value()
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("indent", (None, 1, "\t"))
+def test_stream_matches_json_load(chunk_size, indent):
+    text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=indent is None)
+    assert read_all(JsonStream(io.StringIO(text), chunk_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_skip_leaves_stream_at_next_key(chunk_size):
+    text = json.dumps(DOCUMENT)
+    stream = JsonStream(io.StringIO(text), chunk_size)
+    seen = {}
+    for key in stream.iter_object():
+        if key == "header":
+            stream.skip()
+        else:
+            seen[key] = {}
+            for content_key in stream.iter_object():
+                if content_key in ("nested", "strings"):
+                    stream.skip()
+                else:
+                    seen[key][content_key] = read_all(stream)
+    expected = {key: value for key, value in DOCUMENT["content"].items() if key not in ("nested", "strings")}
+    assert seen == {"content": json.loads(json.dumps(expected))}
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 64, 4096))
+def test_font_stream_matches_json_load(tmp_path, chunk_size):
+    fnt_file = generate_font(str(tmp_path), 300)
+    streamed = GlyphTable()
+    texture = monogame_font_parser._stream_json_font(fnt_file, streamed, chunk_size=chunk_size)
+    loaded = GlyphTable()
+    pages = {}
+    monogame_font_parser.parse_monogame_fnt(fnt_file, loaded, pages, stream=False)
+    assert texture == pages[0]
+    for name in COLUMNS:
+        assert getattr(streamed, name) == getattr(loaded, name), name
+
+
+def test_unsupported_layout_falls_back_with_message(tmp_path, capsys):
+    fnt_file = generate_font(str(tmp_path), 100)
+    with open(fnt_file, encoding="utf-8") as f:
+        descriptor = json.load(f)
+    # json.load این ساختار را می‌پذیرد (رشته هم مانند فهرست کاراکترها پیمایش می‌شود) ولی مسیر جریانی نه
+    descriptor["content"]["characterMap"] = "".join(descriptor["content"]["characterMap"])
+    with open(fnt_file, "w", encoding="utf-8") as f:
+        json.dump(descriptor, f, ensure_ascii=False)
+
+    chars = GlyphTable()
+    monogame_font_parser.parse_monogame_fnt(fnt_file, chars, {}, stream=True)
+    assert len(chars) == 100
+    assert "characterMap آرایه JSON نیست" in capsys.readouterr().out
+
+
+def test_invalid_json_is_reported_not_retried(tmp_path, capsys, monkeypatch):
+    fnt_file = tmp_path / "broken.json"
+    fnt_file.write_text('{"content": {"glyphs": [{"x": 1}, {"x": ]}}', encoding="utf-8")
+    monkeypatch.setattr(monogame_font_parser, "load_json_content",
+                        lambda path: pytest.fail("خطای JSON نباید به json.load واگذار شود"))
+    with pytest.raises(ValueError, match="broken.json"):
+        monogame_font_parser.parse_monogame_fnt(str(fnt_file), GlyphTable(), {}, stream=True)
+    assert "json.load" not in capsys.readouterr().out
@@ -0,0 +1,112 @@
+"""سرویس محلی رندر (render_server): محدودیت‌های امنیتی درخواست‌ها و LRU فونت‌ها"""
+import http.client
+import json
+import os
+import threading
+import pytest
+import render_server
+from benchmarks.synthetic_font import generate_font
+from render_server import FontPool, RenderClient, RenderHTTPServer, RenderService
+
+
+@pytest.fixture
+def server(tmp_path, synthetic_font):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    fonts_root = os.path.dirname(synthetic_font[0])
+    service = RenderService(FontPool(fonts_root=fonts_root), str(out_dir))
+    server = RenderHTTPServer(("127.0.0.1", 0), service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, path, body, headers):
+    """(وضعیت، پاسخ JSON) درخواست خام بدون سرآیندهای خودکار http.client"""
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=30)
+    connection.putrequest("POST", path, skip_host=True, skip_accept_encoding=True)
+    for name, value in headers.items():
+        connection.putheader(name, value)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+
+def render_body(font, **options):
+    return json.dumps(dict(options, font=font, text="abc")).encode("utf-8")
+
+
+def test_out_must_stay_inside_out_dir(server, synthetic_font, tmp_path):
+    fnt_file, _ = synthetic_font
+    service = server.service
+    os.symlink(str(tmp_path), os.path.join(service.out_dir, "link"))
+    for name in ("../evil.png", str(tmp_path / "evil.png"), "sub/../../evil.png", "link/evil.png", "a.txt", ".", ""):
+        if name:
+            with pytest.raises(ValueError):
+                service.out_path(name)
+    assert service.out_path("sub/a.png") == os.path.join(service.out_dir, "sub", "a.png")
+
+    client = RenderClient(port=server.server_address[1])
+    with pytest.raises(RuntimeError, match="بیرون از پوشه خروجی"):
+        client.call("/render", {"font": fnt_file, "text": "abc", "out": "../evil.png"})
+    assert client.call("/render", {"font": fnt_file, "text": "abc", "out": "sub/a.png"})["out"] == "sub/a.png"
+    client.close()
+    assert not (tmp_path / "evil.png").exists()
+    assert os.path.isfile(os.path.join(service.out_dir, "sub", "a.png"))
+
+
+def test_rejected_requests(server, synthetic_font, monkeypatch):
+    fnt_file, _ = synthetic_font
+    body = render_body(fnt_file)
+    host = f"127.0.0.1:{server.server_address[1]}"
+    cases = [
+        ({"Host": host, "Content-Type": "text/plain", "Content-Length": str(len(body))}, 415),
+        ({"Host": host, "Content-Type": "application/json"}, 411),
+        ({"Host": "attacker.example", "Content-Type": "application/json", "Content-Length": str(len(body))}, 403),
+        ({"Content-Type": "application/json", "Content-Length": str(len(body))}, 403),
+    ]
+    for headers, status in cases:
+        assert post(server, "/measure", body if "Content-Length" in headers else None, headers)[0] == status
+
+    monkeypatch.setattr(render_server, "MAX_BODY_BYTES", len(body) - 1)
+    headers = {"Host": host, "Content-Type": "application/json", "Content-Length": str(len(body))}
+    assert post(server, "/measure", body, headers)[0] == 413
+    monkeypatch.setattr(render_server, "MAX_BODY_BYTES", len(body))
+    for host_name in (host, f"localhost:{server.server_address[1]}", "[::1]"):
+        headers["Host"] = host_name
+        status, result = post(server, "/measure", body, headers)
+        assert status == 200 and len(result["size"]) == 2
+
+
+def test_fonts_root_confinement(server, tmp_path):
+    outside = generate_font(str(tmp_path / "outside"), 100)
+    client = RenderClient(port=server.server_address[1])
+    with pytest.raises(RuntimeError, match="بیرون از پوشه فونت‌ها"):
+        client.measure(outside, "abc")
+    with pytest.raises(RuntimeError, match="بیرون از پوشه فونت‌ها"):
+        client.measure("/etc/passwd", "abc")
+    client.close()
+    assert server.service.pool.loads == 0
+
+
+def test_lru_eviction_closes_fonts(tmp_path):
+    paths = [generate_font(str(tmp_path / name), 100, name=name, seed=seed) for seed, name in enumerate("abc")]
+    pool = FontPool(max_fonts=2)
+    entries = [pool.get(path) for path in paths[:2]]
+    pages = set(pool.textures.pages)
+    assert len(pages) == 2
+
+    third = pool.get(paths[2])
+    assert entries[0].font.closed and not entries[1].font.closed and not third.font.closed
+    assert pool.evictions == 1 and list(pool.fonts) == [os.path.realpath(path) for path in paths[1:]]
+    # صفحه فونت کنارگذاشته‌شده از textures رها شده است
+    assert entries[0].font.pages == {0: None}
+    assert len(pages & set(pool.textures.pages)) == 1
+
+    # استفاده دوباره فونت کنارگذاشته‌شده آن را دوباره بارگذاری می‌کند
+    with pool.use(paths[0]) as font:
+        assert not font.closed and font.measure_text("abc")[0] > 0
+    assert pool.loads == 4 and entries[1].font.closed
@@ -0,0 +1,82 @@
+"""بودجه زمان شروع نمایشگر (benchmarks.bench_startup) و بارگذاری پس‌زمینه فونت انتخاب‌شده"""
+import os
+import threading
+import time
+import pytest
+from benchmarks import bench_startup
+
+
+# زمان‌سنجی دیواری روی ماشین پرمشغله (مثلاً CI) نوسان دارد؛ فقط با MGFONT_BENCHMARK_TESTS=1 اجرا می‌شود
+@pytest.mark.skipif(os.environ.get("MGFONT_BENCHMARK_TESTS", "") not in ("1", "true", "yes"),
+                    reason="آزمون زمان‌سنجی؛ با MGFONT_BENCHMARK_TESTS=1 اجرا می‌شود")
+def test_startup_budget(capsys):
+    # همان بودجه‌های پیش‌فرض بنچمارک؛ کد ۱ یعنی پنجره یا فونت‌های جلسه دیرتر از بودجه آماده شدند
+    status = bench_startup.main(["--runs", "3"])
+    assert status == 0, capsys.readouterr().out
+
+
+@pytest.fixture
+def viewer():
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from ui import FontRendererWidget
+    widget = FontRendererWidget()
+    widget.show()
+    yield widget
+    widget.font_manager.load_pool.waitForDone()
+    widget.canvas.tile_pool.waitForDone()
+    widget.close()
+    app.processEvents()
+
+
+def wait_for(app, condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "بارگذاری فونت تمام نشد"
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def test_open_font_loads_in_background(viewer, synthetic_font, monkeypatch):
+    from PyQt5.QtWidgets import QApplication, QFileDialog
+    import font
+
+    fnt_file, _ = synthetic_font
+    monkeypatch.setattr(QFileDialog, "getOpenFileName", lambda *args, **kwargs: (fnt_file, ""))
+    threads = []
+    original_init = font.MonoGameFont.__init__
+
+    def recording_init(self, *args, **kwargs):
+        threads.append(threading.current_thread())
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(font.MonoGameFont, "__init__", recording_init)
+
+    viewer.open_font()
+    assert viewer.font_manager.fonts == []
+    assert viewer.load_progress.isVisible()
+    wait_for(QApplication.instance(), lambda: viewer.font_manager.fonts and not viewer.load_progress.isVisible())
+
+    assert [font.fnt_file for font in viewer.font_manager.fonts] == [fnt_file]
+    assert len(viewer.font_manager.text_fields) == 1
+    assert threads and threading.main_thread() not in threads
+
+    # Open دوباره جای فونت قبلی را می‌گیرد و Add ردیف تازه می‌سازد
+    first = viewer.font_manager.fonts[0]
+    viewer.open_font()
+    wait_for(QApplication.instance(), lambda: viewer.font_manager.fonts[0] is not first)
+    assert first.closed and len(viewer.font_manager.fonts) == 1
+    viewer.add_font()
+    wait_for(QApplication.instance(), lambda: len(viewer.font_manager.fonts) == 2)
+    assert len(viewer.font_manager.text_fields) == 2
+
+
+def test_recent_files_follow_config_dir(tmp_path, monkeypatch, synthetic_font):
+    import recent_files
+
+    fnt_file, _ = synthetic_font
+    # ماژول پیش‌تر (با پوشه تنظیمات آزمون دیگری) وارد شده است؛ مسیر باید هنگام استفاده ساخته شود
+    monkeypatch.setenv("MGFONT_CONFIG_DIR", str(tmp_path / "other"))
+    recent_files.save_recent_file(fnt_file)
+    assert os.path.isfile(tmp_path / "other" / recent_files.RECENT_FILES_FILE)
+    assert recent_files.load_recent_files() == [fnt_file]
@@ -0,0 +1,52 @@
+"""اندازه‌گیری بدون رندر (text_metrics) در برابر render_text، با کدپوینت‌های بزرگ خارج از بخش متراکم جدول‌ها"""
+import json
+from itertools import accumulate
+import pytest
+from benchmarks.synthetic_font import codepoints_for, generate_font
+from font import MonoGameFont
+from text_metrics import DENSE_MIN_SIZE, NUMPY_MIN_LENGTH
+
+# یک گلیف شکلک و یک گلیف ناحیه کاربرد خصوصی؛ «☃» و U+1F601 در فونت نیستند
+EXTRA = ["\U0001F600", "\uE000"]
+TEXTS = ["abc", "a\U0001F600b", "\uE000", "☃\U0001F601", "", " \U0001F600 ", "x\uE000☃\U0001F600"]
+
+
+@pytest.fixture
+def font(tmp_path):
+    fnt_file = generate_font(str(tmp_path), 200)
+    with open(fnt_file, encoding="utf-8") as f:
+        descriptor = json.load(f)
+    descriptor["content"]["characterMap"][-len(EXTRA):] = EXTRA
+    with open(fnt_file, "w", encoding="utf-8") as f:
+        json.dump(descriptor, f, ensure_ascii=False)
+    font = MonoGameFont(fnt_file, str(tmp_path))
+    yield font
+    font.close()
+
+
+def test_large_codepoints_do_not_grow_tables(font):
+    metrics = font.get_metrics()
+    assert metrics.size <= DENSE_MIN_SIZE
+    assert set(EXTRA) | {chr(0x4E00)} <= {chr(cid) for cid in metrics.sparse}
+    assert len(metrics.advance) == metrics.size + 1 + len(metrics.sparse) < 2 * DENSE_MIN_SIZE
+
+
+def test_measurements_match_render(font):
+    metrics = font.get_metrics()
+    characters = [chr(cp) for cp in codepoints_for(198)] + EXTRA + ["☃", "\U0001F601"]
+    long_text = "".join(characters[i * 7 % len(characters)] for i in range(NUMPY_MIN_LENGTH + 5))
+    texts = TEXTS + [long_text]
+    widths, heights = font.measure_many(texts)
+    for text, width, height in zip(texts, widths, heights):
+        size = font.render_text(text).size
+        assert font.measure_text(text) == size == (width, height), text
+    # مسیر NumPy متن بلند همان مکان‌نماهای حلقه پایتون را می‌دهد
+    expected = list(accumulate((metrics.advance[metrics.slot(ord(ch))] for ch in long_text), initial=0))
+    assert list(metrics.cursor_positions(long_text)) == expected
+
+
+def test_missing_spans_of_large_codepoints(font):
+    metrics = font.get_metrics()
+    a = metrics.advance[ord("a")]
+    assert font.missing_spans("a\U0001F600b") == []
+    assert font.missing_spans("a\U0001F601b") == [(a, metrics.missing_advance)]
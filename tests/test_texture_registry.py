@@ -0,0 +1,70 @@
+"""ثبت مشترک صفحه‌ها (texture_registry): آزاد شدن واقعی حافظه و رمزگشایی بیرون از قفل"""
+import threading
+import time
+from PIL import Image
+from font import MonoGameFont
+from texture_registry import TextureRegistry
+
+
+def write_page(path, color, size=(64, 32)):
+    Image.new("RGBA", size, color).save(path)
+    return str(path)
+
+
+def test_file_page_is_reread_after_eviction(tmp_path):
+    first = write_page(tmp_path / "a.png", (255, 0, 0, 255))
+    second = write_page(tmp_path / "b.png", (0, 255, 0, 255))
+    registry = TextureRegistry(budget=64 * 32 * 4)
+    a = registry.register_file(first)
+    b = registry.register_file(second)
+
+    assert registry.get(a).getpixel((0, 0)) == (255, 0, 0, 255)
+    registry.get(b)
+    assert registry.pages[a].image is None and registry.decoded_bytes == 64 * 32 * 4
+    assert registry.get(a).getpixel((0, 0)) == (255, 0, 0, 255)
+    assert registry.loads == 3
+
+
+def test_evicted_cache_page_holds_no_image(synthetic_font, tmp_path):
+    fnt_file, folder = synthetic_font
+    MonoGameFont(fnt_file, folder).close()
+    registry = TextureRegistry()
+    font = MonoGameFont(fnt_file, folder, textures=registry)
+    key = font.pages[0]
+    expected = font.get_page(0).tobytes()
+
+    registry.set_budget(0)
+    registry.get(registry.register_file(write_page(tmp_path / "other.png", (0, 0, 0, 255))))
+    assert registry.pages[key].image is None
+    assert font.get_page(0).tobytes() == expected
+    font.close()
+
+
+def test_decode_runs_outside_lock_once_per_page(tmp_path):
+    registry = TextureRegistry()
+    key = registry.register_file(write_page(tmp_path / "a.png", (1, 2, 3, 255)))
+    other = registry.register_file(write_page(tmp_path / "b.png", (4, 5, 6, 255)))
+    started = threading.Event()
+    calls = []
+    loader = registry.pages[key].loader
+
+    def slow_loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return loader()
+
+    registry.pages[key].loader = slow_loader
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get(key))) for _ in range(3)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    # صفحه دیگر در حین رمزگشایی صفحه کند در دسترس است
+    begin = time.perf_counter()
+    registry.get(other)
+    assert time.perf_counter() - begin < 0.15
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and len(results) == 3 and all(image is results[0] for image in results)
@@ -0,0 +1,53 @@
+"""نمای کاشی‌ای (TiledCanvas): کش کاشی‌ها و رندر دوباره فقط ردیف تغییرکرده"""
+import pytest
+from benchmarks.synthetic_font import sample_text
+from font import MonoGameFont
+from tiled_view import RowLayout, TileBuffers, TiledCanvas, render_tile
+
+BACKGROUND = (50, 50, 50, 255)
+
+
+@pytest.fixture
+def canvas():
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    canvas = TiledCanvas()
+    canvas.resize(800, 400)
+    canvas.show()
+    app.processEvents()
+    yield canvas
+    canvas.tile_pool.waitForDone()
+    canvas.close()
+
+
+def test_only_changed_row_is_rendered_again(canvas, synthetic_font):
+    fnt_file, folder = synthetic_font
+    fonts = [MonoGameFont(fnt_file, folder, use_cache=False) for _ in range(3)]
+    texts = [sample_text(30, 500, seed=i) for i in range(3)]
+    canvas.set_rows(fonts, texts, BACKGROUND)
+    canvas.wait_for_tiles()
+    tiles_per_row = [sum(1 for row, _, _ in canvas.visible_tiles() if row.font is font) for font in fonts]
+    assert canvas.misses == canvas.tiles_rendered == sum(tiles_per_row)
+    first_misses, first_rendered = canvas.misses, canvas.tiles_rendered
+
+    hits = canvas.hits
+    canvas.set_rows(fonts, [texts[0] + "a"] + texts[1:], BACKGROUND)
+    canvas.wait_for_tiles()
+    assert canvas.misses - first_misses == tiles_per_row[0]
+    assert canvas.tiles_rendered - first_rendered == tiles_per_row[0]
+    assert canvas.hits - hits >= sum(tiles_per_row[1:])
+    assert "عدم برخورد" in canvas.stats_text()
+
+
+def test_reused_tile_buffers_match_fresh_images(synthetic_font):
+    fnt_file, folder = synthetic_font
+    font = MonoGameFont(fnt_file, folder, use_cache=False)
+    buffers = TileBuffers()
+    for seed, (background, highlight) in enumerate([(BACKGROUND, None), ((0, 0, 0, 0), (255, 0, 0, 128)),
+                                                     (BACKGROUND, (255, 0, 0, 128))]):
+        row = RowLayout(font, sample_text(200, 500, seed=seed) + "☃")
+        for column in range(3):
+            reused = render_tile(row, column, background, highlight, buffers)
+            fresh = render_tile(row, column, background, highlight)
+            assert reused.data == fresh.data
+    assert buffers.allocations < 9
@@ -0,0 +1,103 @@
+"""خواندن SpriteFont از فایل‌های .xnb فشرده با LZX و LZ4 (xnb_reader و lzx_decoder)"""
+import hashlib
+import os
+import random
+import shutil
+import pytest
+from PIL import Image
+import xnb_reader
+from font import MonoGameFont
+from tests.fixtures.make_xnb_fixtures import CHARACTERS, lzx_compress, reference_lz4_block, wrap_xnb
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+COMPRESSED = ("spritefont_lzx.xnb", "spritefont_lz4.xnb")
+# فشرده‌شده با ابزار مرجع lz4 1.9.4 و نه فشرده‌ساز make_xnb_fixtures: (تعداد گلیف، sha256 پیکسل‌های RGBA صفحه)
+REFERENCE_LZ4 = ("spritefont_lz4_reference.xnb", 99, "fc2731e8e30c6c74883e41ffa8bbedf0ec44e5bd4b5cb8dfb2a98362e697eb5f")
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES, name)
+
+
+def read_fixture(name):
+    with open(fixture_path(name), "rb") as f:
+        return f.read()
+
+
+def expected_texture():
+    """اطلس مرجع پس از رفت و برگشت پیش‌ضرب آلفا، همان‌طور که در .xnb ذخیره شده است"""
+    atlas = Image.open(fixture_path("spritefont_atlas.png")).convert("RGBA")
+    return Image.frombytes("RGBa", atlas.size, atlas.convert("RGBa").tobytes()).convert("RGBA")
+
+
+def test_lzx_payload_matches_lz4():
+    lzx_payload = xnb_reader.read_xnb_payload(read_fixture("spritefont_lzx.xnb"))
+    assert len(lzx_payload) > 1 << 16  # پنجره LZX دست‌کم یک بار دور زده می‌شود
+    assert lzx_payload == xnb_reader.read_xnb_payload(read_fixture("spritefont_lz4.xnb"))
+
+
+@pytest.mark.parametrize("name", COMPRESSED)
+def test_read_spritefont(name):
+    content, texture = xnb_reader.read_xnb_spritefont(fixture_path(name))
+    assert content["characterMap"] == CHARACTERS
+    assert content["glyphs"][3] == {"x": 24, "y": 0, "width": 7, "height": 11}
+    assert content["cropping"][5] == {"x": 0, "y": 1, "width": 7, "height": 11}
+    assert content["kerning"][:2] == [{"x": 0.0, "y": 5.0, "z": 0.0}, {"x": 0.0, "y": 7.0, "z": 1.0}]
+    assert content["verticalLineSpacing"] == 10
+    assert content["defaultCharacter"] == "?"
+    assert texture.size == (128, 144)
+    assert texture.tobytes() == expected_texture().tobytes()
+
+
+def test_reference_lz4_fixture():
+    name, glyph_count, page_hash = REFERENCE_LZ4
+    content, texture = xnb_reader.read_xnb_spritefont(fixture_path(name))
+    assert len(content["characterMap"]) == len(content["glyphs"]) == glyph_count
+    assert hashlib.sha256(texture.tobytes()).hexdigest() == page_hash
+    assert xnb_reader.read_xnb_payload(read_fixture(name)) == xnb_reader.read_xnb_payload(
+        read_fixture("spritefont_lz4.xnb"))
+
+
+def test_uncompressed_payload_matches():
+    payload = xnb_reader.read_xnb_payload(read_fixture("spritefont_lzx.xnb"))
+    assert xnb_reader.read_xnb_payload(wrap_xnb(payload)) == payload
+
+
+def test_font_renders_from_lzx(tmp_path):
+    shutil.copy(fixture_path("spritefont_lzx.xnb"), tmp_path)
+    shutil.copy(fixture_path("spritefont_lz4.xnb"), tmp_path)
+    lzx = MonoGameFont(str(tmp_path / "spritefont_lzx.xnb"), str(tmp_path), use_cache=False)
+    lz4 = MonoGameFont(str(tmp_path / "spritefont_lz4.xnb"), str(tmp_path), use_cache=False)
+    assert len(lzx.chars) == len(CHARACTERS)
+    for text in ("Hello, World!", "ب€ß پ"):
+        assert lzx.measure_text(text) == lz4.measure_text(text)
+        assert lzx.render_text(text).tobytes() == lz4.render_text(text).tobytes()
+
+
+def e8_sample(size, seed):
+    """داده شبیه کد x86: دستور call (0xE8) با فاصله‌های نسبی کوچک لابه‌لای بایت‌های تکراری"""
+    rng = random.Random(seed)
+    data = bytearray()
+    while len(data) < size:
+        if rng.random() < 0.2:
+            data += b"\xE8" + rng.randint(-5000, 5000).to_bytes(4, "little", signed=True)
+        else:
+            data += bytes(rng.choice((b"\x00" * 7, b"\x8B\x45\x08", b"\x90", bytes([rng.randrange(256)]))))
+    return bytes(data[:size])
+
+
+@pytest.mark.skipif(shutil.which("lz4") is None, reason="ابزار lz4 نصب نیست")
+@pytest.mark.parametrize("level", (1, 12))
+def test_lz4_reference_round_trip(level):
+    # سطح HC تطبیق‌های بلندتر و هم‌پوشان بیشتری از سطح پیش‌فرض می‌سازد
+    data = e8_sample(300000, 3) + bytes(5000) + b"ab" * 3000
+    assert xnb_reader._decompress_lz4(reference_lz4_block(data, level), len(data)) == data
+
+
+@pytest.mark.parametrize("e8_file_size", (0, 1 << 20))
+def test_lzx_round_trip_all_blocks(e8_file_size):
+    data = e8_sample(100000, e8_file_size)
+    blocks = [("aligned", 30000), ("verbatim", 5001), ("uncompressed", 1001), ("aligned", 40000), ("verbatim", 23998)]
+    packed = lzx_compress(data, blocks, e8_file_size)
+    assert xnb_reader._decompress_lzx(packed, len(data)) == data
+
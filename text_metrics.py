@@ -0,0 +1,218 @@
+"""اندازه‌گیری متن بدون رندر، با جدول‌های فشرده به ازای هر کدپوینت."""
+from array import array
+from itertools import accumulate
+
+# ابعاد تصویر جایگزین render_text وقتی هیچ گلیف قابل رندری نباشد
+EMPTY_SIZE = (100, 20)
+# متن‌های بلندتر از این در layout و cursor_positions با NumPy پردازش می‌شوند
+NUMPY_MIN_LENGTH = 2000
+# بخش متراکم جدول‌ها دست‌کم این تعداد کدپوینت را می‌پوشاند و بیشتر از DENSE_FACTOR برابر
+# تعداد گلیف‌ها نمی‌شود؛ کدپوینت‌های بزرگ‌تر هر کدام یک خانه جدا در انتهای جدول دارند
+DENSE_MIN_SIZE = 0x3000
+DENSE_FACTOR = 64
+
+
+def dense_size(ids):
+    """
+    اندازه بخش متراکم جدول کدپوینت‌های ids: کدپوینت‌های کوچک‌تر از آن خودشان اندیس‌اند.
+
+    یک گلیف در U+1F600 یا ناحیه کاربرد خصوصی جدول را بزرگ نمی‌کند و فقط یک خانه جدا می‌گیرد.
+    """
+    limit = max(DENSE_MIN_SIZE, DENSE_FACTOR * len(ids))
+    return max((cid for cid in ids if cid < limit), default=-1) + 1
+
+
+def codepoint_index(codes, size, sparse_ids):
+    """
+    اندیس آرایه NumPy کدپوینت‌های codes در جدولی با بخش متراکم size، خانه size برای
+    کدپوینت‌های ناموجود و سپس یک خانه برای هر عضو sparse_ids (مرتب، همه >= size).
+    """
+    import numpy as np
+
+    index = np.minimum(codes, size).astype(np.intp)
+    if sparse_ids.size:
+        outside = np.flatnonzero(codes >= size)
+        if outside.size:
+            pos = np.minimum(np.searchsorted(sparse_ids, codes[outside]), sparse_ids.size - 1)
+            found = sparse_ids[pos] == codes[outside]
+            index[outside[found]] = size + 1 + pos[found]
+    return index
+
+
+class TextMetrics:
+    """
+    جدول‌های متراکم advance، بالا و پایین هر کدپوینت که از ستون‌های GlyphTable فونت ساخته می‌شوند.
+
+    قواعد دقیقاً همان render_text است: کاراکتر ناموجود به اندازه فاصله جلو می‌رود،
+    گلیف بدون صفحه تصویر فقط advance دارد و اگر هیچ گلیفی رندر نشود اندازه (100, 20) است.
+    """
+
+    def __init__(self, font):
+        table = font.chars
+        space_row = table.row(ord(" "))
+        self.missing_advance = table.xadvance[space_row] if space_row >= 0 else 0
+        size = dense_size(table.id)
+        self.size = size
+        # خانه size برای همه کدپوینت‌های ناموجود خارج از بخش متراکم و پس از آن خانه کدپوینت‌های بزرگ‌تر
+        self.sparse = {cid: slot for slot, cid in enumerate(sorted(cid for cid in table.id if cid >= size), size + 1)}
+        slots = size + 1 + len(self.sparse)
+        self.advance = array('i', [self.missing_advance]) * slots
+        self.top = array('i', [0]) * slots
+        self.bottom = array('i', [0]) * slots
+        self.renderable = array('b', [0]) * slots
+        self.defined = array('b', [0]) * slots
+        loaded = {pid for pid, key in font.pages.items() if key is not None}
+        # بیشترین فاصله‌ای که تصویر یک گلیف از بازه [مکان‌نما، مکان‌نما + advance] بیرون می‌زند
+        overhang = 0
+        for cid, xadvance, yoffset, height, page, xoffset, width in zip(
+                table.id, table.xadvance, table.yoffset, table.height, table.page, table.xoffset, table.width):
+            slot = cid if cid < size else self.sparse[cid]
+            self.advance[slot] = xadvance
+            self.defined[slot] = 1
+            if page in loaded:
+                self.top[slot] = -yoffset
+                self.bottom[slot] = height + yoffset
+                self.renderable[slot] = 1
+                overhang = max(overhang, -xoffset, xoffset + width - xadvance)
+        self.overhang = overhang
+        self._numpy_tables = None
+        self._sparse_ids = None
+
+    def slot(self, cid):
+        """خانه کدپوینت cid در جدول‌ها"""
+        return cid if cid < self.size else self.sparse.get(cid, self.size)
+
+    def measure_text(self, text):
+        """(عرض, ارتفاع) تصویری که render_text برای این متن می‌سازد"""
+        width, max_top, max_bottom, rendered = self.layout(text)
+        height = max_top + max_bottom
+        if height == 0 or not rendered:
+            return EMPTY_SIZE
+        return width, height
+
+    def layout(self, text):
+        """
+        (عرض، بالای خط پایه، پایین خط پایه، آیا گلیفی رندر می‌شود) با همان قواعد render_text.
+
+        اگر گلیفی رندر نشود یا ارتفاع صفر باشد، render_text به جای آن تصویر EMPTY_SIZE می‌سازد.
+        """
+        if len(text) >= NUMPY_MIN_LENGTH:
+            advance, top, bottom, renderable = self.numpy_tables()
+            index = self._numpy_index(text)
+            return (int(advance[index].sum(dtype='int64')), max(0, int(top[index].max())),
+                    max(0, int(bottom[index].max())), bool(renderable[index].any()))
+        size = self.size
+        sparse = self.sparse
+        advance = self.advance
+        top = self.top
+        bottom = self.bottom
+        renderable = self.renderable
+        width = 0
+        max_top = 0
+        max_bottom = 0
+        rendered = False
+        for ch in text:
+            cid = ord(ch)
+            if cid >= size:
+                cid = sparse.get(cid, size)
+            width += advance[cid]
+            if renderable[cid]:
+                rendered = True
+                if top[cid] > max_top:
+                    max_top = top[cid]
+                if bottom[cid] > max_bottom:
+                    max_bottom = bottom[cid]
+        return width, max_top, max_bottom, rendered
+
+    def cursor_positions(self, text):
+        """array مکان‌نمای شروع هر کاراکتر در خروجی render_text؛ خانه آخر عرض کل است"""
+        if len(text) >= NUMPY_MIN_LENGTH:
+            import numpy as np
+
+            cursors = np.zeros(len(text) + 1, dtype=np.int32)
+            np.cumsum(self.numpy_tables()[0][self._numpy_index(text)], out=cursors[1:])
+            result = array('i')
+            result.frombytes(cursors.tobytes())
+            return result
+        size = self.size
+        sparse = self.sparse
+        advance = self.advance
+        return array('i', accumulate((advance[cid if cid < size else sparse.get(cid, size)]
+                                      for cid in map(ord, text)), initial=0))
+
+    def numpy_tables(self):
+        """جدول‌های advance، بالا، پایین و قابل رندر بودن به صورت آرایه NumPy روی همان حافظه"""
+        if self._numpy_tables is None:
+            import numpy as np
+
+            self._numpy_tables = tuple(
+                np.frombuffer(table, dtype=np.int32 if table.typecode == 'i' else np.int8)
+                for table in (self.advance, self.top, self.bottom, self.renderable)
+            )
+        return self._numpy_tables
+
+    def _numpy_index(self, text):
+        import numpy as np
+
+        codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        return self._index_codes(codes)
+
+    def _index_codes(self, codes):
+        import numpy as np
+
+        if self._sparse_ids is None:
+            self._sparse_ids = np.fromiter(self.sparse, dtype=np.uint32, count=len(self.sparse))
+        return codepoint_index(codes, self.size, self._sparse_ids)
+
+    def missing_spans(self, text):
+        """فهرست (x, عرض) جای کاراکترهای بدون گلیف در خروجی render_text"""
+        size = self.size
+        sparse = self.sparse
+        advance = self.advance
+        defined = self.defined
+        spans = []
+        x = 0
+        for ch in text:
+            cid = ord(ch)
+            if cid >= size:
+                cid = sparse.get(cid, size)
+            if not defined[cid]:
+                spans.append((x, advance[cid]))
+            x += advance[cid]
+        return spans
+
+    def measure_many(self, texts):
+        """
+        اندازه‌گیری برداری یک دسته متن با NumPy در یک گذر.
+
+        Returns:
+            tuple: (آرایه عرض‌ها, آرایه ارتفاع‌ها) به ترتیب texts
+        """
+        import numpy as np
+
+        advance, top, bottom, renderable = self.numpy_tables()
+
+        texts = list(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        # surrogatepass: نیم‌جانشین تنها مانند measure_text یک کاراکتر ناموجود است، نه خطا
+        codes = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        index = self._index_codes(codes)
+
+        widths = np.zeros(len(texts), dtype=np.int64)
+        heights = np.zeros(len(texts), dtype=np.int64)
+        nonempty = lengths > 0
+        if codes.size:
+            starts = (np.cumsum(lengths) - lengths)[nonempty]
+            widths[nonempty] = np.add.reduceat(advance[index].astype(np.int64), starts)
+            max_top = np.maximum(np.maximum.reduceat(top[index], starts), 0)
+            max_bottom = np.maximum(np.maximum.reduceat(bottom[index], starts), 0)
+            heights[nonempty] = max_top + max_bottom
+            rendered = np.zeros(len(texts), dtype=bool)
+            rendered[nonempty] = np.maximum.reduceat(renderable[index], starts) > 0
+        else:
+            rendered = np.zeros(len(texts), dtype=bool)
+
+        empty = (heights == 0) | ~rendered
+        widths[empty] = EMPTY_SIZE[0]
+        heights[empty] = EMPTY_SIZE[1]
+        return widths, heights
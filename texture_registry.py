@@ -0,0 +1,301 @@
+"""
+ثبت مشترک تصویر صفحه‌های فونت در کل برنامه.
+
+صفحه‌ها بر اساس مسیر واقعی فایل (همراه اندازه و زمان تغییر آن) و هش محتوا یکی
+می‌شوند، فقط در اولین دسترسی به یک گلیف رمزگشایی می‌شوند و اگر حافظه صفحه‌های
+رمزگشایی‌شده از سقف بیشتر شود قدیمی‌ترین صفحه‌هایی که در فریم در حال رندر استفاده
+نشده‌اند آزاد می‌شوند. هر ثبت یک ارجاع است و صفحه‌ای که همه فونت‌هایش release
+کرده‌اند کاملاً حذف می‌شود.
+
+صفحه آزادشده هیچ داده‌ای نگه نمی‌دارد: بارگذار آن فایل را دوباره از دیسک می‌خواند.
+رمزگشایی بیرون از قفل رجیستری انجام می‌شود تا صفحه بزرگ یک فونت بقیه را معطل نکند؛
+درخواست‌های هم‌زمان یک صفحه منتظر همان یک رمزگشایی (Future) می‌مانند.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from profiling import stage
+
+# سقف حافظه صفحه‌های رمزگشایی‌شده (بایت)؛ با MGFONT_TEXTURE_BUDGET_MB قابل تغییر است
+TEXTURE_MEMORY_BUDGET = int(os.environ.get("MGFONT_TEXTURE_BUDGET_MB", "512")) * 1024 * 1024
+
+
+# اندازه تکه‌های خواندن فایل برای هش محتوا
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+# PIL فقط هنگام ثبت یا رمزگشایی صفحه وارد می‌شود تا وارد کردن این ماژول (مثلاً در ui) شروع برنامه را کند نکند
+def _decode_file(path):
+    from PIL import Image
+    with Image.open(path) as im:
+        return im.convert("RGBA")
+
+
+def _hash_file(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_stamp(path):
+    """(اندازه، زمان تغییر) فایل یا None اگر فایل وجود ندارد"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class TexturePage:
+    __slots__ = ("key", "loader", "width", "height", "image", "arrays")
+
+    def __init__(self, key, loader, width, height, image=None):
+        self.key = key
+        self.loader = loader
+        self.width = width
+        self.height = height
+        self.image = image
+        self.arrays = {}  # نام -> (tag، آرایه NumPy ساخته‌شده از image)؛ get_array
+
+    @property
+    def nbytes(self):
+        return self.width * self.height * 4 + sum(array.nbytes for _, array in self.arrays.values())
+
+
+class TextureRegistry:
+    """
+    صفحه‌های ثبت‌شده با یک کلید شناخته می‌شوند که فونت به جای تصویر نگه می‌دارد؛
+    get(key) تصویر RGBA را (در صورت نیاز پس از رمزگشایی) برمی‌گرداند.
+
+    بین begin_frame و end_frame صفحه‌های استفاده‌شده آزاد نمی‌شوند تا صفحه‌های
+    ردیف‌های در حال نمایش جای خود را به هم ندهند.
+    """
+
+    def __init__(self, budget=TEXTURE_MEMORY_BUDGET):
+        self.budget = budget
+        self.pages = {}
+        self.decoded = OrderedDict()  # کلید صفحه‌های رمزگشایی‌شده به ترتیب LRU
+        self.decoded_bytes = 0
+        self.paths = {}  # مسیر واقعی -> (مهر فایل هنگام ثبت، کلید)
+        self.hashes = {}
+        self.refs = {}
+        self.frame_keys = None
+        self.loading = {}  # کلید -> Future رمزگشایی در حال انجام
+        self.loads = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+
+    def register_file(self, path):
+        """
+        ثبت یک فایل تصویر بدون رمزگشایی (فقط سرآیند خوانده می‌شود).
+
+        فایلی که پس از ثبت قبلی تغییر کرده (اندازه یا زمان تغییر متفاوت) دوباره خوانده
+        می‌شود. محتوای فایل فقط برای هش (تکه‌تکه) خوانده و نگه داشته نمی‌شود؛ رمزگشایی
+        بعدی فایل را از مسیری می‌خواند که مهرش از زمان ثبت تغییر نکرده است (_read_page).
+
+        Returns:
+            str: کلید صفحه؛ فایل تکراری (همان مسیر یا همان محتوا) کلید قبلی را می‌گیرد
+        """
+        real_path = os.path.realpath(path)
+        # مهر پیش از خواندن گرفته می‌شود تا نوشتنِ هم‌زمان در ثبت بعدی دیده شود
+        stamp = file_stamp(real_path)
+        with self.lock:
+            entry = self.paths.get(real_path)
+            if entry is not None and entry[0] == stamp:
+                return self._acquire(entry[1])
+        digest = _hash_file(real_path)
+        from PIL import Image
+        with Image.open(real_path) as im:
+            width, height = im.size
+        with self.lock:
+            key = self.hashes.get(digest)
+            if key is None:
+                key = digest
+                self.pages[key] = TexturePage(key, lambda: self._read_page(key, real_path), width, height)
+                self.hashes[digest] = key
+            self.paths[real_path] = (stamp, key)
+            return self._acquire(key)
+
+    def register_image(self, image, path, loader, stamp=None):
+        """
+        ثبت تصویری که از قبل در حافظه است (مثلاً صفحه داخل .xnb یا صفحه کش دیسکی).
+
+        Args:
+            image (Image): تصویر فعلی صفحه
+            path (str): شناسه یکتای منبع صفحه (مسیر فایل)
+            loader (callable): بازسازی تصویر پس از آزاد شدن
+            stamp (tuple): مهر فایلی که تصویر از آن آمده (file_stamp)؛ منبع با مهر دیگر صفحه جدا می‌گیرد
+        """
+        real_path = os.path.realpath(path)
+        stamp = tuple(stamp) if stamp is not None else None
+        with self.lock:
+            entry = self.paths.get(real_path)
+            if entry is not None and entry[0] == stamp:
+                return self._acquire(entry[1])
+            key = real_path if stamp is None else f"{real_path}|{stamp[0]}:{stamp[1]}"
+            if key not in self.pages:
+                page = TexturePage(key, loader, image.width, image.height)
+                self.pages[key] = page
+                self._store(page, image.convert("RGBA") if image.mode != "RGBA" else image)
+            self.paths[real_path] = (stamp, key)
+            return self._acquire(key)
+
+    def _read_page(self, key, path):
+        """
+        رمزگشایی دوباره صفحه ثبت‌شده با register_file از یکی از مسیرهایش که از زمان ثبت
+        تغییر نکرده است؛ اگر همه تغییر کرده باشند محتوای فعلی path خوانده می‌شود و
+        بارگذاری دوباره فونت (FontWatcher) صفحه تازه را ثبت می‌کند.
+        """
+        with self.lock:
+            paths = [(other, stamp) for other, (stamp, page_key) in self.paths.items() if page_key == key]
+        for other, stamp in paths:
+            if file_stamp(other) == stamp:
+                path = other
+                break
+        return _decode_file(path)
+
+    def _acquire(self, key):
+        self.refs[key] = self.refs.get(key, 0) + 1
+        return key
+
+    def release(self, key):
+        """
+        پایان استفاده یک فونت از صفحه key (هر register یک release)؛ صفحه بدون ارجاع
+        همراه مسیرها و هش آن حذف می‌شود.
+        """
+        with self.lock:
+            count = self.refs.get(key, 0) - 1
+            if count > 0:
+                self.refs[key] = count
+                return
+            self.refs.pop(key, None)
+            if self.pages.pop(key, None) is None:
+                return
+            self._release(key)
+            self.hashes.pop(key, None)
+            for path in [path for path, (_, page_key) in self.paths.items() if page_key == key]:
+                del self.paths[path]
+
+    def get(self, key):
+        """
+        تصویر RGBA صفحه؛ در اولین دسترسی یا پس از آزاد شدن دوباره بارگذاری می‌شود.
+
+        رمزگشایی بیرون از قفل است؛ نخ‌های دیگری که همان صفحه را بخواهند منتظر همین
+        رمزگشایی می‌مانند و خطای آن به همه‌شان می‌رسد.
+        """
+        with self.lock:
+            page = self.pages[key]
+            if self.frame_keys is not None:
+                self.frame_keys.add(key)
+            if page.image is not None:
+                self.decoded.move_to_end(key)
+                return page.image
+            future = self.loading.get(key)
+            if future is None:
+                future = self.loading[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return future.result()
+
+        try:
+            with stage("png_decode", "load"):
+                image = page.loader()
+        except BaseException as e:
+            with self.lock:
+                self.loading.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self.lock:
+            self.loading.pop(key, None)
+            self.loads += 1
+            # صفحه‌ای که در این فاصله release یا دوباره ثبت شده است ذخیره نمی‌شود
+            if self.pages.get(key) is page and page.image is None:
+                self._store(page, image)
+        future.set_result(image)
+        return image
+
+    def get_array(self, key, name, build, tag=None):
+        """
+        آرایه NumPy ساخته‌شده از تصویر صفحه key، مانند پیکسل‌های اطلس موتور numpy.
+
+        آرایه کنار تصویر صفحه نگه داشته می‌شود، حجمش در سقف حافظه حساب می‌شود و همراه
+        صفحه آزاد می‌شود. برای هر name یک tag نگه داشته می‌شود و tag دیگر آرایه قبلی را
+        جایگزین می‌کند.
+
+        Args:
+            build (callable): build(image) آرایه را از تصویر RGBA صفحه می‌سازد
+        """
+        with self.lock:
+            page = self.pages[key]
+            entry = page.arrays.get(name)
+            if entry is not None and entry[0] == tag:
+                if self.frame_keys is not None:
+                    self.frame_keys.add(key)
+                self.decoded.move_to_end(key)
+                return entry[1]
+        image = self.get(key)
+        array = build(image)
+        with self.lock:
+            # صفحه‌ای که در این فاصله آزاد یا دوباره ثبت شده است آرایه را نگه نمی‌دارد
+            if self.pages.get(key) is page and page.image is image:
+                old = page.arrays.get(name)
+                self.decoded_bytes += array.nbytes - (old[1].nbytes if old else 0)
+                page.arrays[name] = (tag, array)
+                self.decoded.move_to_end(key)
+                self._evict()
+        return array
+
+    def _store(self, page, image):
+        page.image = image
+        page.width, page.height = image.size
+        self.decoded[page.key] = page
+        self.decoded_bytes += page.nbytes
+        self._evict()
+
+    def _release(self, key):
+        page = self.decoded.pop(key, None)
+        if page is not None:
+            self.decoded_bytes -= page.nbytes
+            page.image = None
+            page.arrays = {}
+
+    def _evict(self):
+        if self.decoded_bytes <= self.budget:
+            return
+        protected = self.frame_keys or ()
+        # آخرین صفحه همان است که تازه خواسته شده و هرگز آزاد نمی‌شود
+        for key in list(self.decoded)[:-1]:
+            if self.decoded_bytes <= self.budget:
+                break
+            if key in protected:
+                continue
+            self._release(key)
+            self.evictions += 1
+
+    def begin_frame(self):
+        """شروع رندر یک فریم؛ صفحه‌های استفاده‌شده تا end_frame آزاد نمی‌شوند"""
+        with self.lock:
+            self.frame_keys = set()
+
+    def end_frame(self):
+        with self.lock:
+            self.frame_keys = None
+            self._evict()
+
+    def set_budget(self, budget):
+        with self.lock:
+            self.budget = budget
+            self._evict()
+
+    def stats_text(self):
+        return (f"صفحه‌ها: {len(self.decoded)}/{len(self.pages)} در حافظه، "
+                f"{self.decoded_bytes / (1024 * 1024):.1f} از {self.budget / (1024 * 1024):.0f} MiB")
+
+
+default_registry = TextureRegistry()
@@ -0,0 +1,336 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from PyQt5.QtWidgets import QAbstractScrollArea, QApplication
+from PyQt5.QtGui import QPainter, QImage, QColor
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QPointF, QRectF, pyqtSignal
+from PIL import Image
+from text_metrics import EMPTY_SIZE
+from profiling import stage
+
+# عرض هر کاشی در مختصات بدون زوم (پیکسل)
+TILE_WIDTH = 512
+# سقف حافظه کاشی‌های رندرشده (بایت)
+TILE_CACHE_BYTES = 64 * 1024 * 1024
+# تعداد اندازه‌های کاشی که تصویر رندر آن‌ها برای کاشی‌های بعدی نگه داشته می‌شود
+TILE_BUFFER_SIZES = 8
+
+class RowLayout:
+    """چیدمان یک ردیف: ابعاد تصویر render_text و خط پایه آن، بدون رندر"""
+    __slots__ = ("font", "revision", "text", "width", "height", "max_top", "cursors")
+
+    def __init__(self, font, text):
+        self.font = font
+        self.revision = font.revision
+        self.text = text
+        metrics = font.get_metrics()
+        width, max_top, max_bottom, rendered = metrics.layout(text)
+        if rendered and max_top + max_bottom:
+            self.width, self.height = width, max_top + max_bottom
+        else:
+            self.width, self.height = EMPTY_SIZE
+        self.max_top = max_top
+        self.cursors = None
+
+    def tile_image(self, x0, width, background_color, highlight_color, out=None):
+        if self.cursors is None:
+            self.cursors = self.font.get_metrics().cursor_positions(self.text)
+        return self.font.render_region(self.text, self.cursors, x0, (width, self.height), self.max_top,
+                                       background_color, highlight_color, out)
+
+class TileBuffers:
+    """
+    تصویرهای RGBA رندر کاشی که بین کاشی‌ها و فریم‌ها دوباره استفاده می‌شوند.
+
+    کاشی‌های یک ردیف (به جز آخرین ستون) هم‌اندازه‌اند و ارتفاع ردیف‌ها چند مقدار بیشتر
+    ندارد، پس برای هر اندازه یک تصویر نگه داشته می‌شود (حداکثر limit اندازه به ترتیب LRU)
+    و تصویر تازه فقط برای اندازه تازه ساخته می‌شود. فقط از نخ رندر کاشی‌ها استفاده می‌شود.
+    """
+
+    def __init__(self, limit=TILE_BUFFER_SIZES):
+        self.limit = limit
+        self.images = OrderedDict()
+        self.allocations = 0
+
+    def get(self, size):
+        image = self.images.get(size)
+        if image is None:
+            image = self.images[size] = Image.new("RGBA", size)
+            self.allocations += 1
+            while len(self.images) > self.limit:
+                self.images.popitem(last=False)
+        self.images.move_to_end(size)
+        return image
+
+class Tile:
+    """کاشی رندرشده: QImage مستقیماً روی بایت‌های RGBA ساخته می‌شود و بایت‌ها کنار آن می‌مانند"""
+    __slots__ = ("image", "data")
+
+    def __init__(self, img):
+        # تنها تخصیص هر کاشی همین tobytes است (img بافر مشترک TileBuffers است)؛ QImage بایت‌ها را
+        # کپی نمی‌کند و بدون تبدیل به QPixmap رسم می‌شود
+        self.data = img.tobytes("raw", "RGBA")
+        self.image = QImage(self.data, img.width, img.height, img.width * 4, QImage.Format_RGBA8888)
+
+    @property
+    def nbytes(self):
+        return len(self.data)
+
+def render_tile(row, column, background_color, highlight_color, buffers=None):
+    """
+    رندر یک کاشی بدون هیچ شیء رابط کاربری؛ در نخ پس‌زمینه اجرا می‌شود.
+
+    با buffers (TileBuffers) کاشی در تصویری از پیش ساخته رندر می‌شود و تنها تخصیص آن
+    بایت‌های خود کاشی است.
+    """
+    x0 = column * TILE_WIDTH
+    width = min(TILE_WIDTH, row.width - x0)
+    out = buffers.get((width, row.height)) if buffers is not None else None
+    # صفحه‌های فونت تا پایان رندر کاشی از textures آزاد نمی‌شوند
+    registry = row.font.textures
+    registry.begin_frame()
+    try:
+        return Tile(row.tile_image(x0, width, background_color, highlight_color, out))
+    finally:
+        registry.end_frame()
+
+class TileSignals(QObject):
+    # (کلید کاشی، Tile یا None اگر کاشی دیگر لازم نبود، پیام خطا یا "")
+    finished = pyqtSignal(object, object, str)
+
+class TileJob(QRunnable):
+    """
+    رندر یک کاشی در QThreadPool.
+
+    اگر پیش از شروع، کاشی دیگر در دید نباشد (is_wanted برابر False) رندر نمی‌شود؛ پس
+    اسکرول سریع یا تایپ پشت‌سرهم صف کارهای کهنه را بی‌هزینه خالی می‌کند.
+    """
+
+    def __init__(self, key, row, column, is_wanted, signals, buffers=None):
+        super().__init__()
+        self.key = key
+        self.row = row
+        self.column = column
+        self.is_wanted = is_wanted
+        self.signals = signals
+        self.buffers = buffers
+
+    def run(self):
+        tile = None
+        error = ""
+        if self.is_wanted(self.key):
+            background_color, highlight_color = self.key[3], self.key[4]
+            try:
+                with stage("render_tile"):
+                    tile = render_tile(self.row, self.column, background_color, highlight_color, self.buffers)
+            except Exception as e:
+                print(f"خطا در رندر کاشی: {e}")
+                error = str(e)
+        self.signals.finished.emit(self.key, tile, error)
+
+class TiledCanvas(QAbstractScrollArea):
+    """
+    نمایش مجازی ردیف‌های رندرشده: فقط کاشی‌هایی که با ناحیه دیدنی هم‌پوشانی دارند رندر می‌شوند.
+
+    هر ردیف به کاشی‌هایی به عرض TILE_WIDTH (بدون زوم) تقسیم می‌شود. ابعاد ردیف‌ها با
+    TextMetrics و بدون رندر محاسبه می‌شوند، کاشی‌ها بدون زوم در یک کش LRU با سقف حافظه
+    نگه داشته می‌شوند و زوم فقط تبدیل QPainter هنگام رسم است. پس حافظه و زمان هر فریم
+    به اندازه پنجره بستگی دارد، نه به طول متن یا تعداد فونت‌ها.
+
+    paintEvent هیچ رندری انجام نمی‌دهد: کاشی‌های نبود در کش با TileJob در یک نخ
+    پس‌زمینه رندر می‌شوند و تا رسیدنشان جای آن‌ها با رنگ پس‌زمینه پر می‌شود. نخ
+    پس‌زمینه یکی است تا کش گلیف فونت‌ها هم‌زمان تغییر نکند.
+    """
+    # همه کاشی‌های دیدنی رسم شده‌اند (یک بار پس از هر set_rows)
+    frame_ready = pyqtSignal()
+
+    def __init__(self, parent=None, cache_bytes=TILE_CACHE_BYTES):
+        super().__init__(parent)
+        self.rows = []
+        self.row_tops = [0]
+        self.content_width = 0
+        self.background_color = (50, 50, 50, 255)
+        self.highlight_color = None
+        self.zoom_factor = 1.0
+        self.smooth = True
+        self.tiles = OrderedDict()
+        self.tiles_bytes = 0
+        self.cache_bytes = cache_bytes
+        self.tiles_rendered = 0
+        self.tiles_drawn = 0
+        # برخورد: کاشی دیدنی از کش رسم شد؛ عدم برخورد: کاشی برای رندر در صف گذاشته شد
+        self.hits = 0
+        self.misses = 0
+        # کلید کاشی‌های در حال رندر و کاشی‌های دیدنی آخرین رسم
+        self.pending = set()
+        self.failed = set()
+        self.wanted = frozenset()
+        # کاشی‌های دیدنی که در آخرین رسم هنوز نرسیده بودند
+        self.missing = 0
+        self.complete = False
+        self.tile_signals = TileSignals(self)
+        self.tile_signals.finished.connect(self.on_tile_finished)
+        self.tile_pool = QThreadPool(self)
+        self.tile_pool.setMaxThreadCount(1)
+        # تنها نخ رندر کاشی‌ها از این بافرها استفاده می‌کند؛ None یعنی تصویر تازه برای هر کاشی
+        self.tile_buffers = TileBuffers()
+
+    def set_rows(self, fonts, texts, background_color, highlight_color=None):
+        """
+        تعیین ردیف‌ها (یک ردیف برای هر فونت)؛ چیدمان ردیف‌های تغییرنکرده دوباره محاسبه نمی‌شود.
+
+        ردیف فونتی که دوباره بارگذاری شده (revision تازه) چیدمان و کاشی‌های تازه می‌گیرد.
+        """
+        previous = {(row.font, row.revision, row.text): row for row in self.rows}
+        self.rows = [previous.get((font, font.revision, text)) or RowLayout(font, text)
+                     for font, text in zip(fonts, texts)]
+        self.row_tops = [0]
+        for row in self.rows:
+            self.row_tops.append(self.row_tops[-1] + row.height)
+        self.content_width = max((row.width for row in self.rows), default=0)
+        self.background_color = tuple(background_color)
+        self.highlight_color = tuple(highlight_color) if highlight_color else None
+        self.complete = False
+        # کاشی‌هایی که رندرشان خطا داده بود با تغییر بعدی دوباره امتحان می‌شوند
+        self.failed.clear()
+        self.update_scrollbars()
+        self.viewport().update()
+
+    def set_zoom(self, zoom_factor, smooth=True):
+        """تغییر زوم؛ هیچ کاشی دوباره رندر نمی‌شود و مرکز دید ثابت می‌ماند"""
+        if zoom_factor == self.zoom_factor and smooth == self.smooth:
+            return
+        h_bar, v_bar = self.horizontalScrollBar(), self.verticalScrollBar()
+        scale = zoom_factor / self.zoom_factor
+        center_x = (h_bar.value() + self.viewport().width() / 2) * scale
+        center_y = (v_bar.value() + self.viewport().height() / 2) * scale
+        self.zoom_factor = zoom_factor
+        self.smooth = smooth
+        self.update_scrollbars()
+        h_bar.setValue(int(center_x - self.viewport().width() / 2))
+        v_bar.setValue(int(center_y - self.viewport().height() / 2))
+        self.viewport().update()
+
+    def content_size(self):
+        """ابعاد محتوا با زوم فعلی"""
+        return (int(self.content_width * self.zoom_factor + 0.5),
+                int(self.row_tops[-1] * self.zoom_factor + 0.5))
+
+    def update_scrollbars(self):
+        width, height = self.content_size()
+        viewport = self.viewport()
+        for bar, total, page in ((self.horizontalScrollBar(), width, viewport.width()),
+                                 (self.verticalScrollBar(), height, viewport.height())):
+            bar.setPageStep(page)
+            bar.setSingleStep(max(1, page // 20))
+            bar.setRange(0, max(0, total - page))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def tile_key(self, row, column):
+        return (row.font, row.revision, row.text, self.background_color, self.highlight_color, column)
+
+    def get_tile(self, row, column):
+        """کاشی از کش، یا None و شروع رندر پس‌زمینه آن"""
+        key = self.tile_key(row, column)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+        if key not in self.pending and key not in self.failed:
+            self.misses += 1
+            self.pending.add(key)
+            self.tile_pool.start(TileJob(key, row, column, self.is_wanted, self.tile_signals, self.tile_buffers))
+        return None
+
+    def is_wanted(self, key):
+        # از نخ پس‌زمینه خوانده می‌شود؛ wanted فقط به‌طور کامل جایگزین می‌شود
+        return key in self.wanted
+
+    def on_tile_finished(self, key, tile, error):
+        self.pending.discard(key)
+        if error:
+            # جای کاشی خالی می‌ماند و فریم بدون آن کامل شمرده می‌شود
+            self.failed.add(key)
+            self.viewport().update()
+        if tile is None:
+            return
+        self.tiles_rendered += 1
+        self.tiles[key] = tile
+        self.tiles_bytes += tile.nbytes
+        while self.tiles_bytes > self.cache_bytes and len(self.tiles) > 1:
+            _, old = self.tiles.popitem(last=False)
+            self.tiles_bytes -= old.nbytes
+        if key in self.wanted:
+            self.viewport().update()
+
+    def wait_for_tiles(self):
+        """رسم و انتظار تا همه کاشی‌های دیدنی رندر و رسم شوند (برای بنچمارک و آزمون)"""
+        self.viewport().repaint()
+        while self.missing:
+            self.tile_pool.waitForDone()
+            QApplication.processEvents()
+            self.viewport().repaint()
+
+    def visible_tiles(self):
+        """(ردیف، ستون، y ردیف) کاشی‌های هم‌پوشان با ناحیه دیدنی، در مختصات بدون زوم"""
+        zoom = self.zoom_factor
+        left = self.horizontalScrollBar().value() / zoom
+        top = self.verticalScrollBar().value() / zoom
+        right = left + self.viewport().width() / zoom
+        bottom = top + self.viewport().height() / zoom
+        first = max(0, bisect_right(self.row_tops, top) - 1)
+        for index in range(first, len(self.rows)):
+            y = self.row_tops[index]
+            if y >= bottom:
+                break
+            row = self.rows[index]
+            last_column = (min(right, row.width) - 1) // TILE_WIDTH
+            for column in range(int(left // TILE_WIDTH), int(last_column) + 1):
+                yield row, column, y
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        with stage("paint"):
+            painter.translate(-self.horizontalScrollBar().value(), -self.verticalScrollBar().value())
+            painter.scale(self.zoom_factor, self.zoom_factor)
+            if self.smooth and self.zoom_factor != 1.0:
+                painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            placeholder = QColor(*self.background_color)
+            visible = list(self.visible_tiles())
+            # پیش از صف کردن کارها، تا کار تازه خودش را کهنه نبیند
+            self.wanted = frozenset(self.tile_key(row, column) for row, column, _ in visible)
+            drawn = 0
+            missing = 0
+            for row, column, y in visible:
+                tile = self.get_tile(row, column)
+                x = column * TILE_WIDTH
+                if tile is None:
+                    painter.fillRect(QRectF(x, y, min(TILE_WIDTH, row.width - x), row.height), placeholder)
+                    missing += self.tile_key(row, column) not in self.failed
+                    continue
+                painter.drawImage(QPointF(x, y), tile.image)
+                drawn += 1
+            self.tiles_drawn = drawn
+            self.missing = missing
+        painter.end()
+        if not missing and not self.complete:
+            self.complete = True
+            self.frame_ready.emit()
+
+    def clear(self):
+        """خالی کردن کش کاشی‌ها (مثلاً پس از بارگذاری دوباره فونت)"""
+        self.tiles.clear()
+        self.tiles_bytes = 0
+        self.failed.clear()
+        self.viewport().update()
+
+    def stats_text(self):
+        return (f"کاشی‌ها: {self.tiles_drawn} در دید، {len(self.tiles)} در کش "
+                f"({self.tiles_bytes / (1024 * 1024):.1f} MiB)، {self.tiles_rendered} رندر، "
+                f"{self.hits} برخورد / {self.misses} عدم برخورد")
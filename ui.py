@@ -1,18 +1,48 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QSlider, QScrollArea,
-    QPushButton, QColorDialog, QMenuBar, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QSlider,
+    QPushButton, QColorDialog, QMenuBar, QMessageBox, QCheckBox, QProgressBar
 )
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+import time
 from font_manager import FontManager
+from texture_registry import default_registry
+from tiled_view import TiledCanvas
+from font_watcher import FontWatcher
+from profiling import profiler
+from stats_panel import StatsPanel
 import recent_files
+import session
+
+# مکث لازم پس از آخرین تغییر متن/رنگ پیش از شروع رندر (میلی‌ثانیه)
+RENDER_DEBOUNCE_MS = 30
+# مکث پس از آخرین حرکت اسلایدر زوم پیش از مقیاس‌دهی نرم (میلی‌ثانیه)
+ZOOM_SETTLE_MS = 120
+# رنگ نیمه‌شفاف جای کاراکترهایی که در فونت گلیف ندارند
+MISSING_GLYPH_COLOR = (255, 0, 80, 110)
 
 class FontRendererWidget(QWidget):
-    def __init__(self, initial_font):
+    def __init__(self, initial_font=None):
         super().__init__()
         self.font_manager = FontManager(initial_font)
         self.background_color = (50, 50, 50, 255)
         self.zoom_factor = 1.0
+        self.smooth_zoom = True
+        self.highlight_missing = False
+        # شروع اولین درخواست رندری که هنوز نمایش داده نشده (perf_counter_ns) برای زمان فریم
+        self.frame_start = None
+
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(RENDER_DEBOUNCE_MS)
+        self.render_timer.timeout.connect(self.refresh_view)
+        self.zoom_timer = QTimer(self)
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(ZOOM_SETTLE_MS)
+        self.zoom_timer.timeout.connect(self.apply_zoom)
+        # بارگذاری دوباره خودکار فونت‌ها پس از تغییر فایل‌هایشان روی دیسک
+        self.font_watcher = FontWatcher(self)
+        self.font_watcher.font_reloaded.connect(self.on_font_reloaded)
+        self.font_watcher.reload_failed.connect(self.on_reload_failed)
         self.init_ui()
 
     def init_ui(self):
@@ -25,9 +55,15 @@ class FontRendererWidget(QWidget):
         file_menu = menubar.addMenu("File")
         file_menu.addAction("Open", self.open_font)
         file_menu.addAction("Add Font", self.add_font)
+        file_menu.addAction("Open Folder", self.open_folder)
         recent_menu = file_menu.addMenu("Open Recent")
         recent_files.populate_recent_menu(recent_menu, self.load_recent)
         file_menu.addAction("Remove All Fonts", self.font_manager.remove_all_fonts)
+        view_menu = menubar.addMenu("View")
+        self.profiling_action = view_menu.addAction("Profiling Stats")
+        self.profiling_action.setCheckable(True)
+        self.profiling_action.setChecked(profiler.enabled)
+        self.profiling_action.toggled.connect(self.on_profiling_toggled)
         main_layout.addWidget(menubar)
 
         # فیلدهای متنی
@@ -46,51 +82,156 @@ class FontRendererWidget(QWidget):
         self.zoom_slider.valueChanged.connect(self.on_zoom_changed)
         zoom_layout.addWidget(zoom_label)
         zoom_layout.addWidget(self.zoom_slider)
+        self.nearest_checkbox = QCheckBox("Pixel Art (Nearest)", self)
+        self.nearest_checkbox.toggled.connect(self.on_nearest_toggled)
+        zoom_layout.addWidget(self.nearest_checkbox)
         controls_layout.addLayout(zoom_layout)
 
+        self.missing_checkbox = QCheckBox("Highlight Missing Glyphs", self)
+        self.missing_checkbox.toggled.connect(self.on_missing_toggled)
+        controls_layout.addWidget(self.missing_checkbox)
+
         color_button = QPushButton("Change Color", self)
         color_button.clicked.connect(self.change_color)
         controls_layout.addWidget(color_button)
 
-        # منطقه نمایش خروجی
-        self.output_label = QLabel(self)
-        self.output_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
-        scroll_area = QScrollArea(self)
-        scroll_area.setWidget(self.output_label)
-        scroll_area.setWidgetResizable(True)
+        # منطقه نمایش خروجی؛ فقط کاشی‌های دیدنی رندر می‌شوند
+        self.canvas = TiledCanvas(self)
+        self.canvas.frame_ready.connect(self.on_frame_ready)
+        # فونت در حال رندر کاشی‌ها در نخ پس‌زمینه بارگذاری دوباره نمی‌شود
+        self.font_watcher.before_reload = self.canvas.tile_pool.waitForDone
 
         main_layout.addLayout(self.text_fields_layout)
         main_layout.addLayout(controls_layout)
-        main_layout.addWidget(scroll_area)
+        main_layout.addWidget(self.canvas)
+
+        # پیشرفت بارگذاری پوشه فونت‌ها
+        self.load_progress = QProgressBar(self)
+        self.load_progress.setFormat("بارگذاری فونت‌ها: %v / %m")
+        self.load_progress.hide()
+        main_layout.addWidget(self.load_progress)
+
+        # آمار کش کاشی‌ها و صفحه‌های فونت
+        self.stats_label = QLabel(self)
+        main_layout.addWidget(self.stats_label)
+
+        # پنل زمان مرحله‌ها (View > Profiling Stats یا MGFONT_PROFILE=1)
+        self.stats_panel = StatsPanel(self)
+        self.stats_panel.setVisible(profiler.enabled)
+        main_layout.addWidget(self.stats_panel)
         self.setLayout(main_layout)
 
         self.update_render()
 
     def open_font(self):
         try:
-            self.font_manager.open_font(self.text_fields_layout, self.update_render)
-            self.update_render()
+            self.track_load(self.font_manager.open_font(self.text_fields_layout, self.update_render,
+                                                        self.on_load_finished))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"خطا در باز کردن فونت: {e}")
 
     def add_font(self):
         try:
-            self.font_manager.add_font(self.text_fields_layout, self.update_render)
-            self.update_render()
+            self.track_load(self.font_manager.add_font(self.text_fields_layout, self.update_render,
+                                                       self.on_load_finished))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"خطا در افزودن فونت: {e}")
 
+    def open_folder(self):
+        try:
+            self.track_load(self.font_manager.open_folder(self.text_fields_layout, self.update_render,
+                                                          self.on_load_progress, self.on_load_finished))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"خطا در باز کردن پوشه: {e}")
+
+    def on_load_progress(self, done, total, path, font, error):
+        self.load_progress.setMaximum(total)
+        self.load_progress.setValue(done)
+
+    def on_load_finished(self, results):
+        self.load_progress.hide()
+
+    def track_load(self, job):
+        """نمایش نوار پیشرفت تا پایان یک بارگذاری پس‌زمینه (job می‌تواند None باشد)"""
+        if job:
+            self.load_progress.setValue(0)
+            self.load_progress.setMaximum(len(job.paths))
+            self.load_progress.show()
+        return job
+
+    def load_paths(self, paths):
+        """افزودن فونت‌ها در پس‌زمینه (مثلاً فایل خط فرمان) پس از نمایش پنجره"""
+        return self.track_load(self.font_manager.load_fonts(paths, self.text_fields_layout, self.update_render,
+                                                            self.on_load_progress, self.on_load_finished))
+
+    def apply_session(self, state):
+        """تنظیمات نمایش جلسه قبل (زوم، رنگ پس‌زمینه، حالت مقیاس‌دهی و نشانه‌گذاری)"""
+        if state.get("background"):
+            self.background_color = tuple(state["background"])
+        if state.get("last_folder"):
+            self.font_manager.last_folder = state["last_folder"]
+        self.nearest_checkbox.setChecked(not state.get("smooth", True))
+        self.missing_checkbox.setChecked(bool(state.get("highlight_missing", False)))
+        self.zoom_slider.setValue(int(round(state.get("zoom", 1.0) * 100)))
+
+    def restore_session(self, state):
+        """بارگذاری فونت‌های جلسه قبل (معمولاً از کش دیسکی) در پس‌زمینه، با همان ترتیب و متن‌ها"""
+        entries = state.get("fonts", [])
+        if not entries:
+            return None
+        self.load_progress.setMaximum(0)
+        self.load_progress.show()
+        return self.font_manager.restore_fonts(entries, self.text_fields_layout, self.update_render,
+                                               self.on_load_finished)
+
+    def session_state(self):
+        return {
+            "fonts": self.font_manager.session_fonts(),
+            "zoom": self.zoom_factor,
+            "background": list(self.background_color),
+            "smooth": self.smooth_zoom,
+            "highlight_missing": self.highlight_missing,
+            "last_folder": self.font_manager.last_folder,
+        }
+
+    def closeEvent(self, event):
+        # جلسه‌ای که هنوز در حال بازیابی است بازنویسی نمی‌شود تا فونت‌هایش از دست نروند
+        if self.font_manager.session_entries is None:
+            session.save_session(self.session_state())
+        super().closeEvent(event)
+
     def load_recent(self, fnt_file):
         try:
-            self.font_manager.load_recent_font(fnt_file, self.text_fields_layout, self.update_render)
-            self.update_render()
+            self.track_load(self.font_manager.load_recent_font(fnt_file, self.text_fields_layout, self.update_render,
+                                                               self.on_load_finished))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"خطا در بارگذاری فونت اخیر: {e}")
 
     def on_zoom_changed(self):
         self.zoom_factor = self.zoom_slider.value() / 100.0
+        # هنگام کشیدن اسلایدر مقیاس‌دهی سریع و پس از توقف مقیاس‌دهی نرم
+        self.apply_zoom(fast=True)
+        self.zoom_timer.start()
+
+    def on_nearest_toggled(self, checked):
+        self.smooth_zoom = not checked
+        self.apply_zoom()
+
+    def on_missing_toggled(self, checked):
+        self.highlight_missing = checked
         self.update_render()
 
+    def on_profiling_toggled(self, checked):
+        profiler.set_enabled(checked)
+        self.stats_panel.setVisible(checked)
+
+    def on_font_reloaded(self, font):
+        # متن‌ها و ترتیب ردیف‌ها دست نمی‌خورند؛ فقط ردیف‌های این فونت دوباره رندر می‌شوند
+        self.update_render()
+
+    def on_reload_failed(self, font, error):
+        self.stats_label.setText(f"خطا در بارگذاری دوباره {font.fnt_file}: {error}")
+
     def change_color(self):
         color = QColorDialog.getColor()
         if color.isValid():
@@ -98,9 +239,33 @@ class FontRendererWidget(QWidget):
             self.update_render()
 
     def update_render(self):
-        pixmap = self.font_manager.render(self.background_color, self.zoom_factor)
-        if pixmap:
-            self.output_label.setPixmap(pixmap)
-            self.output_label.resize(pixmap.width(), pixmap.height())
-        else:
-            self.output_label.clear()
\ No newline at end of file
+        """درخواست رندر؛ تغییرات پشت‌سرهم در یک رندر جمع می‌شوند"""
+        if self.frame_start is None and profiler.enabled:
+            self.frame_start = time.perf_counter_ns()
+        self.render_timer.start()
+
+    def refresh_view(self):
+        """
+        دادن متن‌های فعلی به نمای کاشی‌ای؛ فقط ابعاد ردیف‌ها محاسبه می‌شود و کاشی‌های
+        دیدنی در پس‌زمینه رندر می‌شوند.
+        """
+        highlight_color = MISSING_GLYPH_COLOR if self.highlight_missing else None
+        texts = [text_field.text() for text_field in self.font_manager.text_fields]
+        self.canvas.set_rows(self.font_manager.fonts, texts, self.background_color, highlight_color)
+        self.font_watcher.set_fonts(self.font_manager.fonts)
+        self.update_stats()
+
+    def on_frame_ready(self):
+        if self.frame_start is not None:
+            # زمان فریم: از اولین تغییر تا رسم همه کاشی‌های دیدنی، شامل مکث debounce
+            profiler.record("frame", "frame", self.frame_start, time.perf_counter_ns())
+            self.frame_start = None
+        self.update_stats()
+
+    def update_stats(self):
+        self.stats_label.setText(f"{self.canvas.stats_text()}  |  {default_registry.stats_text()}")
+
+    def apply_zoom(self, fast=False):
+        """تغییر زوم نمای کاشی‌ای؛ کاشی‌ها دوباره رندر نمی‌شوند و فقط هنگام رسم مقیاس می‌خورند"""
+        self.canvas.set_zoom(self.zoom_factor, self.smooth_zoom and not fast)
+        self.update_stats()
\ No newline at end of file
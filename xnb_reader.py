@@ -0,0 +1,301 @@
+import struct
+from PIL import Image
+from lzx_decoder import LzxDecoder
+
+XNB_FLAG_HIDEF = 0x01
+XNB_FLAG_LZ4 = 0x40
+XNB_FLAG_LZX = 0x80
+XNB_HEADER_SIZE = 10
+XNB_COMPRESSED_HEADER_SIZE = 14
+
+# شماره فرمت‌های سطح (SurfaceFormat) در XNA 4 / MonoGame
+SURFACE_FORMAT_COLOR = 0
+SURFACE_FORMAT_BGR565 = 1
+SURFACE_FORMAT_BGRA5551 = 2
+SURFACE_FORMAT_BGRA4444 = 3
+SURFACE_FORMAT_DXT1 = 4
+SURFACE_FORMAT_DXT3 = 5
+SURFACE_FORMAT_DXT5 = 6
+SURFACE_FORMAT_ALPHA8 = 12
+
+
+class _ByteReader:
+    """خواندن انواع داده BinaryReader دات‌نت از یک بافر در حافظه"""
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def read_bytes(self, count):
+        chunk = self.data[self.pos:self.pos + count]
+        if len(chunk) != count:
+            raise ValueError("فایل .xnb ناقص است")
+        self.pos += count
+        return chunk
+
+    def read_struct(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def read_byte(self):
+        return self.read_bytes(1)[0]
+
+    def read_int32(self):
+        return self.read_struct("<i")[0]
+
+    def read_uint32(self):
+        return self.read_struct("<I")[0]
+
+    def read_float(self):
+        return self.read_struct("<f")[0]
+
+    def read_7bit_int(self):
+        result = 0
+        shift = 0
+        while True:
+            byte = self.read_byte()
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+            if shift > 35:
+                raise ValueError("عدد 7 بیتی نامعتبر در فایل .xnb")
+
+    def read_string(self):
+        return self.read_bytes(self.read_7bit_int()).decode("utf-8")
+
+    def read_char(self):
+        """خواندن یک کاراکتر UTF-8 (معادل BinaryReader.ReadChar)"""
+        first = self.data[self.pos] if self.pos < len(self.data) else 0
+        if first < 0x80:
+            count = 1
+        elif first >> 5 == 0b110:
+            count = 2
+        elif first >> 4 == 0b1110:
+            count = 3
+        else:
+            count = 4
+        return self.read_bytes(count).decode("utf-8")
+
+
+def _decompress_lzx(data, decompressed_size):
+    decoder = LzxDecoder(16)
+    output = bytearray()
+    pos = 0
+    while pos < len(data) and len(output) < decompressed_size:
+        hi = data[pos]
+        lo = data[pos + 1]
+        block_size = (hi << 8) | lo
+        frame_size = 0x8000
+        if hi == 0xFF:
+            frame_size = (lo << 8) | data[pos + 2]
+            block_size = (data[pos + 3] << 8) | data[pos + 4]
+            pos += 5
+        else:
+            pos += 2
+        if block_size == 0 or frame_size == 0:
+            break
+        output += decoder.decompress(data[pos:pos + block_size], frame_size)
+        pos += block_size
+    if len(output) != decompressed_size:
+        raise ValueError(f"اندازه داده LZX باز شده ({len(output)}) با هدر ({decompressed_size}) یکی نیست")
+    return bytes(output)
+
+
+def _decompress_lz4(data, decompressed_size):
+    """رمزگشایی یک بلوک خام LZ4 (بدون قاب)، همان‌طور که MonoGame ذخیره می‌کند"""
+    output = bytearray()
+    pos = 0
+    end = len(data)
+    while pos < end:
+        token = data[pos]
+        pos += 1
+        literal_length = token >> 4
+        if literal_length == 15:
+            while True:
+                byte = data[pos]
+                pos += 1
+                literal_length += byte
+                if byte != 255:
+                    break
+        output += data[pos:pos + literal_length]
+        pos += literal_length
+        if pos >= end:
+            break
+
+        offset = data[pos] | (data[pos + 1] << 8)
+        pos += 2
+        if offset == 0:
+            raise ValueError("فاصله LZ4 نامعتبر است")
+        match_length = token & 0x0F
+        if match_length == 15:
+            while True:
+                byte = data[pos]
+                pos += 1
+                match_length += byte
+                if byte != 255:
+                    break
+        match_length += 4
+
+        start = len(output) - offset
+        if start < 0:
+            raise ValueError("فاصله LZ4 خارج از داده است")
+        if offset >= match_length:
+            output += output[start:start + match_length]
+        else:
+            while match_length > 0:
+                step = min(match_length, offset)
+                output += output[start:start + step]
+                start += step
+                match_length -= step
+    if len(output) != decompressed_size:
+        raise ValueError(f"اندازه داده LZ4 باز شده ({len(output)}) با هدر ({decompressed_size}) یکی نیست")
+    return bytes(output)
+
+
+def read_xnb_payload(data):
+    """
+    بررسی هدر XNB و برگرداندن بدنه باز شده (فشرده‌نشده) فایل.
+
+    Args:
+        data (bytes): محتوای کامل فایل .xnb
+
+    Returns:
+        bytes: داده پس از هدر، بدون فشرده‌سازی
+    """
+    if len(data) < XNB_HEADER_SIZE or data[:3] != b"XNB":
+        raise ValueError("فایل .xnb معتبر نیست (امضای XNB پیدا نشد)")
+    version = data[4]
+    flags = data[5]
+    if version != 5:
+        raise ValueError(f"نسخه XNB پشتیبانی نمی‌شود: {version}")
+    file_size = struct.unpack_from("<I", data, 6)[0]
+    if file_size != len(data):
+        raise ValueError(f"اندازه فایل .xnb ({len(data)}) با هدر ({file_size}) یکی نیست")
+
+    if flags & (XNB_FLAG_LZX | XNB_FLAG_LZ4):
+        decompressed_size = struct.unpack_from("<I", data, 10)[0]
+        body = data[XNB_COMPRESSED_HEADER_SIZE:]
+        if flags & XNB_FLAG_LZX:
+            return _decompress_lzx(body, decompressed_size)
+        return _decompress_lz4(body, decompressed_size)
+    return data[XNB_HEADER_SIZE:]
+
+
+def _read_type_readers(reader):
+    readers = []
+    for _ in range(reader.read_7bit_int()):
+        name = reader.read_string()
+        reader.read_int32()  # نسخه خواننده
+        readers.append(name.split(",")[0].split("`")[0])
+    return readers
+
+
+def _expect_reader(reader, readers, suffix):
+    index = reader.read_7bit_int()
+    if index == 0 or index > len(readers):
+        raise ValueError(f"شیء {suffix} در فایل .xnb خالی یا نامعتبر است")
+    if not readers[index - 1].endswith(suffix):
+        raise ValueError(f"انتظار {suffix} می‌رفت ولی {readers[index - 1]} پیدا شد")
+
+
+def _unpremultiply(image):
+    """تبدیل رنگ‌های پیش‌ضرب‌شده در آلفا (خروجی پایپ‌لاین MonoGame) به RGBA معمولی"""
+    return Image.frombytes("RGBa", image.size, image.tobytes()).convert("RGBA")
+
+
+def _decode_surface(surface_format, width, height, data):
+    size = (width, height)
+    if surface_format == SURFACE_FORMAT_COLOR:
+        return _unpremultiply(Image.frombytes("RGBA", size, data))
+    if surface_format in (SURFACE_FORMAT_DXT1, SURFACE_FORMAT_DXT3, SURFACE_FORMAT_DXT5):
+        block_count = surface_format - SURFACE_FORMAT_DXT1 + 1
+        return _unpremultiply(Image.frombytes("RGBA", size, data, "bcn", block_count))
+    if surface_format == SURFACE_FORMAT_BGR565:
+        return Image.frombytes("RGB", size, data, "raw", "BGR;16").convert("RGBA")
+    if surface_format == SURFACE_FORMAT_BGRA5551:
+        return _unpremultiply(Image.frombytes("RGBA", size, data, "raw", "BGRA;15"))
+    if surface_format == SURFACE_FORMAT_BGRA4444:
+        # نیم‌بایت‌ها به ترتیب B,G,R,A از کم‌ارزش به پرارزش هستند
+        b, g, r, a = Image.frombytes("RGBA", size, data, "raw", "RGBA;4B").split()
+        return _unpremultiply(Image.merge("RGBA", (r, g, b, a)))
+    if surface_format == SURFACE_FORMAT_ALPHA8:
+        alpha = Image.frombytes("L", size, data)
+        white = Image.new("L", size, 255)
+        return Image.merge("RGBA", (white, white, white, alpha))
+    raise ValueError(f"فرمت تصویر {surface_format} در فایل .xnb پشتیبانی نمی‌شود")
+
+
+def _read_texture(reader):
+    surface_format = reader.read_int32()
+    width = reader.read_uint32()
+    height = reader.read_uint32()
+    level_count = reader.read_uint32()
+    if level_count < 1:
+        raise ValueError("تصویر فونت در فایل .xnb هیچ سطحی ندارد")
+    data = reader.read_bytes(reader.read_uint32())
+    # فقط سطح اول (اندازه اصلی) لازم است؛ بقیه mipmapها رد می‌شوند
+    for _ in range(level_count - 1):
+        reader.pos += reader.read_uint32()
+    info = {"format": surface_format, "width": width, "height": height}
+    return info, _decode_surface(surface_format, width, height, data)
+
+
+def _read_rectangles(reader, readers):
+    _expect_reader(reader, readers, "ListReader")
+    rects = []
+    for _ in range(reader.read_uint32()):
+        x, y, width, height = reader.read_struct("<4i")
+        rects.append({"x": x, "y": y, "width": width, "height": height})
+    return rects
+
+
+def read_xnb_spritefont(filename):
+    """
+    خواندن مستقیم یک SpriteFont از فایل .xnb در حافظه، بدون xnbcli و فایل موقت.
+
+    Args:
+        filename (str): مسیر فایل .xnb
+
+    Returns:
+        tuple: (دیکشنری content با همان ساختار JSON خروجی xnbcli, تصویر RGBA بافت فونت)
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    reader = _ByteReader(read_xnb_payload(data))
+    readers = _read_type_readers(reader)
+    reader.read_7bit_int()  # تعداد منابع مشترک
+
+    _expect_reader(reader, readers, "SpriteFontReader")
+    _expect_reader(reader, readers, "Texture2DReader")
+    texture_info, texture = _read_texture(reader)
+    glyphs = _read_rectangles(reader, readers)
+    cropping = _read_rectangles(reader, readers)
+
+    _expect_reader(reader, readers, "ListReader")
+    character_map = [reader.read_char() for _ in range(reader.read_uint32())]
+
+    vertical_line_spacing = reader.read_int32()
+    horizontal_spacing = reader.read_float()
+
+    _expect_reader(reader, readers, "ListReader")
+    kerning = []
+    for _ in range(reader.read_uint32()):
+        x, y, z = reader.read_struct("<3f")
+        kerning.append({"x": x, "y": y, "z": z})
+
+    default_character = reader.read_char() if reader.read_byte() else None
+
+    content = {
+        "texture": texture_info,
+        "glyphs": glyphs,
+        "cropping": cropping,
+        "characterMap": character_map,
+        "verticalLineSpacing": vertical_line_spacing,
+        "horizontalSpacing": horizontal_spacing,
+        "kerning": kerning,
+        "defaultCharacter": default_character,
+    }
+    return content, texture